@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2018 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+""" benchmark of child bookkeeping of a group with many children
+
+    python benchmarks/filewriter_children.py --children 50000 --writer h5py
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from nxstools import filewriter
+
+
+def _writer(name):
+    """ imports the writer module
+
+    :param name: writer name
+    :type name: :obj:`str`
+    :returns: writer module
+    :rtype: :obj:`module`
+    """
+    if name == "h5cpp":
+        from nxstools import h5cppwriter
+        return h5cppwriter
+    elif name == "pni":
+        from nxstools import pniwriter
+        return pniwriter
+    from nxstools import h5pywriter
+    return h5pywriter
+
+
+def create(fname, children, wrmodule):
+    """ creates a synthetic file with one group of scalar fields
+
+    :param fname: file name
+    :type fname: :obj:`str`
+    :param children: number of fields in the group
+    :type children: :obj:`int`
+    :param wrmodule: writer module
+    :type wrmodule: :obj:`module`
+    """
+    fl = filewriter.create_file(fname, overwrite=True, writer=wrmodule)
+    entry = fl.root().create_group("entry", "NXentry")
+    group = entry.create_group("data", "NXcollection")
+    for i in range(children):
+        group.create_field("field_%06d" % i, "float64")
+    fl.close()
+
+
+def children(fname, wrmodule, keep):
+    """ opens all children of the group
+
+    :param fname: file name
+    :type fname: :obj:`str`
+    :param wrmodule: writer module
+    :type wrmodule: :obj:`module`
+    :param keep: if keep all children alive and drop them at once
+    :type keep: :obj:`bool`
+    :returns: time in seconds
+    :rtype: :obj:`float`
+    """
+    fl = filewriter.open_file(fname, readonly=True, writer=wrmodule)
+    group = fl.root().open("entry").open("data")
+    names = group.names()
+    start = time.time()
+    if keep:
+        kept = [group.open(name) for name in names]
+        del kept[:]
+    else:
+        for name in names:
+            group.open(name)
+    duration = time.time() - start
+    fl.close()
+    return duration
+
+
+def main():
+    """ the main program function
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--children", type=int, default=50000,
+                        help="number of children (default: 50000)")
+    parser.add_argument("--writer", type=str, default="h5py",
+                        help="writer module (default: h5py)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="number of repetitions (default: 3)")
+    parser.add_argument("--dir", type=str, default=None,
+                        help="working directory (default: a temporary one)")
+    options = parser.parse_args()
+
+    wrmodule = _writer(options.writer)
+    directory = tempfile.mkdtemp(dir=options.dir)
+    try:
+        fname = os.path.join(directory, "children.nxs")
+        create(fname, options.children, wrmodule)
+        print("%s children, writer: %s" % (options.children, options.writer))
+        for name, keep in [
+                ("open + drop", False),
+                ("open all + drop all", True)]:
+            duration = min(
+                children(fname, wrmodule, keep)
+                for _ in range(options.repeat))
+            print("  %-20s %8.3f s" % (name, duration))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2018 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+""" benchmark of point writes of step scans, i.e. field[i] = value
+
+    python benchmarks/filewriter_points.py --points 100000 --writer h5cpp
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from nxstools import filewriter
+
+
+def _writer(name):
+    """ imports the writer module
+
+    :param name: writer name
+    :type name: :obj:`str`
+    :returns: writer module
+    :rtype: :obj:`module`
+    """
+    if name == "h5cpp":
+        from nxstools import h5cppwriter
+        return h5cppwriter
+    elif name == "pni":
+        from nxstools import pniwriter
+        return pniwriter
+    from nxstools import h5pywriter
+    return h5pywriter
+
+
+def points(directory, npoints, wrmodule, grow, spectrum):
+    """ writes points into a new field
+
+    :param directory: working directory
+    :type directory: :obj:`str`
+    :param npoints: number of points
+    :type npoints: :obj:`int`
+    :param wrmodule: writer module
+    :type wrmodule: :obj:`module`
+    :param grow: if grow the field before every point
+    :type grow: :obj:`bool`
+    :param spectrum: spectrum length or 0 for scalar points
+    :type spectrum: :obj:`int`
+    :returns: time per point in nanoseconds
+    :rtype: :obj:`float`
+    """
+    fname = os.path.join(directory, "points.nxs")
+    fl = filewriter.create_file(fname, overwrite=True, writer=wrmodule)
+    entry = fl.root().create_group("entry", "NXentry")
+    shape = [0 if grow else npoints]
+    chunk = [1024]
+    if spectrum:
+        shape.append(spectrum)
+        chunk = [1, spectrum]
+    field = entry.create_field("data", "float64", shape, chunk)
+    value = [1.5] * spectrum if spectrum else 1.5
+    start = time.time()
+    if spectrum:
+        for i in range(npoints):
+            if grow:
+                field.grow()
+            field[i, :] = value
+    else:
+        for i in range(npoints):
+            if grow:
+                field.grow()
+            field[i] = value
+    duration = time.time() - start
+    fl.close()
+    os.remove(fname)
+    return duration / npoints * 1e9
+
+
+def main():
+    """ the main program function
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--points", type=int, default=20000,
+                        help="number of points (default: 20000)")
+    parser.add_argument("--writer", type=str, default="h5cpp",
+                        help="writer module (default: h5cpp)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="number of repetitions (default: 3)")
+    parser.add_argument("--dir", type=str, default=None,
+                        help="working directory (default: a temporary one)")
+    options = parser.parse_args()
+
+    wrmodule = _writer(options.writer)
+    directory = tempfile.mkdtemp(dir=options.dir)
+    try:
+        print("%s points, writer: %s" % (options.points, options.writer))
+        for name, grow, spectrum in [
+                ("scalar", False, 0),
+                ("scalar + grow", True, 0),
+                ("spectrum[16]", False, 16),
+                ("spectrum[16] + grow", True, 16)]:
+            duration = min(
+                points(directory, options.points, wrmodule, grow, spectrum)
+                for _ in range(options.repeat))
+            print("  %-20s %10.0f ns/point" % (name, duration))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2018 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+""" benchmark of a full-tree walk, i.e. open() of every node
+    and optionally reading of nexus paths and field metadata
+
+    python benchmarks/filewriter_tree.py --nodes 100000 --writer h5py
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from nxstools import filewriter
+
+
+def _writer(name):
+    """ imports the writer module
+
+    :param name: writer name
+    :type name: :obj:`str`
+    :returns: writer module
+    :rtype: :obj:`module`
+    """
+    if name == "h5cpp":
+        from nxstools import h5cppwriter
+        return h5cppwriter
+    elif name == "pni":
+        from nxstools import pniwriter
+        return pniwriter
+    from nxstools import h5pywriter
+    return h5pywriter
+
+
+def create(fname, nodes, width, wrmodule):
+    """ creates a synthetic file with NXcollection groups of scalar fields
+
+    :param fname: file name
+    :type fname: :obj:`str`
+    :param nodes: number of nodes
+    :type nodes: :obj:`int`
+    :param width: number of fields in a group
+    :type width: :obj:`int`
+    :param wrmodule: writer module
+    :type wrmodule: :obj:`module`
+    :returns: number of created nodes
+    :rtype: :obj:`int`
+    """
+    fl = filewriter.create_file(fname, overwrite=True, writer=wrmodule)
+    entry = fl.root().create_group("entry", "NXentry")
+    created = 1
+    ig = 0
+    while created < nodes:
+        group = entry.create_group("group_%05d" % ig, "NXcollection")
+        created += 1
+        for i in range(min(width, nodes - created)):
+            group.create_field("field_%05d" % i, "float64")
+            created += 1
+        ig += 1
+    fl.close()
+    return created
+
+
+def walk(node, paths, metadata=False):
+    """ walks the tree below the node
+
+    :param node: file tree node
+    :type node: :class:`nxstools.filewriter.FTGroup` or \
+                :class:`nxstools.filewriter.FTGroupView`
+    :param paths: if read nexus paths of nodes
+    :type paths: :obj:`bool`
+    :param metadata: if read data type, shape and chunks of fields
+    :type metadata: :obj:`bool`
+    :returns: number of visited nodes
+    :rtype: :obj:`int`
+    """
+    visited = 0
+    for name in node.names():
+        child = node.open(name)
+        if paths:
+            child.path
+        visited += 1
+        if isinstance(child, (filewriter.FTGroup, filewriter.FTGroupView)):
+            visited += walk(child, paths, metadata)
+        elif metadata:
+            child.dtype
+            child.shape
+            child.chunk
+    return visited
+
+
+def traverse(fname, wrmodule, paths, views, metadata=False):
+    """ walks the whole file
+
+    :param fname: file name
+    :type fname: :obj:`str`
+    :param wrmodule: writer module
+    :type wrmodule: :obj:`module`
+    :param paths: if read nexus paths of nodes
+    :type paths: :obj:`bool`
+    :param views: if use lightweight read-only node views
+    :type views: :obj:`bool`
+    :param metadata: if read data type, shape and chunks of fields
+    :type metadata: :obj:`bool`
+    :returns: time per node in microseconds
+    :rtype: :obj:`float`
+    """
+    fl = filewriter.open_file(
+        fname, readonly=True, views=views, writer=wrmodule)
+    start = time.time()
+    visited = walk(fl.root(), paths, metadata)
+    duration = time.time() - start
+    fl.close()
+    return duration / visited * 1e6
+
+
+def main():
+    """ the main program function
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nodes", type=int, default=100000,
+                        help="number of nodes (default: 100000)")
+    parser.add_argument("--width", type=int, default=100,
+                        help="number of fields in a group (default: 100)")
+    parser.add_argument("--writer", type=str, default="h5py",
+                        help="writer module (default: h5py)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="number of repetitions (default: 3)")
+    parser.add_argument("--dir", type=str, default=None,
+                        help="working directory (default: a temporary one)")
+    options = parser.parse_args()
+
+    wrmodule = _writer(options.writer)
+    directory = tempfile.mkdtemp(dir=options.dir)
+    try:
+        fname = os.path.join(directory, "tree.nxs")
+        nodes = create(fname, options.nodes, options.width, wrmodule)
+        print("%s nodes, writer: %s" % (nodes, options.writer))
+        for name, paths, views, metadata in [
+                ("open", False, False, False),
+                ("open + path", True, False, False),
+                ("open + metadata", False, False, True),
+                ("views", False, True, False),
+                ("views + path", True, True, False),
+                ("views + metadata", False, True, True)]:
+            duration = min(
+                traverse(fname, wrmodule, paths, views, metadata)
+                for _ in range(options.repeat))
+            print("  %-20s %10.2f us/node" % (name, duration))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2018 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+""" benchmark of nxscollect for raw binary frames
+
+    python benchmarks/nxscollect_raw.py --frames 200 --shape 1024,1024
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy
+
+from nxstools import filewriter
+from nxstools import nxscollect
+
+try:
+    from cStringIO import StringIO
+except ImportError:
+    from io import StringIO
+
+
+#: (:obj:`list` < (:obj:`str`, :obj:`dict`) >) collector modes to compare
+MODES = [
+    ("fromfile", {}),
+    ("mmap", {"readoptions": nxscollect.ReadOptions(mmap=True)}),
+    ("mmap + direct chunk",
+     {"writeoptions": nxscollect.WriteOptions(directchunk=True)}),
+]
+
+
+def collect(directory, nframes, shape, dtype, writer, options):
+    """ collects raw frames into a new master file
+
+    :param directory: working directory
+    :type directory: :obj:`str`
+    :param nframes: number of frames
+    :type nframes: :obj:`int`
+    :param shape: frame shape
+    :type shape: :obj:`list` < :obj:`int` >
+    :param dtype: frame data type
+    :type dtype: :obj:`str`
+    :param writer: writer name
+    :type writer: :obj:`str`
+    :param options: collector options
+    :type options: :obj:`dict` <:obj:`str`, `any`>
+    :returns: collection time in seconds
+    :rtype: :obj:`float`
+    """
+    master = os.path.join(directory, "master.nxs")
+    wrmodule = nxscollect.WRITERS[writer]
+    fl = filewriter.create_file(master, overwrite=True, writer=wrmodule)
+    fl.root().create_group("entry", "NXentry")
+    fl.close()
+    collector = nxscollect.Collector(
+        master, "0", storeold=False, writer=writer, **options)
+    old_stdout = sys.stdout
+    sys.stdout = StringIO()
+    try:
+        start = time.time()
+        collector.collect(
+            "/entry/instrument/detector/data",
+            [os.path.join(directory, "frame_%%05d.raw:0:%s" % (nframes - 1))],
+            dtype, shape)
+        duration = time.time() - start
+    finally:
+        sys.stdout = old_stdout
+    os.remove(master)
+    return duration
+
+
+def main():
+    """ the main program function
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=200,
+                        help="number of frames (default: 200)")
+    parser.add_argument("--shape", type=str, default="1024,1024",
+                        help="frame shape (default: 1024,1024)")
+    parser.add_argument("--dtype", type=str, default="uint16",
+                        help="frame data type (default: uint16)")
+    parser.add_argument("--writer", type=str, default="h5py",
+                        help="writer module (default: h5py)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="number of repetitions (default: 3)")
+    parser.add_argument("--dir", type=str, default=None,
+                        help="working directory (default: a temporary one)")
+    options = parser.parse_args()
+
+    shape = [int(dm) for dm in options.shape.split(",")]
+    directory = tempfile.mkdtemp(dir=options.dir)
+    try:
+        frame = numpy.arange(
+            numpy.prod(shape), dtype=options.dtype).reshape(shape)
+        for i in range(options.frames):
+            frame.tofile(os.path.join(directory, "frame_%05d.raw" % i))
+        size = options.frames * frame.nbytes / 1024. / 1024.
+        print("%s frames of %s %s, %.1f MB, writer: %s" % (
+            options.frames, shape, options.dtype, size, options.writer))
+        for name, pars in MODES:
+            duration = min(
+                collect(directory, options.frames, shape, options.dtype,
+                        options.writer, pars)
+                for _ in range(options.repeat))
+            print("  %-20s %8.3f s %10.1f MB/s" % (
+                name, duration, size / duration))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
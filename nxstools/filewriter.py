@@ -35,24 +35,30 @@ writer = None
 writerlock = threading.Lock()
 
 
-def open_file(filename, readonly=False, **pars):
+def open_file(filename, readonly=False, views=False, **pars):
     """ open the new file
 
     :param filename: file name
     :type filename: :obj:`str`
     :param readonly: readonly flag
     :type readonly: :obj:`bool`
+    :param views: provide lightweight, non-reopenable node views
+                  of a readonly file if the writer supports them
+    :type views: :obj:`bool`
     :param pars: parameters
     :type pars: :obj:`dict` < :obj:`str`, :obj:`str`>
     :returns: file object
-    :rtype: :class:`FTFile`
+    :rtype: :class:`FTFile` or :class:`FTFileView`
     """
     if 'writer' in pars.keys():
         wr = pars.pop('writer')
     else:
         with writerlock:
             wr = writer
-    fl = wr.open_file(filename, readonly, **pars)
+    if readonly and views and hasattr(wr, "open_file_view"):
+        fl = wr.open_file_view(filename, **pars)
+    else:
+        fl = wr.open_file(filename, readonly, **pars)
     if hasattr(fl, "writer"):
         fl.writer = wr
     return fl
@@ -267,6 +273,79 @@ def setwriter(wr):
         writer = wr
 
 
+def _defaultfield(root):
+    """ finds the default field below the root group
+
+    :param root: root group
+    :type root: :class:`FTGroup` or :class:`FTGroupView`
+    :returns: default field or None
+    :rtype: :class:`FTField` or :class:`FTFieldView`
+    """
+    node = root
+    searching = True
+    while searching:
+        attrs = node.attributes
+        if hasattr(node, "names") and "default" in attrs.names():
+            nname = attrs["default"].read()
+            if isinstance(nname, numpy.ndarray) and len(nname):
+                nname = nname[0]
+            if nname in node.names():
+                node = node.open(nname)
+                continue
+        searching = False
+    if hasattr(node, "names"):
+        attrs = node.attributes
+        if "signal" in attrs.names():
+            nname = attrs["signal"].read()
+            if isinstance(nname, numpy.ndarray) and len(nname):
+                nname = nname[0]
+            if nname in node.names():
+                node = node.open(nname)
+    if not hasattr(node, "names"):
+        return node
+
+    for cnm in ["NXentry", "NXdata", "NXmonitor", "NXlog"]:
+        names = node.names()
+        if cnm[2:] in names:
+            snames = [cnm[2:]]
+        else:
+            snames = []
+        snames.extend(sorted([nm for nm in names if nm != cnm[2:]]))
+        for nn in snames:
+            nd = node.open(nn)
+            if not hasattr(nd, "attributes"):
+                continue
+            attrs = nd.attributes
+            if "NX_class" in attrs.names():
+                nname = attrs["NX_class"].read()
+                if isinstance(nname, numpy.ndarray) and len(nname):
+                    nname = nname[0]
+                if nname in cnm:
+                    node = nd
+                    break
+    if hasattr(node, "names") and hasattr(node, "attributes"):
+        attrs = node.attributes
+        if "signal" in attrs.names():
+            nname = attrs["signal"].read()
+            if isinstance(nname, numpy.ndarray) and len(nname):
+                nname = nname[0]
+            if nname in node.names():
+                node = node.open(nname)
+    if not hasattr(node, "names"):
+        return node
+    while hasattr(node, "names") and "data" in node.names():
+        node = node.open("data")
+    if hasattr(node, "names"):
+        for nn in sorted(node.names()):
+            nd = node.open(nn)
+            if not hasattr(nd, "names"):
+                node = nd
+                break
+    if not hasattr(node, "names"):
+        return node
+    return None
+
+
 class FTObject(object):
 
     """ virtual file tree object
@@ -284,45 +363,67 @@ class FTObject(object):
         self._h5object = h5object
         #: (:obj:`FTObject`) tree parent
         self._tparent = tparent
-        #: (:obj:`list` < :obj:`FTObject` > ) weak references of children
-        self.__tchildren = []
+        #: (:class:`weakref.WeakSet` < :obj:`FTObject` > ) registry of
+        #:    children, dead references are dropped by their callbacks
+        self.__tchildren = weakref.WeakSet()
+        #: (:obj:`str`) memoized nexus path, resolved by _nexuspath()
+        self._path = None
         if tparent:
             tparent.append(self)
 
     def append(self, child):
         """ append child weakref
 
-        :param tparent: tree parent
-        :type tparent: :obj:`FTObject`
+        :param child: tree child
+        :type child: :obj:`FTObject`
         """
-        self.__tchildren.append(weakref.ref(child))
-
-    def __del__(self):
-        """ removes weakref in parent object
-        """
-        if self._tparent:
-            self._tparent.reload()
+        self.__tchildren.add(child)
 
     def reload(self):
         """ reload a list of valid children
+
+        The weak set drops dead children itself, so it is kept only
+        for backward compatibility.
         """
-        if self.__tchildren:
-            self.__tchildren = [
-                kd for kd in self.__tchildren if kd() is not None]
 
     def close(self):
         """ close element
         """
-        for ch in self.__tchildren:
-            if ch() is not None:
-                ch().close()
+        for ch in list(self.__tchildren):
+            ch.close()
 
     def _reopen(self):
         """ reopen elements and children
         """
-        self.__tchildren = [ch for ch in self.__tchildren if ch() is not None]
-        for ch in self.__tchildren:
-            ch().reopen()
+        for ch in list(self.__tchildren):
+            ch.reopen()
+
+    @property
+    def path(self):
+        """ return the nexus path, which is resolved on first access
+
+        :returns: object nexus path
+        :rtype: :obj:`str`
+        """
+        if self._path is None:
+            self._path = self._nexuspath()
+        return self._path
+
+    @path.setter
+    def path(self, path):
+        """ set the nexus path
+
+        :param path: object nexus path
+        :type path: :obj:`str`
+        """
+        self._path = path
+
+    def _nexuspath(self):
+        """ resolve the nexus path from the native object
+
+        :returns: object nexus path
+        :rtype: :obj:`str`
+        """
 
     @property
     def parent(self):
@@ -442,69 +543,12 @@ class FTFile(FTObject):
         return str(starttime.strftime(fmt))
 
     def default_field(self):
-        node = self.root()
-        searching = True
-        while searching:
-            attrs = node.attributes
-            if hasattr(node, "names") and "default" in attrs.names():
-                nname = attrs["default"].read()
-                if isinstance(nname, numpy.ndarray) and len(nname):
-                    nname = nname[0]
-                if nname in node.names():
-                    node = node.open(nname)
-                    continue
-            searching = False
-        if hasattr(node, "names"):
-            attrs = node.attributes
-            if "signal" in attrs.names():
-                nname = attrs["signal"].read()
-                if isinstance(nname, numpy.ndarray) and len(nname):
-                    nname = nname[0]
-                if nname in node.names():
-                    node = node.open(nname)
-        if not hasattr(node, "names"):
-            return node
-
-        for cnm in ["NXentry", "NXdata", "NXmonitor", "NXlog"]:
-            names = node.names()
-            if cnm[2:] in names:
-                snames = [cnm[2:]]
-            else:
-                snames = []
-            snames.extend(sorted([nm for nm in names if nm != cnm[2:]]))
-            for nn in snames:
-                nd = node.open(nn)
-                if not hasattr(nd, "attributes"):
-                    continue
-                attrs = nd.attributes
-                if "NX_class" in attrs.names():
-                    nname = attrs["NX_class"].read()
-                    if isinstance(nname, numpy.ndarray) and len(nname):
-                        nname = nname[0]
-                    if nname in cnm:
-                        node = nd
-                        break
-        if hasattr(node, "names") and hasattr(node, "attributes"):
-            attrs = node.attributes
-            if "signal" in attrs.names():
-                nname = attrs["signal"].read()
-                if isinstance(nname, numpy.ndarray) and len(nname):
-                    nname = nname[0]
-                if nname in node.names():
-                    node = node.open(nname)
-        if not hasattr(node, "names"):
-            return node
-        while hasattr(node, "names") and "data" in node.names():
-            node = node.open("data")
-        if hasattr(node, "names"):
-            for nn in sorted(node.names()):
-                nd = node.open(nn)
-                if not hasattr(nd, "names"):
-                    node = nd
-                    break
-        if not hasattr(node, "names"):
-            return node
-        return None
+        """ default field of the file
+
+        :returns: default field or None
+        :rtype: :class:`FTField`
+        """
+        return _defaultfield(self.root())
 
 
 class FTGroup(FTObject):
@@ -609,6 +653,13 @@ class FTGroup(FTObject):
         :rtype: :obj:`bool`
         """
 
+    def remove(self, name):
+        """ remove a child
+
+        :param name: child name
+        :type name: :obj:`str`
+        """
+
     def names(self):
         """ read the child names
 
@@ -739,6 +790,27 @@ class FTField(FTObject):
         :rtype: :obj:`any`
         """
 
+    def write_direct_chunk(self, data, offset, filtermask=0):
+        """ write a raw chunk bypassing the filter pipeline
+
+        :param data: raw chunk data
+        :type data: :obj:`bytes` or :class:`numpy.ndarray`
+        :param offset: logical position of the chunk in the field
+        :type offset: :obj:`list` < :obj:`int` >
+        :param filtermask: mask of filters which have not been applied
+        :type filtermask: :obj:`int`
+        """
+
+    def read_direct_chunk(self, offset):
+        """ read a raw chunk bypassing the filter pipeline
+
+        :param offset: logical position of the chunk in the field
+        :type offset: :obj:`list` < :obj:`int` >
+        :returns: (mask of filters which have not been applied,
+                   raw chunk data)
+        :rtype: (:obj:`int`, :obj:`bytes`)
+        """
+
     @property
     def dtype(self):
         """ field data type
@@ -763,6 +835,23 @@ class FTField(FTObject):
         :rtype: :obj:`int`
         """
 
+    @property
+    def chunk(self):
+        """ field chunk shape
+
+        :returns: field chunk shape or None for contiguous fields
+        :rtype: :obj:`list` < :obj:`int` >
+        """
+
+    @property
+    def filters(self):
+        """ field filter pipeline
+
+        :returns: a list of (filter id, filter options) or None
+                  if the pipeline cannot be inspected
+        :rtype: :obj:`list` < (:obj:`int`, :obj:`tuple` <:obj:`int`>) >
+        """
+
     def reopen(self):
         """ reopen attribute
         """
@@ -963,6 +1052,50 @@ class FTAttributeManager(FTObject):
         :rtype: :obj:`list` <:obj:`str`>
         """
 
+    def remove(self, name):
+        """ remove the attribute
+
+        :param name: attribute name
+        :type name: :obj:`str`
+        """
+
+    def read_all(self, names=None):
+        """ reads values of many attributes at once
+
+        :param names: attribute names, all attributes if None
+        :type names: :obj:`list` <:obj:`str`>
+        :returns: dictionary with attribute values
+        :rtype: :obj:`dict` <:obj:`str`, `any`>
+        """
+        if names is None:
+            names = self.names()
+        return dict((name, self[name][...]) for name in names)
+
+    def write_many(self, attributes):
+        """ creates or overwrites many attributes at once,
+        data types and shapes are taken from the values
+
+        :param attributes: dictionary with attribute values
+        :type attributes: :obj:`dict` <:obj:`str`, `any`>
+        """
+        for name, value in attributes.items():
+            dtype, shape = self._valuetype(value)
+            self.create(name, dtype, shape, overwrite=True)[...] = value
+
+    @classmethod
+    def _valuetype(cls, value):
+        """ provides attribute data type and shape of the value
+
+        :param value: attribute value
+        :type value: `any`
+        :returns: (attribute data type, attribute shape)
+        :rtype: (:obj:`str`, :obj:`list` < :obj:`int` >)
+        """
+        value = numpy.asarray(value)
+        if value.dtype.kind in "SUO":
+            return "string", list(value.shape)
+        return str(value.dtype), list(value.shape)
+
     def reopen(self):
         """ reopen attribute
         """
@@ -1036,3 +1169,340 @@ class FTAttribute(FTObject):
         """ reopen attribute
         """
         FTObject._reopen(self)
+
+
+class FTNodeView(object):
+
+    """ lightweight read-only view of a file tree node
+
+    Views are not tracked by their parents and cannot be reopened.
+    Writers read names, attributes and field data of views from the native
+    objects, other calls are delegated to a full file tree object
+    of the writer, which is created on demand.
+    """
+
+    __slots__ = ("_h5object", "_tparent", "_path", "_node", "name")
+
+    #: (:obj:`type`) class of the full file tree object
+    _nodeclass = None
+
+    def __init__(self, h5object, tparent=None, name=None):
+        """ constructor
+
+        :param h5object: h5 object
+        :type h5object: :obj:`any`
+        :param tparent: tree parent
+        :type tparent: :class:`FTNodeView`
+        :param name: object name
+        :type name: :obj:`str`
+        """
+        #: (:obj:`any`) h5 object
+        self._h5object = h5object
+        #: (:class:`FTNodeView`) tree parent
+        self._tparent = tparent
+        #: (:obj:`str`) memoized nexus path, resolved by _nexuspath()
+        self._path = None
+        #: (:class:`FTObject`) full file tree object
+        self._node = None
+        #: (:obj:`str`) object name
+        self.name = name
+
+    def append(self, child):
+        """ children of views are not tracked
+
+        :param child: tree child
+        :type child: :obj:`FTObject`
+        """
+
+    def _fullnode(self):
+        """ provides the full file tree object of the view
+
+        :returns: file tree object
+        :rtype: :class:`FTObject`
+        """
+        if self._node is None:
+            node = self._nodeclass(self._h5object, self._tparent)
+            node.name = self.name
+            node.path = self.path
+            self._node = node
+        return self._node
+
+    @property
+    def path(self):
+        """ return the nexus path, which is resolved on first access
+
+        :returns: object nexus path
+        :rtype: :obj:`str`
+        """
+        if self._path is None:
+            self._path = self._nexuspath()
+        return self._path
+
+    @path.setter
+    def path(self, path):
+        """ set the nexus path
+
+        :param path: object nexus path
+        :type path: :obj:`str`
+        """
+        self._path = path
+
+    def _nexuspath(self):
+        """ resolve the nexus path from the native object
+
+        :returns: object nexus path
+        :rtype: :obj:`str`
+        """
+
+    @property
+    def parent(self):
+        """ return the parent object
+
+        :returns: file tree group
+        :rtype: :class:`FTGroupView`
+        """
+        return self._tparent
+
+    @property
+    def h5object(self):
+        """ provide object of native library
+
+        :returns: h5 object
+        :rtype: :obj:`any`
+        """
+        return self._h5object
+
+    @property
+    def is_valid(self):
+        """ check if the object is valid
+
+        :returns: valid flag
+        :rtype: :obj:`bool`
+        """
+        return self._fullnode().is_valid
+
+    @property
+    def attributes(self):
+        """ return the attribute manager
+
+        :returns: attribute manager
+        :rtype: :class:`FTAttributeManager`
+        """
+        return self._fullnode().attributes
+
+    def close(self):
+        """ close the full file tree object if it was created
+        """
+        if self._node is not None:
+            self._node.close()
+
+    def reopen(self):
+        """ views cannot be reopened
+        """
+        raise Exception("File tree views cannot be reopened")
+
+
+class FTFileView(FTNodeView):
+
+    """ lightweight read-only view of a file
+    """
+
+    __slots__ = ("writer",)
+
+    def __init__(self, h5object, filename):
+        """ constructor
+
+        :param h5object: h5 object
+        :type h5object: :obj:`any`
+        :param filename:  file name
+        :type filename: :obj:`str`
+        """
+        FTNodeView.__init__(self, h5object, None, filename)
+        #: (:mod:`PNIWriter` or :mod:`H5PYWriter` or :mod:`H5CppWriter`)
+        #:    writer module
+        self.writer = None
+
+    def root(self):
+        """ root object
+
+        :returns: root group view
+        :rtype: :class:`FTGroupView`
+        """
+
+    @property
+    def readonly(self):
+        """ check if file is readonly
+
+        :returns: readonly flag
+        :rtype: :obj:`bool`
+        """
+        return True
+
+    def default_field(self):
+        """ default field of the file
+
+        :returns: default field view or None
+        :rtype: :class:`FTFieldView`
+        """
+        return _defaultfield(self.root())
+
+
+class FTGroupView(FTNodeView):
+
+    """ lightweight read-only view of a group
+    """
+
+    __slots__ = ()
+
+    def open(self, name):
+        """ open a file tree element, i.e. a group or field view or
+            a full link or attribute object
+
+        :param name: element name
+        :type name: :obj:`str`
+        :returns: file tree object
+        :rtype: :class:`FTNodeView` or :class:`FTObject`
+        """
+        return self._fullnode().open(name)
+
+    def open_link(self, name):
+        """ open a file tree element as link
+
+        :param name: element name
+        :type name: :obj:`str`
+        :returns: file tree object
+        :rtype: :class:`FTLink`
+        """
+        return self._fullnode().open_link(name)
+
+    def names(self):
+        """ read the child names
+
+        :returns: h5 object
+        :rtype: :obj:`list` <`str`>
+        """
+        return self._fullnode().names()
+
+    def exists(self, name):
+        """ if child exists
+
+        :param name: child name
+        :type name: :obj:`str`
+        :returns: existing flag
+        :rtype: :obj:`bool`
+        """
+        return name in self.names()
+
+    @property
+    def size(self):
+        """ group size
+
+        :returns: group size
+        :rtype: :obj:`int`
+        """
+        return len(self.names())
+
+    def __iter__(self):
+        """ child iterator
+
+        :returns: child iterator
+        :rtype: :obj:`generator` < :class:`FTNodeView` >
+        """
+        for name in self.names():
+            yield self.open(name)
+
+
+class FTFieldView(FTNodeView):
+
+    """ lightweight read-only view of a field
+    """
+
+    __slots__ = ()
+
+    def _nexuspath(self):
+        """ resolve the nexus path of the field
+
+        :returns: object nexus path
+        :rtype: :obj:`str`
+        """
+        tparent = self._tparent
+        if self.name is None or not tparent or not tparent.path:
+            return ''
+        if tparent.path == "/":
+            return "/" + self.name
+        return tparent.path + "/" + self.name
+
+    def read(self):
+        """ read the field value
+
+        :returns: python object
+        :rtype: :obj:`any`
+        """
+        return self._fullnode().read()
+
+    def __getitem__(self, t):
+        """ get value
+
+        :param t: slice tuple
+        :type t: :obj:`tuple`
+        :returns: python object
+        :rtype: :obj:`any`
+        """
+        return self._fullnode()[t]
+
+    def read_direct_chunk(self, offset):
+        """ read a raw chunk bypassing the filter pipeline
+
+        :param offset: logical position of the chunk in the field
+        :type offset: :obj:`list` < :obj:`int` >
+        :returns: (mask of filters which have not been applied,
+                   raw chunk data)
+        :rtype: (:obj:`int`, :obj:`bytes`)
+        """
+        return self._fullnode().read_direct_chunk(offset)
+
+    @property
+    def dtype(self):
+        """ field data type
+
+        :returns: field data type
+        :rtype: :obj:`str`
+        """
+        return self._fullnode().dtype
+
+    @property
+    def shape(self):
+        """ field shape
+
+        :returns: field shape
+        :rtype: :obj:`list` < :obj:`int` >
+        """
+        return self._fullnode().shape
+
+    @property
+    def size(self):
+        """ field size
+
+        :returns: field size
+        :rtype: :obj:`int`
+        """
+        return self._fullnode().size
+
+    @property
+    def chunk(self):
+        """ field chunk shape
+
+        :returns: field chunk shape or None for contiguous fields
+        :rtype: :obj:`list` < :obj:`int` >
+        """
+        return self._fullnode().chunk
+
+    @property
+    def filters(self):
+        """ field filter pipeline
+
+        :returns: a list of (filter id, filter options) or None
+                  if the pipeline cannot be inspected
+        :rtype: :obj:`list` < (:obj:`int`, :obj:`tuple` <:obj:`int`>) >
+        """
+        return self._fullnode().filters
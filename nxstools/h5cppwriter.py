@@ -19,9 +19,11 @@
 
 """ Provides h5cpp file writer """
 
+import collections
 import math
 import os
 import sys
+import threading
 import numpy as np
 from pninexus import h5cpp
 
@@ -65,9 +67,188 @@ def _tostr(text):
         return str(text)
 
 
+def _squeeze(v):
+    """ removes single element dimensions of read values
+
+    :param v: read value
+    :type v: :obj:`any`
+    :returns: value without single element dimensions
+    :rtype: :obj:`any`
+    """
+    if hasattr(v, "shape"):
+        shape = v.shape
+        if len(shape) == 3 and shape[2] == 1:
+            #: problem with old numpy
+            # v.reshape(shape[:2])
+            v = v[:, :, 0]
+            shape = v.shape
+        if len(shape) == 3 and shape[1] == 1:
+            # v.reshape([shape[0], shape[2]])
+            v = v[:, 0, :]
+            shape = v.shape
+        if len(shape) == 3 and shape[0] == 1:
+            # v.reshape([shape[1], shape[2]])
+            v = v[0, :, :]
+            shape = v.shape
+        if len(shape) == 2 and shape[1] == 1:
+            # v.reshape([shape[0]])
+            v = v[0, :]
+            shape = v.shape
+        if len(shape) == 2 and shape[0] == 1:
+            # v.reshape([shape[1]])
+            v = v[:, 0]
+            shape = v.shape
+        if len(shape) == 1 and shape[0] == 1:
+            v = v[0]
+    return v
+
+
+#: (:obj:`int`) maximal number of cached selections
+SELECTIONCACHESIZE = 1024
+
+#: (:class:`collections.OrderedDict` <(:obj:`tuple`,
+#:    :obj:`tuple` <:obj:`int`>), (:obj:`tuple`, :obj:`list`)>)
+#:    hyperslab parameters of slice patterns with dimensions of their
+#:    single indices, the least recently used at the beginning
+_SELECTIONS = collections.OrderedDict()
+
+#: (:class:`threading.Lock`) lock of the selection cache
+_SELECTIONLOCK = threading.Lock()
+
+
+def _slicepattern(t):
+    """ provides a hashable pattern of slices
+
+    :param t: slice tuple
+    :type t: :obj:`tuple`
+    :returns: slice pattern
+    :rtype: :obj:`tuple`
+    """
+    return tuple([
+        (tel.start, tel.stop, tel.step) if isinstance(tel, slice) else
+        (Ellipsis if tel is Ellipsis else
+         (False if isinstance(tel, (int, long)) else type(tel)))
+        for tel in t])
+
+
+def _hyperslabparams(t, shape):
+    """ converts slice tuple to hyperslab parameters
+
+    :param t: slice tuple
+    :type t: :obj:`tuple`
+    :return shape: field shape
+    :type shape: :obj:`list` < :obj:`int` >
+    :returns: (offset, block, count, stride) or None
+    :rtype: (:obj:`tuple` < :obj:`int` >, :obj:`tuple` < :obj:`int` >,
+             :obj:`tuple` < :obj:`int` >, :obj:`tuple` < :obj:`int` >)
+    """
+    offset = []
+    block = []
+    count = []
+    stride = []
+    it = -1
+    for tit, tel in enumerate(t):
+        it += 1
+        if isinstance(tel, (int, long)):
+            if tel < 0:
+                offset.append(shape[it] + tel)
+            else:
+                offset.append(tel)
+            block.append(1)
+            count.append(1)
+            stride.append(1)
+        elif isinstance(tel, slice):
+            start = tel.start if tel.start is not None else 0
+            stop = tel.stop if tel.stop is not None else shape[it]
+            if start < 0:
+                start = shape[it] + start
+            if stop < 0:
+                stop = shape[it] + stop
+            if tel.step in [None, 1]:
+                offset.append(start)
+                block.append(stop - start)
+                count.append(1)
+                stride.append(1)
+            else:
+                offset.append(start)
+                block.append(1)
+                count.append(
+                    int(math.ceil(
+                        (stop - start) / float(tel.step))))
+                stride.append(tel.step)
+        elif tel is Ellipsis:
+            esize = len(shape) - len(t) + 1
+            for jt in range(esize):
+                offset.append(0)
+                block.append(shape[it])
+                count.append(1)
+                stride.append(1)
+                if jt < esize - 1:
+                    it += 1
+    if len(offset):
+        return tuple(offset), tuple(block), tuple(count), tuple(stride)
+
+
+def _indexdims(t, shape):
+    """ provides dimensions of single indices in slice tuple
+
+    :param t: slice tuple
+    :type t: :obj:`tuple`
+    :return shape: field shape
+    :type shape: :obj:`list` < :obj:`int` >
+    :returns: (slice tuple position, field dimension) of single indices
+    :rtype: :obj:`list` < (:obj:`int`, :obj:`int`) >
+    """
+    dims = []
+    it = 0
+    for tit, tel in enumerate(t):
+        if isinstance(tel, (int, long)):
+            dims.append((tit, it))
+        elif tel is Ellipsis:
+            it += len(shape) - len(t)
+        it += 1
+    return dims
+
+
+def _hyperslab(t, shape):
+    """ converts slice tuple to hyperslab selection
+
+    :param t: slice tuple
+    :type t: :obj:`tuple`
+    :return shape: field shape
+    :type shape: :obj:`list` < :obj:`int` >
+    :returns: hyperslab selection
+    :rtype: :class:`h5cpp.dataspace.Hyperslab`
+    """
+    params = _hyperslabparams(t, shape)
+    if params is not None:
+        return _newhyperslab(params)
+
+
+def _newhyperslab(params):
+    """ creates a new hyperslab selection
+
+    :param params: (offset, block, count, stride) or None
+    :type params: (:obj:`tuple` < :obj:`int` >, :obj:`tuple` < :obj:`int` >,
+             :obj:`tuple` < :obj:`int` >, :obj:`tuple` < :obj:`int` >)
+    :returns: hyperslab selection
+    :rtype: :class:`h5cpp.dataspace.Hyperslab`
+    """
+    if params is not None:
+        offset, block, count, stride = params
+        return h5cpp.dataspace.Hyperslab(
+            offset=list(offset), block=list(block),
+            count=list(count), stride=list(stride))
+
+
 def _slice2selection(t, shape):
     """ converts slice(s) to selection
 
+    Hyperslab parameters, e.g. of field[...], field[0:10, :]
+    or field[i, :], are cached for the slice pattern and the field shape
+    and offsets of single indices are filled in for every call.
+    Selections are mutable so a new one is created for every call.
+
     :param t: slice tuple
     :type t: :obj:`tuple`
     :return shape: field shape
@@ -77,71 +258,33 @@ def _slice2selection(t, shape):
     """
     if t is Ellipsis:
         return None
-    elif isinstance(t, slice):
-        start = t.start or 0
-        stop = t.stop or shape[0]
-        if start < 0:
-            start == shape[0] + start
-        if stop < 0:
-            stop == shape[0] + stop
-        if t.step in [None, 1]:
-            return h5cpp.dataspace.Hyperslab(
-                offset=(start,), block=((stop - start),))
-        else:
-            return h5cpp.dataspace.Hyperslab(
-                offset=(start,),
-                count=int(math.ceil((stop - start) / float(t.step))),
-                stride=(t.step,))
-    elif isinstance(t, (int, long)):
-        return h5cpp.dataspace.Hyperslab(
-            offset=(t,), block=(1,))
-    elif isinstance(t, (list, tuple)):
-        offset = []
-        block = []
-        count = []
-        stride = []
-        it = -1
-        for tit, tel in enumerate(t):
-            it += 1
-            if isinstance(tel, (int, long)):
-                if tel < 0:
-                    offset.append(shape[it] + tel)
-                else:
-                    offset.append(tel)
-                block.append(1)
-                count.append(1)
-                stride.append(1)
-            elif isinstance(tel, slice):
-                start = tel.start if tel.start is not None else 0
-                stop = tel.stop if tel.stop is not None else shape[it]
-                if start < 0:
-                    start == shape[it] + start
-                if stop < 0:
-                    stop == shape[it] + stop
-                if tel.step in [None, 1]:
-                    offset.append(start)
-                    block.append(stop - start)
-                    count.append(1)
-                    stride.append(1)
-                else:
-                    offset.append(start)
-                    block.append(1)
-                    count.append(
-                        int(math.ceil(
-                            (stop - start) / float(tel.step))))
-                    stride.append(tel.step)
-            elif tel is Ellipsis:
-                esize = len(shape) - len(t) + 1
-                for jt in range(esize):
-                    offset.append(0)
-                    block.append(shape[it])
-                    count.append(1)
-                    stride.append(1)
-                    if jt < esize - 1:
-                        it += 1
-        if len(offset):
-            return h5cpp.dataspace.Hyperslab(
-                offset=offset, block=block, count=count, stride=stride)
+    elif not isinstance(t, (list, tuple)):
+        t = (t,)
+    pattern = _slicepattern(t)
+    if Ellipsis in pattern:
+        key = (pattern, tuple(shape))
+    else:
+        # parameters do not depend on sizes of dimensions with single
+        # indices, e.g. of a field growing with every point
+        key = (pattern, tuple(
+            None if pt is False else sh for pt, sh in zip(pattern, shape)
+        ) + tuple(shape[len(pattern):]))
+    with _SELECTIONLOCK:
+        try:
+            params, dims = _SELECTIONS.pop(key)
+        except KeyError:
+            params = _hyperslabparams(t, shape)
+            dims = _indexdims(t, shape)
+            while len(_SELECTIONS) >= SELECTIONCACHESIZE:
+                _SELECTIONS.popitem(last=False)
+        # the most recently used at the end
+        _SELECTIONS[key] = (params, dims)
+    if params is not None and dims:
+        offset = list(params[0])
+        for tit, it in dims:
+            offset[it] = shape[it] + t[tit] if t[tit] < 0 else t[tit]
+        params = (offset,) + params[1:]
+    return _newhyperslab(params)
 
 
 pTh = {
@@ -197,10 +340,30 @@ def open_file(filename, readonly=False, libver=None, swmr=False):
     :returns: file object
     :rtype: :class:`H5CppFile`
     """
+    return H5CppFile(
+        _openfile(filename, readonly, libver, swmr), filename)
+
 
+def _openfile(filename, readonly=False, libver=None, swmr=False,
+              strong=False):
+    """ open the native file
+
+    :param filename: file name
+    :type filename: :obj:`str`
+    :param readonly: readonly flag
+    :type readonly: :obj:`bool`
+    :param libver: library version: 'lastest' or 'earliest'
+    :type libver: :obj:`str`
+    :param swmr: swmr flag
+    :type swmr: :obj:`bool`
+    :param strong: close all objects of the file on its close
+    :type strong: :obj:`bool`
+    :returns: native file object
+    :rtype: :class:`h5cpp.file.File`
+    """
     fapl = h5cpp.property.FileAccessList()
-    # if hasattr(fapl, "set_close_degree"):
-    #     fapl.set_close_degree(h5cpp._property.CloseDegree.STRONG)
+    if strong and hasattr(fapl, "set_close_degree"):
+        fapl.set_close_degree(h5cpp.property.CloseDegree.STRONG)
     if readonly:
         flag = h5cpp.file.AccessFlags.READONLY
     else:
@@ -217,7 +380,7 @@ def open_file(filename, readonly=False, libver=None, swmr=False):
         fapl.library_version_bounds(
             h5cpp.property.LibVersion.LATEST,
             h5cpp.property.LibVersion.LATEST)
-    return H5CppFile(h5cpp.file.open(filename, flag, fapl), filename)
+    return h5cpp.file.open(filename, flag, fapl)
 
 
 def is_image_file_supported():
@@ -240,6 +403,15 @@ def is_vds_supported():
         hasattr(h5cpp.property, "VirtualDataMaps")
 
 
+def is_direct_chunk_supported():
+    """ provides if direct chunk writing is supported
+
+    :retruns: if direct chunk writing is supported
+    :rtype: :obj:`bool`
+    """
+    return hasattr(h5cpp.node.Dataset, "write_chunk")
+
+
 def load_file(membuffer, filename=None, readonly=False, **pars):
     """ load a file from memory byte buffer
 
@@ -275,6 +447,23 @@ def load_file(membuffer, filename=None, readonly=False, **pars):
     return H5CppFile(h5cpp.file.from_buffer(npdata, flag), filename)
 
 
+def open_file_view(filename, libver=None, swmr=False):
+    """ open the file with lightweight read-only node views
+
+    :param filename: file name
+    :type filename: :obj:`str`
+    :param libver: library version: 'lastest' or 'earliest'
+    :type libver: :obj:`str`
+    :param swmr: swmr flag
+    :type swmr: :obj:`bool`
+    :returns: file view
+    :rtype: :class:`H5CppFileView`
+    """
+    return H5CppFileView(
+        _openfile(filename, True, libver=libver, swmr=swmr, strong=True),
+        filename)
+
+
 def create_file(filename, overwrite=False, libver=None, swmr=None):
     """ create a new file
 
@@ -361,6 +550,223 @@ def get_links(parent):
     return links
 
 
+def _grouppath(h5object, name, tparent, nxclass=None):
+    """ resolve the nexus path with NX_class of a group
+
+    :param h5object: h5 group
+    :type h5object: :class:`h5cpp.node.Group`
+    :param name: group name
+    :type name: :obj:`str`
+    :param tparent: tree parent
+    :type tparent: :class:`H5CppGroup` or :class:`H5CppGroupView`
+    :param nxclass: NX_class given at creation or None to read it
+    :type nxclass: :obj:`str`
+    :returns: group nexus path
+    :rtype: :obj:`str`
+    """
+    path = u""
+    if name is None:
+        return path
+    if tparent and tparent.path:
+        if isinstance(tparent, (H5CppFile, H5CppFileView)):
+            if name == ".":
+                path = u"/"
+            else:
+                path = u"/" + name
+        else:
+            if tparent.path.endswith("/"):
+                path = tparent.path
+            else:
+                path = tparent.path + u"/"
+            path += name
+    if ":" not in name:
+        if nxclass is not None:
+            clss = nxclass
+        elif h5object.attributes.exists(u"NX_class"):
+            clss = filewriter.first(h5object.attributes["NX_class"]).read()
+        else:
+            clss = ""
+        if clss:
+            if isinstance(clss, (list, np.ndarray)):
+                clss = clss[0]
+        if clss and clss != 'NXroot':
+            path += u":" + str(clss)
+    return path
+
+
+def _fielddtype(h5object):
+    """ reads data type of a field
+
+    :param h5object: h5 dataset
+    :type h5object: :class:`h5cpp.node.Dataset`
+    :returns: field data type
+    :rtype: :obj:`str`
+    """
+    if str(h5object.datatype.type) == "FLOAT":
+        if h5object.datatype.size == 8:
+            return "float64"
+        elif h5object.datatype.size == 4:
+            return "float32"
+        elif h5object.datatype.size == 16:
+            return "float128"
+        else:
+            return "float"
+    elif str(h5object.datatype.type) == "INTEGER":
+
+        if h5object.datatype.size == 8:
+            if h5object.datatype.is_signed():
+                return "int64"
+            else:
+                return "uint64"
+        elif h5object.datatype.size == 4:
+            if h5object.datatype.is_signed():
+                return "int32"
+            else:
+                return "uint32"
+        elif h5object.datatype.size == 2:
+            if h5object.datatype.is_signed():
+                return "int16"
+            else:
+                return "uint16"
+        elif h5object.datatype.size == 1:
+            if h5object.datatype.is_signed():
+                return "int8"
+            else:
+                return "uint8"
+        elif h5object.datatype.size == 16:
+            if h5object.datatype.is_signed():
+                return "int128"
+            else:
+                return "uint128"
+        else:
+            return "int"
+    elif str(h5object.datatype.type) == "ENUM":
+        if h5cpp._datatype.is_bool(
+                h5cpp.datatype.Enum(h5object.datatype)):
+            return "bool"
+        else:
+            return "int"
+
+    return hTp[h5object.datatype.type]
+
+
+def _fieldshape(h5object):
+    """ reads shape of a field
+
+    :param h5object: h5 dataset
+    :type h5object: :class:`h5cpp.node.Dataset`
+    :returns: field shape
+    :rtype: :obj:`list` < :obj:`int` >
+    """
+    dataspace = h5object.dataspace
+    if hasattr(dataspace, "current_dimensions"):
+        return dataspace.current_dimensions
+    return (1,)
+
+
+def _fieldchunk(h5object):
+    """ reads chunk shape of a field
+
+    :param h5object: h5 dataset
+    :type h5object: :class:`h5cpp.node.Dataset`
+    :returns: field chunk shape or None for contiguous fields
+    :rtype: :obj:`list` < :obj:`int` >
+    """
+    dcpl = h5object.creation_list
+    if dcpl.layout != h5cpp.property.DatasetLayout.CHUNKED:
+        return None
+    return list(dcpl.chunk)
+
+
+def _readfield(h5object, dtype, shape):
+    """ reads the whole field value
+
+    :param h5object: h5 dataset
+    :type h5object: :class:`h5cpp.node.Dataset`
+    :param dtype: field data type
+    :type dtype: :obj:`str`
+    :param shape: field shape
+    :type shape: :obj:`list` < :obj:`int` >
+    :returns: field value
+    :rtype: :obj:`any`
+    """
+    if dtype in ['string', b'string']:
+        # workaround for bug: h5cpp #355
+        if h5object.dataspace.size == 0:
+            if shape:
+                v = np.empty(shape=shape, dtype=nptype(dtype))
+            else:
+                v = []
+        else:
+            v = h5object.read()
+        try:
+            v = v.decode('UTF-8')
+        except Exception:
+            pass
+    else:
+        v = h5object.read()
+    return v
+
+
+def _getfielditem(h5object, t, dtype, shape):
+    """ reads a field selection
+
+    :param h5object: h5 dataset
+    :type h5object: :class:`h5cpp.node.Dataset`
+    :param t: slice tuple
+    :type t: :obj:`tuple`
+    :param dtype: field data type
+    :type dtype: :obj:`str`
+    :param shape: field shape
+    :type shape: :obj:`list` < :obj:`int` >
+    :returns: selected value
+    :rtype: :obj:`any`
+    """
+    if shape == (1,) and t == 0:
+        if dtype in ['string', b'string']:
+            # workaround for bug: h5cpp #355
+            if h5object.dataspace.size == 0:
+                if shape:
+                    v = np.empty(shape=shape, dtype=dtype)
+                else:
+                    v = []
+            else:
+                v = h5object.read()
+        else:
+            v = h5object.read()
+
+    selection = _slice2selection(t, shape)
+    if selection is None:
+        if dtype in ['string', b'string']:
+            # workaround for bug: h5cpp #355
+            if h5object.dataspace.size == 0:
+                if shape:
+                    v = np.empty(shape=shape, dtype=dtype)
+                else:
+                    v = []
+            else:
+                v = h5object.read()
+            try:
+                v = v.decode('UTF-8')
+            except Exception:
+                pass
+        else:
+            v = h5object.read()
+        return v
+    v = h5object.read(selection=selection)
+    # if hasattr(v, "shape") and hasattr(v, "reshape"):
+    #     shape = [sh for sh in v.shape if sh != 1]
+    #     if shape != list(v.shape):
+    #         v.reshape(shape)
+    v = _squeeze(v)
+    if dtype in ['string', b'string']:
+        try:
+            v = v.decode('UTF-8')
+        except Exception:
+            pass
+    return v
+
+
 def data_filter():
     """ create deflate filter
 
@@ -533,35 +939,21 @@ class H5CppGroup(filewriter.FTGroup):
         """
 
         filewriter.FTGroup.__init__(self, h5object, tparent)
-        #: (:obj:`str`) object nexus path
-        self.path = u""
         #: (:obj:`str`) object name
         self.name = None
+        #: (:obj:`str`) NX_class given at creation, read if None
+        self._nxclass = None
         if hasattr(h5object, "link"):
             self.name = h5object.link.path.name
-            if tparent and tparent.path:
-                if isinstance(tparent, H5CppFile):
-                    if self.name == ".":
-                        self.path = u"/"
-                    else:
-                        self.path = u"/" + self.name
-                else:
-                    if tparent.path.endswith("/"):
-                        self.path = tparent.path
-                    else:
-                        self.path = tparent.path + u"/"
-                    self.path += self.name
-            if ":" not in self.name:
-                if u"NX_class" in [at.name for at in h5object.attributes]:
-                    clss = filewriter.first(
-                        h5object.attributes["NX_class"]).read()
-                else:
-                    clss = ""
-                if clss:
-                    if isinstance(clss, (list, np.ndarray)):
-                        clss = clss[0]
-                if clss and clss != 'NXroot':
-                    self.path += u":" + str(clss)
+
+    def _nexuspath(self):
+        """ resolve the nexus path with NX_class of the group
+
+        :returns: object nexus path
+        :rtype: :obj:`str`
+        """
+        return _grouppath(
+            self._h5object, self.name, self._tparent, self._nxclass)
 
     def open(self, name):
         """ open a file tree element
@@ -617,7 +1009,9 @@ class H5CppGroup(filewriter.FTGroup):
         if nxclass is not None:
             gr.attributes.create(
                 "NX_class", pTh["unicode"]).write(unicode(nxclass))
-        return H5CppGroup(gr, self)
+        group = H5CppGroup(gr, self)
+        group._nxclass = unicode(nxclass or "")
+        return group
 
     def create_virtual_field(self, name, layout, fillvalue=None):
         """ creates a virtual filed tres element
@@ -746,6 +1140,14 @@ class H5CppGroup(filewriter.FTGroup):
         return name in [
             lk.path.name for lk in self._h5object.links]
 
+    def remove(self, name):
+        """ remove a child
+
+        :param name: child name
+        :type name: :obj:`str`
+        """
+        h5cpp.node.remove(base=self._h5object, path=h5cpp.Path(name))
+
     def names(self):
         """ read the child names
 
@@ -820,20 +1222,32 @@ class H5CppField(filewriter.FTField):
         :type tparent: :obj:`FTObject`
         """
         filewriter.FTField.__init__(self, h5object, tparent)
-        #: (:obj:`str`) object nexus path
-        self.path = ''
         #: (:obj:`str`) object name
         self.name = None
+        #: (:obj:`str`) cached field data type, fixed for hdf5 datasets
+        self.__dtype = None
+        #: (:obj:`tuple` < :obj:`int` >) cached field shape,
+        #:    updated by grow(), refresh() and reopen(), i.e. a field
+        #:    grown via another object has to be refreshed
+        self.__shape = None
         if hasattr(h5object, "link"):
             self.name = h5object.link.path.name
-            if tparent and tparent.path:
-                if tparent.path == "/":
-                    self.path = "/" + self.name
-                else:
-                    self.path = tparent.path + "/" + self.name
         #: (:obj:`bool`) bool flag
         # self.boolflag = False
 
+    def _nexuspath(self):
+        """ resolve the nexus path of the field
+
+        :returns: object nexus path
+        :rtype: :obj:`str`
+        """
+        tparent = self._tparent
+        if self.name is None or not tparent or not tparent.path:
+            return ''
+        if tparent.path == "/":
+            return "/" + self.name
+        return tparent.path + "/" + self.name
+
     @property
     def attributes(self):
         """ return the attribute manager
@@ -859,6 +1273,8 @@ class H5CppField(filewriter.FTField):
         except Exception:
             self._h5object = [lk for lk in self._tparent.h5object.links
                               if lk.path.name == self.name][0]
+        self.__dtype = None
+        self.__shape = None
 
         filewriter.FTField.reopen(self)
 
@@ -869,6 +1285,7 @@ class H5CppField(filewriter.FTField):
         :rtype: :obj:`bool`
         """
         self._h5object.refresh()
+        self.__shape = None
         return True
 
     def grow(self, dim=0, ext=1):
@@ -880,6 +1297,7 @@ class H5CppField(filewriter.FTField):
         :type dim: :obj:`int`
         """
         self._h5object.extent(dim, ext)
+        self.__shape = None
 
     def read(self):
         """ read the field value
@@ -887,23 +1305,7 @@ class H5CppField(filewriter.FTField):
         :returns: h5 object
         :rtype: :obj:`any`
         """
-        if self.dtype in ['string', b'string']:
-            # workaround for bug: h5cpp #355
-            if self.size == 0:
-                if self.shape:
-                    v = np.empty(shape=self.shape,
-                                 dtype=nptype(self.dtype))
-                else:
-                    v = []
-            else:
-                v = self._h5object.read()
-            try:
-                v = v.decode('UTF-8')
-            except Exception:
-                pass
-        else:
-            v = self._h5object.read()
-        return v
+        return _readfield(self._h5object, self.dtype, self.shape)
 
     def write(self, o):
         """ write the field value
@@ -937,73 +1339,43 @@ class H5CppField(filewriter.FTField):
         :returns: h5 object
         :rtype: :obj:`any`
         """
-        if self.shape == (1,) and t == 0:
-            if self.dtype in ['string', b'string']:
-                # workaround for bug: h5cpp #355
-                if self.size == 0:
-                    if self.shape:
-                        v = np.empty(shape=self.shape, dtype=self.dtype)
-                    else:
-                        v = []
-                else:
-                    v = self._h5object.read()
-            else:
-                v = self._h5object.read()
+        return _getfielditem(self._h5object, t, self.dtype, self.shape)
 
-        selection = _slice2selection(t, self.shape)
-        if selection is None:
-            if self.dtype in ['string', b'string']:
-                # workaround for bug: h5cpp #355
-                if self.size == 0:
-                    if self.shape:
-                        v = np.empty(shape=self.shape, dtype=self.dtype)
-                    else:
-                        v = []
-                else:
-                    v = self._h5object.read()
-                try:
-                    v = v.decode('UTF-8')
-                except Exception:
-                    pass
-            else:
-                v = self._h5object.read()
-            return v
-        v = self._h5object.read(selection=selection)
-        # if hasattr(v, "shape") and hasattr(v, "reshape"):
-        #     shape = [sh for sh in v.shape if sh != 1]
-        #     if shape != list(v.shape):
-        #         v.reshape(shape)
-        if hasattr(v, "shape"):
-            shape = v.shape
-            if len(shape) == 3 and shape[2] == 1:
-                #: problem with old numpy
-                # v.reshape(shape[:2])
-                v = v[:, :, 0]
-                shape = v.shape
-            if len(shape) == 3 and shape[1] == 1:
-                # v.reshape([shape[0], shape[2]])
-                v = v[:, 0, :]
-                shape = v.shape
-            if len(shape) == 3 and shape[0] == 1:
-                # v.reshape([shape[1], shape[2]])
-                v = v[0, :, :]
-                shape = v.shape
-            if len(shape) == 2 and shape[1] == 1:
-                # v.reshape([shape[0]])
-                v = v[0, :]
-                shape = v.shape
-            if len(shape) == 2 and shape[0] == 1:
-                # v.reshape([shape[1]])
-                v = v[:, 0]
-                shape = v.shape
-            if len(shape) == 1 and shape[0] == 1:
-                v = v[0]
-        if self.dtype in ['string', b'string']:
-            try:
-                v = v.decode('UTF-8')
-            except Exception:
-                pass
-        return v
+    def write_direct_chunk(self, data, offset, filtermask=0):
+        """ write a raw chunk bypassing the filter pipeline
+
+        :param data: raw chunk data
+        :type data: :obj:`bytes` or :class:`numpy.ndarray`
+        :param offset: logical position of the chunk in the field
+        :type offset: :obj:`list` < :obj:`int` >
+        :param filtermask: mask of filters which have not been applied
+        :type filtermask: :obj:`int`
+        """
+        if not is_direct_chunk_supported():
+            raise Exception("Direct chunk writing not supported")
+        if not isinstance(data, np.ndarray):
+            data = np.frombuffer(data, dtype="uint8")
+        elif data.dtype != np.uint8:
+            # h5cpp writes chunks only from integer buffers
+            data = np.ascontiguousarray(data).reshape(-1).view("uint8")
+        self._h5object.write_chunk(data, list(offset), filtermask)
+
+    def read_direct_chunk(self, offset):
+        """ read a raw chunk bypassing the filter pipeline
+
+        :param offset: logical position of the chunk in the field
+        :type offset: :obj:`list` < :obj:`int` >
+        :returns: (mask of filters which have not been applied,
+                   raw chunk data)
+        :rtype: (:obj:`int`, :obj:`bytes`)
+        """
+        if not hasattr(self._h5object, "read_chunk"):
+            raise Exception("Direct chunk reading not supported")
+        data = np.zeros(
+            (self._h5object.chunk_storage_size(list(offset)),),
+            dtype="uint8")
+        filtermask = self._h5object.read_chunk(data, list(offset))
+        return filtermask, data.tobytes()
 
     @property
     def is_valid(self):
@@ -1021,55 +1393,17 @@ class H5CppField(filewriter.FTField):
         :returns: field data type
         :rtype: :obj:`str`
         """
-        # if self.boolflag:
-        #     return "bool"
-        if str(self._h5object.datatype.type) == "FLOAT":
-            if self._h5object.datatype.size == 8:
-                return "float64"
-            elif self._h5object.datatype.size == 4:
-                return "float32"
-            elif self._h5object.datatype.size == 16:
-                return "float128"
-            else:
-                return "float"
-        elif str(self._h5object.datatype.type) == "INTEGER":
+        if self.__dtype is None:
+            self.__dtype = self._datatype()
+        return self.__dtype
 
-            if self._h5object.datatype.size == 8:
-                if self._h5object.datatype.is_signed():
-                    return "int64"
-                else:
-                    return "uint64"
-            elif self._h5object.datatype.size == 4:
-                if self._h5object.datatype.is_signed():
-                    return "int32"
-                else:
-                    return "uint32"
-            elif self._h5object.datatype.size == 2:
-                if self._h5object.datatype.is_signed():
-                    return "int16"
-                else:
-                    return "uint16"
-            elif self._h5object.datatype.size == 1:
-                if self._h5object.datatype.is_signed():
-                    return "int8"
-                else:
-                    return "uint8"
-            elif self._h5object.datatype.size == 16:
-                if self._h5object.datatype.is_signed():
-                    return "int128"
-                else:
-                    return "uint128"
-            else:
-                return "int"
-        elif str(self._h5object.datatype.type) == "ENUM":
-            if h5cpp._datatype.is_bool(
-                    h5cpp.datatype.Enum(self._h5object.datatype)):
-                return "bool"
-            else:
-                return "int"
+    def _datatype(self):
+        """ reads field data type
 
-        return hTp[self._h5object.datatype.type]
-#
+        :returns: field data type
+        :rtype: :obj:`str`
+        """
+        return _fielddtype(self._h5object)
 
     @property
     def shape(self):
@@ -1078,10 +1412,9 @@ class H5CppField(filewriter.FTField):
         :returns: field shape
         :rtype: :obj:`list` < :obj:`int` >
         """
-        if hasattr(self._h5object.dataspace, "current_dimensions"):
-            return self._h5object.dataspace.current_dimensions
-        else:
-            return (1,)
+        if self.__shape is None:
+            self.__shape = _fieldshape(self._h5object)
+        return self.__shape
 
     @property
     def size(self):
@@ -1092,6 +1425,28 @@ class H5CppField(filewriter.FTField):
         """
         return self._h5object.dataspace.size
 
+    @property
+    def chunk(self):
+        """ field chunk shape
+
+        :returns: field chunk shape or None for contiguous fields
+        :rtype: :obj:`list` < :obj:`int` >
+        """
+        return _fieldchunk(self._h5object)
+
+    @property
+    def filters(self):
+        """ field filter pipeline
+
+        :returns: a list of (filter id, filter options) or None
+                  if the pipeline cannot be inspected
+        :rtype: :obj:`list` < (:obj:`int`, :obj:`tuple` <:obj:`int`>) >
+        """
+        if not hasattr(self._h5object, "filters"):
+            return None
+        return [(flt.id, tuple(getattr(flt, "cd_values", ())))
+                for flt in self._h5object.filters()]
+
 
 class H5CppLink(filewriter.FTLink):
 
@@ -1107,16 +1462,21 @@ class H5CppLink(filewriter.FTLink):
         :type tparent: :obj:`FTObject`
         """
         filewriter.FTLink.__init__(self, h5object, tparent)
-        #: (:obj:`str`) object nexus path
-        self.path = ''
         #: (:obj:`str`) object name
-        self.name = None
-        if tparent and tparent.path:
-            self.path = tparent.path
-        if not self.path.endswith("/"):
-            self.path += "/"
         self.name = h5object.path.name
-        self.path += self.name
+
+    def _nexuspath(self):
+        """ resolve the nexus path of the link
+
+        :returns: object nexus path
+        :rtype: :obj:`str`
+        """
+        path = ''
+        if self._tparent and self._tparent.path:
+            path = self._tparent.path
+        if not path.endswith("/"):
+            path += "/"
+        return path + self.name
 
     @property
     def is_valid(self):
@@ -1146,7 +1506,7 @@ class H5CppLink(filewriter.FTLink):
             par = obj.parent
             if par is None:
                 break
-            if isinstance(par, H5CppFile):
+            if isinstance(par, (H5CppFile, H5CppFileView)):
                 filename = par.name
                 break
             else:
@@ -1377,6 +1737,62 @@ class H5CppAttributeManager(filewriter.FTAttributeManager):
         """
         return [att.name for att in self._h5object]
 
+    def remove(self, name):
+        """ remove the attribute
+
+        :param name: attribute name
+        :type name: :obj:`str`
+        """
+        self._h5object.remove(name)
+
+    def read_all(self, names=None):
+        """ reads values of many attributes at once
+
+        :param names: attribute names, all attributes if None
+        :type names: :obj:`list` <:obj:`str`>
+        :returns: dictionary with attribute values
+        :rtype: :obj:`dict` <:obj:`str`, `any`>
+        """
+        if names is None:
+            attrs = list(self._h5object)
+        else:
+            attrs = [self._h5object[name] for name in names]
+        values = {}
+        for at in attrs:
+            v = _squeeze(at[...])
+            if hasattr(v, "decode"):
+                try:
+                    v = v.decode('UTF-8')
+                except Exception:
+                    pass
+            values[at.name] = v
+        return values
+
+    def write_many(self, attributes):
+        """ creates or overwrites many attributes at once,
+        data types and shapes are taken from the values
+
+        :param attributes: dictionary with attribute values
+        :type attributes: :obj:`dict` <:obj:`str`, `any`>
+        """
+        names = set(att.name for att in self._h5object)
+        for name, value in attributes.items():
+            dtype, shape = self._valuetype(value)
+            if name in names:
+                self._h5object.remove(name)
+            if shape:
+                at = self._h5object.create(name, pTh[dtype], shape)
+            else:
+                at = self._h5object.create(name, pTh[dtype])
+            if dtype != "string":
+                at.write(np.array(value, dtype=dtype))
+            elif isinstance(value, bytes):
+                at.write(value.decode('UTF-8'))
+            elif isinstance(value, unicode):
+                at.write(value)
+            else:
+                at.write(np.array(value, dtype=np.unicode_))
+
     def close(self):
         """ close attribure manager
         """
@@ -1414,13 +1830,18 @@ class H5CppAttribute(filewriter.FTAttribute):
         filewriter.FTAttribute.__init__(self, h5object, tparent)
         #: (:obj:`str`) object name
         self.name = h5object.name
-        #: (:obj:`str`) object nexus path
-        self.path = tparent.path
-        self.path += "@%s" % self.name
 
         #: (:obj:`bool`) bool flag
         # self.boolflag = False
 
+    def _nexuspath(self):
+        """ resolve the nexus path of the attribute
+
+        :returns: object nexus path
+        :rtype: :obj:`str`
+        """
+        return self._tparent.path + "@%s" % self.name
+
     def close(self):
         """ close attribute
         """
@@ -1522,31 +1943,7 @@ class H5CppAttribute(filewriter.FTAttribute):
         #     shape = [sh for sh in v.shape if sh != 1]
         #     if shape != list(v.shape):
         #         v.reshape(shape)
-        if hasattr(v, "shape"):
-            shape = v.shape
-            if len(shape) == 3 and shape[2] == 1:
-                #: problem with old numpy
-                # v.reshape(shape[:2])
-                v = v[:, :, 0]
-                shape = v.shape
-            if len(shape) == 3 and shape[1] == 1:
-                # v.reshape([shape[0], shape[2]])
-                v = v[:, 0, :]
-                shape = v.shape
-            if len(shape) == 3 and shape[0] == 1:
-                # v.reshape([shape[1], shape[2]])
-                v = v[0, :, :]
-                shape = v.shape
-            if len(shape) == 2 and shape[1] == 1:
-                # v.reshape([shape[0]])
-                v = v[0, :]
-                shape = v.shape
-            if len(shape) == 2 and shape[0] == 1:
-                # v.reshape([shape[1]])
-                v = v[:, 0]
-                shape = v.shape
-            if len(shape) == 1 and shape[0] == 1:
-                v = v[0]
+        v = _squeeze(v)
         if self.dtype in ['string', b'string']:
             try:
                 v = v.decode('UTF-8')
@@ -1634,3 +2031,211 @@ class H5CppAttribute(filewriter.FTAttribute):
         """
         self._h5object = self._tparent.h5object.attributes[self.name]
         filewriter.FTAttribute.reopen(self)
+
+
+class H5CppFileView(filewriter.FTFileView):
+
+    """ lightweight read-only view of a file
+    """
+
+    __slots__ = ()
+
+    def root(self):
+        """ root object
+
+        :returns: root group view
+        :rtype: :class:`H5CppGroupView`
+        """
+        g = H5CppGroupView(self._h5object.root(), self)
+        g.path = u"/"
+        return g
+
+    def close(self):
+        """ close file
+        """
+        if self._h5object.is_valid:
+            self._h5object.close()
+
+    @property
+    def is_valid(self):
+        """ check if file is valid
+
+        :returns: valid flag
+        :rtype: :obj:`bool`
+        """
+        return self._h5object.is_valid
+
+
+class H5CppGroupView(filewriter.FTGroupView):
+
+    """ lightweight read-only view of a group
+    """
+
+    __slots__ = ()
+
+    _nodeclass = H5CppGroup
+
+    def __init__(self, h5object, tparent=None, name=None):
+        """ constructor
+
+        :param h5object: h5 object
+        :type h5object: :obj:`any`
+        :param tparent: tree parent
+        :type tparent: :class:`filewriter.FTNodeView`
+        :param name: object name
+        :type name: :obj:`str`
+        """
+        if name is None and hasattr(h5object, "link"):
+            name = h5object.link.path.name
+        filewriter.FTGroupView.__init__(self, h5object, tparent, name)
+
+    def _nexuspath(self):
+        """ resolve the nexus path with NX_class of the group
+
+        :returns: object nexus path
+        :rtype: :obj:`str`
+        """
+        return _grouppath(self._h5object, self.name, self._tparent)
+
+    def open(self, name):
+        """ open a file tree element, i.e. a group or field view or
+            a full link or attribute object
+
+        :param name: element name
+        :type name: :obj:`str`
+        :returns: file tree object
+        :rtype: :class:`filewriter.FTNodeView` or :class:`FTObject`
+        """
+        try:
+            path = h5cpp.Path(name)
+            if self._h5object.has_group(path):
+                return H5CppGroupView(self._h5object.get_group(path), self)
+            elif self._h5object.has_dataset(path):
+                return H5CppFieldView(self._h5object.get_dataset(path), self)
+        except Exception as e:
+            print(str(e))
+            return self._fullnode().open_link(name)
+        return self._fullnode().open(name)
+
+    def names(self):
+        """ read the child names
+
+        :returns: h5 object
+        :rtype: :obj:`list` <`str`>
+        """
+        return [
+            lk.path.name for lk in self._h5object.links]
+
+    @property
+    def attributes(self):
+        """ return the attribute manager
+
+        :returns: attribute manager
+        :rtype: :class:`H5CppAttributeManager`
+        """
+        return H5CppAttributeManager(self._h5object.attributes, self)
+
+    @property
+    def is_valid(self):
+        """ check if group is valid
+
+        :returns: valid flag
+        :rtype: :obj:`bool`
+        """
+        return self._h5object.is_valid
+
+
+class H5CppFieldView(filewriter.FTFieldView):
+
+    """ lightweight read-only view of a field
+    """
+
+    __slots__ = ()
+
+    _nodeclass = H5CppField
+
+    def __init__(self, h5object, tparent=None, name=None):
+        """ constructor
+
+        :param h5object: h5 object
+        :type h5object: :obj:`any`
+        :param tparent: tree parent
+        :type tparent: :class:`filewriter.FTNodeView`
+        :param name: object name
+        :type name: :obj:`str`
+        """
+        if name is None and hasattr(h5object, "link"):
+            name = h5object.link.path.name
+        filewriter.FTFieldView.__init__(self, h5object, tparent, name)
+
+    @property
+    def attributes(self):
+        """ return the attribute manager
+
+        :returns: attribute manager
+        :rtype: :class:`H5CppAttributeManager`
+        """
+        return H5CppAttributeManager(self._h5object.attributes, self)
+
+    @property
+    def is_valid(self):
+        """ check if field is valid
+
+        :returns: valid flag
+        :rtype: :obj:`bool`
+        """
+        return self._h5object.is_valid
+
+    def read(self):
+        """ read the field value
+
+        :returns: python object
+        :rtype: :obj:`any`
+        """
+        return _readfield(self._h5object, self.dtype, self.shape)
+
+    def __getitem__(self, t):
+        """ get value
+
+        :param t: slice tuple
+        :type t: :obj:`tuple`
+        :returns: python object
+        :rtype: :obj:`any`
+        """
+        return _getfielditem(self._h5object, t, self.dtype, self.shape)
+
+    @property
+    def dtype(self):
+        """ field data type
+
+        :returns: field data type
+        :rtype: :obj:`str`
+        """
+        return _fielddtype(self._h5object)
+
+    @property
+    def shape(self):
+        """ field shape
+
+        :returns: field shape
+        :rtype: :obj:`list` < :obj:`int` >
+        """
+        return _fieldshape(self._h5object)
+
+    @property
+    def size(self):
+        """ field size
+
+        :returns: field size
+        :rtype: :obj:`int`
+        """
+        return self._h5object.dataspace.size
+
+    @property
+    def chunk(self):
+        """ field chunk shape
+
+        :returns: field chunk shape or None for contiguous fields
+        :rtype: :obj:`list` < :obj:`int` >
+        """
+        return _fieldchunk(self._h5object)
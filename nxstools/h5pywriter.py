@@ -74,6 +74,15 @@ def is_vds_supported():
     return h5ver >= 2009
 
 
+def is_direct_chunk_supported():
+    """ provides if direct chunk writing is supported
+
+    :retruns: if direct chunk writing is supported
+    :rtype: :obj:`bool`
+    """
+    return hasattr(h5py.h5d.DatasetID, "write_direct_chunk")
+
+
 def load_file(membuffer, filename=None, readonly=False, **pars):
     """ load a file from memory byte buffer
 
@@ -119,6 +128,19 @@ def open_file(filename, readonly=False, **pars):
         return H5PYFile(h5py.File(filename, "r+", **pars), filename)
 
 
+def open_file_view(filename, **pars):
+    """ open the file with lightweight read-only node views
+
+    :param filename: file name
+    :type filename: :obj:`str`
+    :param pars: parameters
+    :type pars: :obj:`dict` < :obj:`str`, :obj:`str`>
+    :returns: file view
+    :rtype: :class:`H5PYFileView`
+    """
+    return H5PYFileView(h5py.File(filename, "r", **pars), filename)
+
+
 def create_file(filename, overwrite=False, **pars):
     """ create a new file
 
@@ -183,6 +205,40 @@ def get_links(parent):
         for name in parent.names()]
 
 
+def _grouppath(h5object, name, tparent, nxclass=None):
+    """ resolve the nexus path with NX_class of a group
+
+    :param h5object: h5 group
+    :type h5object: :class:`h5py.Group`
+    :param name: group name
+    :type name: :obj:`str`
+    :param tparent: tree parent
+    :type tparent: :class:`H5PYGroup` or :class:`H5PYGroupView`
+    :param nxclass: NX_class given at creation or None to read it
+    :type nxclass: :obj:`str`
+    :returns: group nexus path
+    :rtype: :obj:`str`
+    """
+    path = u""
+    if name is None:
+        return path
+    if tparent and tparent.path:
+        if tparent.path == u"/":
+            path = u"/" + name
+        else:
+            path = tparent.path + u"/" + name
+    if ":" not in name:
+        if nxclass is not None:
+            clss = nxclass
+        elif u"NX_class" in h5object.attrs:
+            clss = filewriter.first(h5object.attrs["NX_class"])
+        else:
+            clss = ""
+        if clss:
+            path += u":" + str(clss)
+    return path
+
+
 def data_filter():
     """ create deflate filter
 
@@ -352,23 +408,21 @@ class H5PYGroup(filewriter.FTGroup):
         :type tparent: :obj:`FTObject`
         """
         filewriter.FTGroup.__init__(self, h5object, tparent)
-        self.path = u""
         self.name = None
+        #: (:obj:`str`) NX_class given at creation, read if None
+        self._nxclass = None
         if hasattr(h5object, "name"):
             name = h5object.name
             self.name = name.split("/")[-1]
-            if tparent and tparent.path:
-                if tparent.path == u"/":
-                    self.path = u"/" + self.name
-                else:
-                    self.path = tparent.path + u"/" + self.name
-            if ":" not in self.name:
-                if u"NX_class" in h5object.attrs:
-                    clss = filewriter.first(h5object.attrs["NX_class"])
-                else:
-                    clss = ""
-                if clss:
-                    self.path += u":" + str(clss)
+
+    def _nexuspath(self):
+        """ resolve the nexus path with NX_class of the group
+
+        :returns: object nexus path
+        :rtype: :obj:`str`
+        """
+        return _grouppath(
+            self._h5object, self.name, self._tparent, self._nxclass)
 
     def open(self, name):
         """ open a file tree element
@@ -465,7 +519,9 @@ class H5PYGroup(filewriter.FTGroup):
         grp = self._h5object.create_group(n)
         if nxclass:
             grp.attrs["NX_class"] = unicode(nxclass)
-        return H5PYGroup(grp, self)
+        group = H5PYGroup(grp, self)
+        group._nxclass = unicode(nxclass or "")
+        return group
 
     def create_virtual_field(self, name, layout, fillvalue=None):
         """ creates a virtual filed tres element
@@ -572,6 +628,14 @@ class H5PYGroup(filewriter.FTGroup):
         """
         return name in self._h5object.keys()
 
+    def remove(self, name):
+        """ remove a child
+
+        :param name: child name
+        :type name: :obj:`str`
+        """
+        del self._h5object[name]
+
     def names(self):
         """ read the child names
 
@@ -616,16 +680,23 @@ class H5PYField(filewriter.FTField):
         :type tparent: :obj:`FTObject`
         """
         filewriter.FTField.__init__(self, h5object, tparent)
-        self.path = ''
         self.name = None
         if hasattr(h5object, "name"):
             name = h5object.name
             self.name = name.split("/")[-1]
-            if tparent and tparent.path:
-                if tparent.path == "/":
-                    self.path = "/" + self.name
-                else:
-                    self.path = tparent.path + "/" + self.name
+
+    def _nexuspath(self):
+        """ resolve the nexus path of the field
+
+        :returns: object nexus path
+        :rtype: :obj:`str`
+        """
+        tparent = self._tparent
+        if self.name is None or not tparent or not tparent.path:
+            return ''
+        if tparent.path == "/":
+            return "/" + self.name
+        return tparent.path + "/" + self.name
 
     @property
     def attributes(self):
@@ -722,6 +793,41 @@ class H5PYField(filewriter.FTField):
         else:
             return fl
 
+    def write_direct_chunk(self, data, offset, filtermask=0):
+        """ write a raw chunk bypassing the filter pipeline
+
+        :param data: raw chunk data
+        :type data: :obj:`bytes` or :class:`numpy.ndarray`
+        :param offset: logical position of the chunk in the field
+        :type offset: :obj:`list` < :obj:`int` >
+        :param filtermask: mask of filters which have not been applied
+        :type filtermask: :obj:`int`
+        """
+        if not is_direct_chunk_supported():
+            raise Exception("Direct chunk writing not supported")
+        try:
+            self._h5object.id.write_direct_chunk(
+                tuple(offset), data, filtermask)
+        except TypeError:
+            # older h5py accepts only bytes
+            if hasattr(data, "tobytes"):
+                data = data.tobytes()
+            self._h5object.id.write_direct_chunk(
+                tuple(offset), bytes(data), filtermask)
+
+    def read_direct_chunk(self, offset):
+        """ read a raw chunk bypassing the filter pipeline
+
+        :param offset: logical position of the chunk in the field
+        :type offset: :obj:`list` < :obj:`int` >
+        :returns: (mask of filters which have not been applied,
+                   raw chunk data)
+        :rtype: (:obj:`int`, :obj:`bytes`)
+        """
+        if not hasattr(self._h5object.id, "read_direct_chunk"):
+            raise Exception("Direct chunk reading not supported")
+        return self._h5object.id.read_direct_chunk(tuple(offset))
+
     @property
     def is_valid(self):
         """ check if group is valid
@@ -771,6 +877,31 @@ class H5PYField(filewriter.FTField):
         """
         return self._h5object.size
 
+    @property
+    def chunk(self):
+        """ field chunk shape
+
+        :returns: field chunk shape or None for contiguous fields
+        :rtype: :obj:`list` < :obj:`int` >
+        """
+        chunks = self._h5object.chunks
+        return list(chunks) if chunks else None
+
+    @property
+    def filters(self):
+        """ field filter pipeline
+
+        :returns: a list of (filter id, filter options) or None
+                  if the pipeline cannot be inspected
+        :rtype: :obj:`list` < (:obj:`int`, :obj:`tuple` <:obj:`int`>) >
+        """
+        dcpl = self._h5object.id.get_create_plist()
+        filters = []
+        for i in range(dcpl.get_nfilters()):
+            code, _, values, _ = dcpl.get_filter(i)
+            filters.append((code, tuple(values)))
+        return filters
+
 
 class H5PYLink(filewriter.FTLink):
 
@@ -786,16 +917,24 @@ class H5PYLink(filewriter.FTLink):
         :type tparent: :obj:`FTObject`
         """
         filewriter.FTLink.__init__(self, h5object, tparent)
-        self.path = ''
         self.name = None
-        if tparent and tparent.path:
-            self.path = tparent.path
-        if not self.path.endswith("/"):
-            self.path += "/"
+
+    def _nexuspath(self):
+        """ resolve the nexus path of the link
+
+        :returns: object nexus path
+        :rtype: :obj:`str`
+        """
+        path = ''
+        if self._tparent and self._tparent.path:
+            path = self._tparent.path
+        if not path.endswith("/"):
+            path += "/"
+        return path + (self.name or "")
 
     def setname(self, name):
         self.name = name
-        self.path += self.name
+        self._path = None
         return self
 
     @property
@@ -846,7 +985,7 @@ class H5PYLink(filewriter.FTLink):
             par = obj.parent
             if par is None:
                 break
-            if isinstance(par, H5PYFile):
+            if isinstance(par, (H5PYFile, H5PYFileView)):
                 filename = par.name
                 break
             else:
@@ -1056,6 +1195,53 @@ class H5PYAttributeManager(filewriter.FTAttributeManager):
         """
         return self._h5object.keys()
 
+    def remove(self, name):
+        """ remove the attribute
+
+        :param name: attribute name
+        :type name: :obj:`str`
+        """
+        del self._h5object[name]
+
+    def read_all(self, names=None):
+        """ reads values of many attributes at once
+
+        :param names: attribute names, all attributes if None
+        :type names: :obj:`list` <:obj:`str`>
+        :returns: dictionary with attribute values
+        :rtype: :obj:`dict` <:obj:`str`, `any`>
+        """
+        attrs = self._h5object
+        if names is None:
+            names = list(attrs.keys())
+        values = {}
+        for name in names:
+            at = attrs[name]
+            if hasattr(at, "decode") and not isinstance(at, unicode):
+                at = at.decode(encoding="utf-8")
+            values[name] = at
+        return values
+
+    def write_many(self, attributes):
+        """ creates or overwrites many attributes at once,
+        data types and shapes are taken from the values
+
+        :param attributes: dictionary with attribute values
+        :type attributes: :obj:`dict` <:obj:`str`, `any`>
+        """
+        attrs = self._h5object
+        for name, value in attributes.items():
+            dtype, shape = self._valuetype(value)
+            if dtype != "string":
+                attrs[name] = np.array(value, dtype=dtype)
+            elif isinstance(value, bytes):
+                attrs[name] = value.decode(encoding="utf-8")
+            elif isinstance(value, unicode):
+                attrs[name] = value
+            else:
+                attrs[name] = np.array(
+                    value, dtype=h5py.special_dtype(vlen=unicode))
+
     def reopen(self):
         """ reopen field
         """
@@ -1093,8 +1279,13 @@ class H5PYAttribute(filewriter.FTAttribute):
         filewriter.FTAttribute.__init__(self, h5object, tparent)
         self.name = h5object[1]
 
-        self.path = tparent.path
-        self.path += "@%s" % self.name
+    def _nexuspath(self):
+        """ resolve the nexus path of the attribute
+
+        :returns: object nexus path
+        :rtype: :obj:`str`
+        """
+        return self._tparent.path + "@%s" % self.name
 
     def read(self):
         """ read attribute value
@@ -1261,3 +1452,211 @@ class H5PYAttribute(filewriter.FTAttribute):
         """
         filewriter.FTAttribute.close(self)
         self._h5object = None
+
+
+class H5PYFileView(filewriter.FTFileView):
+
+    """ lightweight read-only view of a file
+    """
+
+    __slots__ = ()
+
+    def root(self):
+        """ root object
+
+        :returns: root group view
+        :rtype: :class:`H5PYGroupView`
+        """
+        g = H5PYGroupView(self._h5object, self, u"/")
+        g.path = u"/"
+        return g
+
+    def close(self):
+        """ close file
+        """
+        self._h5object.close()
+
+    @property
+    def is_valid(self):
+        """ check if file is valid
+
+        :returns: valid flag
+        :rtype: :obj:`bool`
+        """
+        return self._h5object.name is not None
+
+
+class H5PYGroupView(filewriter.FTGroupView):
+
+    """ lightweight read-only view of a group
+    """
+
+    __slots__ = ()
+
+    _nodeclass = H5PYGroup
+
+    def __init__(self, h5object, tparent=None, name=None):
+        """ constructor
+
+        :param h5object: h5 object
+        :type h5object: :obj:`any`
+        :param tparent: tree parent
+        :type tparent: :class:`filewriter.FTNodeView`
+        :param name: object name
+        :type name: :obj:`str`
+        """
+        if name is None:
+            name = h5object.name.split("/")[-1]
+        filewriter.FTGroupView.__init__(self, h5object, tparent, name)
+
+    def _nexuspath(self):
+        """ resolve the nexus path with NX_class of the group
+
+        :returns: object nexus path
+        :rtype: :obj:`str`
+        """
+        return _grouppath(self._h5object, self.name, self._tparent)
+
+    def open(self, name):
+        """ open a file tree element, i.e. a group or field view or
+            a full link or attribute object
+
+        :param name: element name
+        :type name: :obj:`str`
+        :returns: file tree object
+        :rtype: :class:`filewriter.FTNodeView` or :class:`FTObject`
+        """
+        itm = self._h5object.get(name)
+        if isinstance(itm, h5py._hl.dataset.Dataset):
+            return H5PYFieldView(itm, self)
+        elif isinstance(itm, h5py._hl.group.Group):
+            return H5PYGroupView(itm, self)
+        return self._fullnode().open(name)
+
+    def names(self):
+        """ read the child names in the native order
+
+        :returns: h5 object
+        :rtype: :obj:`list` <`str`>
+        """
+        return list(self._h5object.keys())
+
+    @property
+    def attributes(self):
+        """ return the attribute manager
+
+        :returns: attribute manager
+        :rtype: :class:`H5PYAttributeManager`
+        """
+        return H5PYAttributeManager(self._h5object.attrs, self)
+
+    @property
+    def is_valid(self):
+        """ check if group is valid
+
+        :returns: valid flag
+        :rtype: :obj:`bool`
+        """
+        return self._h5object.name is not None
+
+
+class H5PYFieldView(filewriter.FTFieldView):
+
+    """ lightweight read-only view of a field
+    """
+
+    __slots__ = ()
+
+    _nodeclass = H5PYField
+
+    def __init__(self, h5object, tparent=None, name=None):
+        """ constructor
+
+        :param h5object: h5 object
+        :type h5object: :obj:`any`
+        :param tparent: tree parent
+        :type tparent: :class:`filewriter.FTNodeView`
+        :param name: object name
+        :type name: :obj:`str`
+        """
+        if name is None:
+            name = h5object.name.split("/")[-1]
+        filewriter.FTFieldView.__init__(self, h5object, tparent, name)
+
+    @property
+    def attributes(self):
+        """ return the attribute manager
+
+        :returns: attribute manager
+        :rtype: :class:`H5PYAttributeManager`
+        """
+        return H5PYAttributeManager(self._h5object.attrs, self)
+
+    @property
+    def is_valid(self):
+        """ check if field is valid
+
+        :returns: valid flag
+        :rtype: :obj:`bool`
+        """
+        return self._h5object.name is not None
+
+    def read(self):
+        """ read the field value
+
+        :returns: python object
+        :rtype: :obj:`any`
+        """
+        return self[...]
+
+    def __getitem__(self, t):
+        """ get value
+
+        :param t: slice tuple
+        :type t: :obj:`tuple`
+        :returns: python object
+        :rtype: :obj:`any`
+        """
+        fl = self._h5object.__getitem__(t)
+        if hasattr(fl, "decode") and not isinstance(fl, unicode):
+            return fl.decode(encoding="utf-8")
+        return fl
+
+    @property
+    def dtype(self):
+        """ field data type
+
+        :returns: field data type
+        :rtype: :obj:`str`
+        """
+        if self._h5object.dtype.kind == 'O':
+            return "string"
+        return str(self._h5object.dtype)
+
+    @property
+    def shape(self):
+        """ field shape
+
+        :returns: field shape
+        :rtype: :obj:`list` < :obj:`int` >
+        """
+        return self._h5object.shape
+
+    @property
+    def size(self):
+        """ field size
+
+        :returns: field size
+        :rtype: :obj:`int`
+        """
+        return self._h5object.size
+
+    @property
+    def chunk(self):
+        """ field chunk shape
+
+        :returns: field chunk shape or None for contiguous fields
+        :rtype: :obj:`list` < :obj:`int` >
+        """
+        chunks = self._h5object.chunks
+        return list(chunks) if chunks else None
@@ -30,11 +30,27 @@ import signal
 import argparse
 import numpy
 import json
+import time
+import threading
+import collections
+import itertools
+import glob
+import multiprocessing
+from multiprocessing.pool import ThreadPool
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 
 from .filenamegenerator import FilenameGenerator
 from .nxsargparser import (Runner, NXSArgParser, ErrorException)
 from . import filewriter
 
+try:
+    from cStringIO import StringIO
+except ImportError:
+    from io import StringIO
 
 if sys.version_info > (3,):
     unicode = str
@@ -43,6 +59,22 @@ else:
     bytes = str
 
 
+def _tostr(text):
+    """ converts text  to str type
+
+    :param text: text
+    :type text: :obj:`bytes` or :obj:`unicode`
+    :returns: text in str type
+    :rtype: :obj:`str`
+    """
+    if isinstance(text, str):
+        return text
+    elif sys.version_info > (3,):
+        return str(text, "utf8")
+    else:
+        return str(text)
+
+
 WRITERS = {}
 try:
     from . import pniwriter
@@ -63,6 +95,18 @@ except Exception:
     pass
 
 
+#: (:obj:`dict` <:obj:`str`, :obj:`str`>) compression presets
+#:     of hdf5 filter plugins
+COMPRESSIONS = {
+    # bitshuffle with lz4
+    "bslz4": "32008:0,2",
+    # lz4 with the default block size
+    "lz4": "32004:0",
+    # blosc with lz4, level 5 and byte shuffle
+    "blosc": "32001:0,0,0,0,5,1,1",
+}
+
+
 def getcompression(compression):
     """ converts compression string to a deflate level parameter
         or list with [filterid, opt1, opt2, ...]
@@ -74,6 +118,8 @@ def getcompression(compression):
     :rtype: :obj:`int` or :obj:`list` < :obj:`int` > or `None`
 
     """
+    if isinstance(compression, (str, unicode)):
+        compression = COMPRESSIONS.get(compression, compression)
     if compression:
         if isinstance(compression, int) or ":" not in compression:
             level = None
@@ -98,6 +144,427 @@ def getcompression(compression):
         return
 
 
+def chunkshape(shape, itemsize, chunksize):
+    """ provides a chunk shape of a frame stack for the given chunk size,
+        i.e. frames of small images are merged and large images are tiled
+
+    :param shape: frame shape
+    :type shape: :obj:`list` <:obj:`int`>
+    :param itemsize: size of data items in bytes
+    :type itemsize: :obj:`int`
+    :param chunksize: target chunk size in bytes
+    :type chunksize: :obj:`int`
+    :returns: chunk shape with the frame dimension
+    :rtype: :obj:`list` <:obj:`int`>
+    """
+    tile = [max(int(dm), 1) for dm in shape]
+    framesize = int(numpy.prod(tile)) * itemsize
+    if framesize <= chunksize:
+        return [max(int(chunksize // max(framesize, 1)), 1)] + tile
+    while framesize > chunksize and max(tile) > 1:
+        # halve the largest dimension
+        dm = tile.index(max(tile))
+        tile[dm] = (tile[dm] + 1) // 2
+        framesize = int(numpy.prod(tile)) * itemsize
+    return [1] + tile
+
+
+def orderedmap(function, items, workers=1, window=None):
+    """ applies the function to items in a pool of worker threads
+    and yields the results in the order of items
+
+    :param function: function to call
+    :type function: :obj:`instancemethod` or :obj:`function`
+    :param items: input items
+    :type items: :obj:`iterable`
+    :param workers: number of worker threads
+    :type workers: :obj:`int`
+    :param window: maximal number of pending results, default: 2 * workers
+    :type window: :obj:`int`
+    :returns: results generator
+    :rtype: :obj:`generator`
+    """
+    if not workers or workers < 2:
+        for item in items:
+            yield function(item)
+        return
+    window = max(window or 2 * workers, 1)
+    pending = collections.deque()
+    pool = ThreadPool(workers)
+    try:
+        for item in items:
+            pending.append(pool.apply_async(function, (item,)))
+            while pending and (
+                    len(pending) >= window or pending[0].ready()):
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def prefetch(filename):
+    """ starts reading the file into the page cache, i.e.
+        advises the kernel to read it or reads it if posix_fadvise
+        is not available
+
+    :param filename: file name
+    :type filename: :obj:`str`
+    :returns: if the file could be prefetched
+    :rtype: :obj:`bool`
+    """
+    try:
+        fd = os.open(filename, os.O_RDONLY)
+    except OSError:
+        return False
+    try:
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        else:
+            while os.read(fd, 1 << 20):
+                pass
+    except OSError:
+        return False
+    finally:
+        os.close(fd)
+    return True
+
+
+def readahead(items, depth, function):
+    """ yields items and calls the function for the next items
+    in a background thread
+
+    :param items: input items
+    :type items: :obj:`iterable`
+    :param depth: number of items to call the function in advance
+    :type depth: :obj:`int`
+    :param function: function to call
+    :type function: :obj:`instancemethod` or :obj:`function`
+    :returns: items generator
+    :rtype: :obj:`generator`
+    """
+    if not depth or depth < 1:
+        for item in items:
+            yield item
+        return
+    pending = collections.deque()
+    pool = ThreadPool(1)
+    try:
+        for item in items:
+            pool.apply_async(function, (item,))
+            pending.append(item)
+            if len(pending) > depth:
+                yield pending.popleft()
+        while pending:
+            yield pending.popleft()
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+#: (:obj:`str`) name of the output field attribute with progress of collecting
+PROGRESS = "nxscollect_progress"
+
+#: (:obj:`str`) suffix of output fields with indices of missing frames
+MISSING = "_missing_frames"
+
+#: (:obj:`int`) ioctl request cloning files on copy-on-write filesystems
+FICLONE = 0x40049409
+
+
+def reflink(source, target):
+    """ creates a copy-on-write clone of the source file
+    if the filesystem supports it, e.g. btrfs or xfs
+
+    :param source: source file name
+    :type source: :obj:`str`
+    :param target: target file name
+    :type target: :obj:`str`
+    :returns: if the clone was created
+    :rtype: :obj:`bool`
+    """
+    if fcntl is None:
+        return False
+    try:
+        with open(source, "rb") as src:
+            with open(target, "wb") as tgt:
+                fcntl.ioctl(tgt.fileno(), FICLONE, src.fileno())
+    except (IOError, OSError):
+        if os.path.exists(target):
+            os.remove(target)
+        return False
+    shutil.copystat(source, target)
+    return True
+
+
+def masterfiles(names):
+    """ expands directories and glob patterns into master file names
+
+    :param names: master file names, directories or glob patterns
+    :type names: :obj:`list` <:obj:`str`>
+    :returns: master file names
+    :rtype: :obj:`list` <:obj:`str`>
+    """
+    files = []
+    for name in names:
+        if os.path.isdir(name):
+            files.extend(sorted(
+                os.path.join(name, fname) for fname in os.listdir(name)
+                if fname.endswith(".nxs")))
+        elif not os.path.exists(name) and glob.has_magic(name):
+            files.extend(sorted(glob.glob(name)) or [name])
+        else:
+            files.append(name)
+    return files
+
+
+def _collectfile(task):
+    """ collects images of one master file in a pool process
+
+    :param task: (master file name, collector parameters, nexus path,
+                  input files, data type, shape)
+    :type task: :obj:`tuple`
+    :returns: (master file name, status, printed output, statistics)
+    :rtype: (:obj:`str`, :obj:`bool`, :obj:`str`,
+             :obj:`dict` <:obj:`str`, `any`>)
+    """
+    nxsfile, pars, path, inputfiles, datatype, shape = task
+    old_stdout = sys.stdout
+    sys.stdout = mystdout = StringIO()
+    stats = None
+    try:
+        collector = Collector(nxsfile, **pars)
+        status = collector.collect(path, inputfiles, datatype, shape)
+        stats = collector.stats
+    except Exception as e:
+        print(str(e))
+        status = False
+    finally:
+        sys.stdout = old_stdout
+    return nxsfile, status, mystdout.getvalue(), stats
+
+
+class Journal(object):
+
+    """ Journal of changes of the master file modified in place
+    which are rolled back if collecting fails
+    """
+
+    def __init__(self, filename):
+        """ constructor
+
+        :param filename: journal file name
+        :type filename: :obj:`str`
+        """
+        #: (:obj:`str`) journal file name
+        self.filename = filename
+        #: (:obj:`list` <:obj:`str`>) paths of created nodes
+        self.created = []
+        #: (:obj:`dict` <:obj:`str`, :obj:`int`>) initial extents
+        #:    of appended fields
+        self.extents = {}
+        #: (:obj:`dict` <:obj:`str`, :obj:`dict`>) initial data types,
+        #:    shapes and values of overwritten attributes,
+        #:    i.e. <path>@<name>, None if they did not exist
+        self.attributes = {}
+        #: (:obj:`dict` <:obj:`str`, :obj:`dict`>) initial data type
+        #:    and values of replaced 1D fields, None if they did not exist
+        self.replaced = {}
+        if os.path.exists(filename):
+            with open(filename) as fl:
+                journal = json.load(fl)
+            self.created = journal.get("created", [])
+            self.extents = journal.get("extents", {})
+            self.attributes = journal.get("attributes", {})
+            self.replaced = journal.get("replaced", {})
+
+    @property
+    def changed(self):
+        """ if the journal records any changes
+
+        :returns: if changes are recorded
+        :rtype: :obj:`bool`
+        """
+        return bool(self.created or self.extents or self.attributes
+                    or self.replaced)
+
+    @classmethod
+    def _path(cls, path):
+        """ provides hdf5 path from nexus path
+
+        :param path: nexus path with optional NX classes
+        :type path: :obj:`str`
+        :returns: hdf5 path
+        :rtype: :obj:`str`
+        """
+        return "/".join(nd.split(":")[0] for nd in path.split("/"))
+
+    @classmethod
+    def _open(cls, root, path):
+        """ opens a node of the given path
+
+        :param root: root group
+        :type root: :class:`filewriter.FTGroup`
+        :param path: hdf5 path
+        :type path: :obj:`str`
+        :returns: hdf5 node or None if it does not exist
+        :rtype: :class:`filewriter.FTGroup` or :class:`filewriter.FTField`
+        """
+        node = root
+        for name in path.split("/"):
+            if name:
+                if name not in node.names():
+                    return None
+                node = node.open(name)
+        return node
+
+    def create(self, parent, name):
+        """ records a node to be created
+
+        :param parent: parent group
+        :type parent: :class:`filewriter.FTGroup`
+        :param name: node name
+        :type name: :obj:`str`
+        """
+        path = self._path(parent.path).rstrip("/") + "/" + name
+        if path not in self.created and path not in self.replaced:
+            self.created.append(path)
+            self.save()
+
+    def extend(self, field):
+        """ records an initial extent of a field to be appended
+
+        :param field: field to append frames to
+        :type field: :class:`filewriter.FTField`
+        """
+        path = self._path(field.path)
+        if path not in self.created and path not in self.extents:
+            self.extents[path] = field.shape[0]
+            self.save()
+
+    def setattribute(self, node, name):
+        """ records an initial data type, shape and value of an attribute
+        to be overwritten
+
+        :param node: node of the attribute
+        :type node: :class:`filewriter.FTField` or \
+                    :class:`filewriter.FTGroup`
+        :param name: attribute name
+        :type name: :obj:`str`
+        """
+        path = self._path(node.path)
+        key = path + "@" + name
+        if path not in self.created and key not in self.attributes:
+            if name in node.attributes.names():
+                at = node.attributes[name]
+                value = at[...]
+                if hasattr(value, "tolist"):
+                    value = value.tolist()
+                if isinstance(value, list):
+                    value = [_tostr(vl) if isinstance(vl, bytes) else vl
+                             for vl in numpy.ravel(value).tolist()]
+                elif isinstance(value, bytes):
+                    value = _tostr(value)
+                self.attributes[key] = {
+                    "dtype": at.dtype, "shape": list(at.shape or []),
+                    "value": value}
+            else:
+                self.attributes[key] = None
+            self.save()
+
+    def replace(self, parent, name):
+        """ records initial values of a 1D field to be replaced
+
+        :param parent: parent group
+        :type parent: :class:`filewriter.FTGroup`
+        :param name: field name
+        :type name: :obj:`str`
+        """
+        path = self._path(parent.path).rstrip("/") + "/" + name
+        if path not in self.created and path not in self.replaced:
+            if name in parent.names():
+                field = parent.open(name)
+                self.replaced[path] = {
+                    "dtype": field.dtype,
+                    "values": numpy.ravel(field.read()).tolist()}
+            else:
+                self.replaced[path] = None
+            self.save()
+
+    def save(self):
+        """ writes the journal file
+        """
+        with open(self.filename, "w") as fl:
+            json.dump({"created": self.created, "extents": self.extents,
+                       "attributes": self.attributes,
+                       "replaced": self.replaced}, fl)
+            fl.flush()
+            os.fsync(fl.fileno())
+
+    def rollback(self, root):
+        """ truncates appended fields, restores overwritten attributes
+        and replaced fields and removes created nodes
+
+        Attributes which did not exist are removed.
+
+        :param root: root group
+        :type root: :class:`filewriter.FTGroup`
+        """
+        for path, extent in self.extents.items():
+            field = self._open(root, path)
+            if field is not None and field.shape[0] > extent:
+                field.grow(0, extent - field.shape[0])
+        for key, attr in self.attributes.items():
+            path, name = key.rsplit("@", 1)
+            node = self._open(root, path)
+            if node is None:
+                continue
+            if attr is None:
+                if name in node.attributes.names():
+                    node.attributes.remove(name)
+                continue
+            shape = None
+            value = attr["value"]
+            if isinstance(value, list):
+                # scalar values were not stored as lists
+                shape = attr["shape"]
+                value = numpy.array(
+                    value,
+                    dtype=(attr["dtype"] if attr["dtype"] != "string"
+                           else None)).reshape(shape)
+            node.attributes.create(
+                name, attr["dtype"], shape=shape, overwrite=True)[
+                    ...] = value
+        for path, field in self.replaced.items():
+            ppath, name = path.rsplit("/", 1)
+            parent = self._open(root, ppath)
+            if parent is None:
+                continue
+            if name in parent.names():
+                parent.remove(name)
+            if field is not None:
+                values = numpy.array(field["values"], dtype=field["dtype"])
+                parent.create_field(
+                    name, field["dtype"], shape=[len(values)],
+                    chunk=[max(len(values), 1)]).write(values)
+        for path in reversed(self.created):
+            ppath, name = path.rsplit("/", 1)
+            parent = self._open(root, ppath)
+            if parent is not None and name in parent.names():
+                parent.remove(name)
+        self.created = []
+        self.extents = {}
+        self.attributes = {}
+        self.replaced = {}
+
+    def remove(self):
+        """ removes the journal file
+        """
+        if os.path.exists(self.filename):
+            os.remove(self.filename)
+
+
 class Linker(object):
 
     """ Create external and internal links of NeXus files
@@ -154,7 +621,8 @@ class Linker(object):
         self.__tempfilename = self.__nexusfilename + ".__nxscollect_temp__"
         while os.path.exists(self.__tempfilename):
             self.__tempfilename += "_"
-        shutil.copy2(self.__nexusfilename, self.__tempfilename)
+        if not reflink(self.__nexusfilename, self.__tempfilename):
+            shutil.copy2(self.__nexusfilename, self.__tempfilename)
 
     def _storeoldfile(self):
         """ makes back up of the input file
@@ -209,6 +677,536 @@ class Linker(object):
             os.remove(self.__tempfilename)
 
 
+class Stats(object):
+
+    """ Timings and data sizes of collecting stages
+    """
+
+    #: (:obj:`list` <:obj:`str`>) collecting stages
+    stages = ["find", "wait", "decode", "write", "grow", "flush"]
+
+    def __init__(self, filename, writer=None):
+        """ constructor
+
+        :param filename: master file name
+        :type filename: :obj:`str`
+        :param writer: writer module name
+        :type writer: :obj:`str`
+        """
+        #: (:obj:`str`) master file name
+        self.filename = filename
+        #: (:obj:`str`) writer module name
+        self.writer = writer
+        #: (:obj:`dict` <:obj:`str`, :obj:`int`>) numbers of stage calls
+        self.calls = dict((stage, 0) for stage in self.stages)
+        #: (:obj:`dict` <:obj:`str`, :obj:`float`>) stage times in seconds
+        self.times = dict((stage, 0.) for stage in self.stages)
+        #: (:obj:`collections.OrderedDict` <:obj:`str`, :obj:`dict`>)
+        #:     stage times and sizes of image files
+        self.images = collections.OrderedDict()
+        #: (:obj:`int`) number of appended frames
+        self.frames = 0
+        #: (:obj:`int`) size of decoded or copied image data in bytes
+        self.bytesin = 0
+        #: (:obj:`int`) growth of the master file in bytes
+        self.bytesout = 0
+        #: (:obj:`float`) collecting time in seconds
+        self.duration = 0.
+        #: (:class:`threading.Lock`) lock for stages of worker threads
+        self.__lock = threading.Lock()
+
+    def add(self, stage, start, image=None, nbytes=0):
+        """ records a stage which started at the given time
+
+        :param stage: stage name
+        :type stage: :obj:`str`
+        :param start: start time of the stage
+        :type start: :obj:`float`
+        :param image: image file name or a list of image file names
+                      which share the stage time, e.g. a written batch
+        :type image: :obj:`str` or :obj:`list` <:obj:`str`>
+        :param nbytes: size of image data in bytes
+        :type nbytes: :obj:`int`
+        :returns: end time of the stage
+        :rtype: :obj:`float`
+        """
+        end = time.time()
+        with self.__lock:
+            self.calls[stage] += 1
+            self.times[stage] += end - start
+            self.bytesin += nbytes
+            if image is not None:
+                names = image if isinstance(image, list) else [image]
+                for name in names:
+                    record = self.images.setdefault(name, {"file": name})
+                    record[stage] = record.get(stage, 0.) + \
+                        (end - start) / len(names)
+                if nbytes and len(names) == 1:
+                    record["bytes"] = record.get("bytes", 0) + nbytes
+        return end
+
+    def todict(self):
+        """ provides the statistics as a JSON serializable dictionary
+
+        :returns: statistics
+        :rtype: :obj:`dict` <:obj:`str`, `any`>
+        """
+        return {
+            "file": self.filename,
+            "writer": self.writer,
+            "time": self.duration,
+            "frames": self.frames,
+            "frames_per_second": (
+                self.frames / self.duration if self.duration else None),
+            "bytes_in": self.bytesin,
+            "bytes_out": self.bytesout,
+            "compression_ratio": (
+                float(self.bytesin) / self.bytesout
+                if self.bytesout else None),
+            "stages": dict(
+                (stage, {"calls": self.calls[stage],
+                         "time": self.times[stage]})
+                for stage in self.stages),
+            "images": list(self.images.values()),
+        }
+
+    @classmethod
+    def report(cls, stats):
+        """ provides a text report of the statistics
+
+        :param stats: statistics dictionary
+        :type stats: :obj:`dict` <:obj:`str`, `any`>
+        :returns: text report
+        :rtype: :obj:`str`
+        """
+        lines = ["stats: %s (%s)" % (stats["file"], stats["writer"])]
+        for stage in cls.stages:
+            lines.append("  %-8s %8s calls %10.3f s" % (
+                stage, stats["stages"][stage]["calls"],
+                stats["stages"][stage]["time"]))
+        lines.append("  frames: %s in %.3f s, %s frames/s" % (
+            stats["frames"], stats["time"],
+            "%.1f" % stats["frames_per_second"]
+            if stats["frames_per_second"] is not None else "-"))
+        lines.append("  bytes in: %s, bytes out: %s,"
+                     " compression ratio: %s" % (
+                         stats["bytes_in"], stats["bytes_out"],
+                         "%.2f" % stats["compression_ratio"]
+                         if stats["compression_ratio"] is not None
+                         else "-"))
+        return "\n".join(lines)
+
+
+class MissingFile(str):
+
+    """ Name of an image file which has not been found
+    """
+
+
+class FrameBuffer(object):
+
+    """ Buffer which stacks decoded frames and writes them
+    to the field in batches
+    """
+
+    def __init__(self, field, size=1, length=None, directchunk=False,
+                 filtermask=0, stats=None):
+        """ constructor
+
+        :param field: field to append frames to
+        :type field: :class:`filewriter.FTField`
+        :param size: number of frames appended at once
+        :type size: :obj:`int`
+        :param length: number of valid frames in a preallocated field
+        :type length: :obj:`int`
+        :param directchunk: if write single frames as raw chunks
+        :type directchunk: :obj:`bool`
+        :param filtermask: mask of filters not applied to raw chunks
+        :type filtermask: :obj:`int`
+        :param stats: collecting statistics
+        :type stats: :class:`Stats`
+        """
+        #: (:class:`filewriter.FTField`) field to append frames to
+        self.field = field
+        #: (:obj:`int`) number of frames appended at once
+        self.size = max(int(size or 1), 1)
+        #: (:obj:`int`) current field extent
+        self.__extent = field.shape[0]
+        #: (:obj:`int`) number of written and buffered frames
+        self.length = self.__extent if length is None else length
+        #: (:obj:`int`) number of written frames
+        self.__written = self.length
+        #: (:obj:`bool`) if write single frames as raw chunks
+        self.directchunk = directchunk
+        #: (:obj:`int`) mask of filters not applied to raw chunks
+        self.filtermask = filtermask
+        #: (:obj:`tuple` <:obj:`int`>) frame shape
+        self.__frameshape = tuple(field.shape[1:])
+        #: (:class:`Stats`) collecting statistics
+        self.stats = stats
+        self.__buffer = None
+        self.__names = []
+
+    def append(self, name, data, nrim=1):
+        """ appends frames to the buffer and writes the buffer
+        into the field if it is full
+
+        :param name: frame source name
+        :type name: :obj:`str`
+        :param data: frame data
+        :type data: :class:`numpy.ndarray`
+        :param nrim: number of frames in data
+        :type nrim: :obj:`int`
+        :returns: names of frame sources written into the field
+        :rtype: :obj:`list` <:obj:`str`>
+        """
+        written = []
+        if nrim != 1 or self.size == 1 or self.directchunk:
+            written.extend(self.write())
+            self._store(data, nrim, [name])
+            written.append(name)
+        else:
+            if self.__buffer is None:
+                data = numpy.asarray(data)
+                self.__buffer = numpy.empty(
+                    (self.size,) + data.shape, dtype=data.dtype)
+            self.__buffer[len(self.__names), ...] = data
+            self.__names.append(name)
+            if len(self.__names) == self.size:
+                written.extend(self.write())
+        self.length += nrim
+        return written
+
+    def append_chunks(self, name, chunks):
+        """ writes encoded frames into the field as raw chunks
+
+        :param name: frame source name
+        :type name: :obj:`str`
+        :param chunks: a list of (filter mask, raw chunk data) of frames
+        :type chunks: :obj:`list` < (:obj:`int`, :obj:`bytes`) >
+        :returns: names of frame sources written into the field
+        :rtype: :obj:`list` <:obj:`str`>
+        """
+        written = []
+        written.extend(self.write())
+        start = self.__written
+        self._extend(start + len(chunks), [name])
+        tstart = time.time()
+        for i, (filtermask, data) in enumerate(chunks):
+            self.field.write_direct_chunk(
+                data, [start + i] + [0] * len(self.__frameshape),
+                filtermask)
+        if self.stats is not None:
+            self.stats.add("write", tstart, [name])
+        self.__written = start + len(chunks)
+        self.length += len(chunks)
+        written.append(name)
+        return written
+
+    def fill(self, value):
+        """ writes a frame filled with the given value into the field
+
+        :param value: fill value
+        :type value: :obj:`float`
+        :returns: names of frame sources written into the field
+        :rtype: :obj:`list` <:obj:`str`>
+        """
+        written = []
+        written.extend(self.write())
+        self._store(
+            numpy.full(self.__frameshape, value,
+                       dtype=numpy.dtype(self.field.dtype)), 1)
+        self.length += 1
+        return written
+
+    @property
+    def written(self):
+        """ number of frames written into the field
+
+        :returns: number of written frames
+        :rtype: :obj:`int`
+        """
+        return self.__written
+
+    def write(self):
+        """ writes buffered frames into the field
+
+        :returns: names of frame sources written into the field
+        :rtype: :obj:`list` <:obj:`str`>
+        """
+        written = self.__names
+        count = len(written)
+        if count:
+            self._store(self.__buffer[:count, ...], count, written)
+            self.__names = []
+        return written
+
+    def trim(self):
+        """ shrinks the preallocated field to the number of written frames
+        """
+        if self.__extent > self.__written:
+            self.field.grow(0, self.__written - self.__extent)
+            self.__extent = self.__written
+
+    def _store(self, data, count, names=None):
+        """ writes frames into the field and grows it if needed
+
+        :param data: frame data
+        :type data: :class:`numpy.ndarray`
+        :param count: number of frames in data
+        :type count: :obj:`int`
+        :param names: frame source names of the data
+        :type names: :obj:`list` <:obj:`str`>
+        """
+        start = self.__written
+        stop = start + count
+        self._extend(stop, names)
+        tstart = time.time()
+        if count == 1 and self.directchunk and \
+           isinstance(data, numpy.ndarray) and \
+           data.shape == self.__frameshape and data.flags.c_contiguous:
+            self.field.write_direct_chunk(
+                data, [start] + [0] * len(self.__frameshape),
+                self.filtermask)
+        elif count == 1:
+            self.field[start, ...] = data
+        else:
+            self.field[start:stop, ...] = data
+        if self.stats is not None:
+            self.stats.add("write", tstart, names)
+        self.__written = stop
+
+    def _extend(self, stop, names=None):
+        """ grows the field if it is shorter than the given number of frames
+
+        :param stop: required number of frames
+        :type stop: :obj:`int`
+        :param names: frame source names which require growing
+        :type names: :obj:`list` <:obj:`str`>
+        """
+        if stop > self.__extent:
+            tstart = time.time()
+            self.field.grow(0, stop - self.__extent)
+            if self.stats is not None:
+                self.stats.add("grow", tstart, names)
+            self.__extent = stop
+
+
+class FieldState(object):
+
+    """ State of an output field collected from image files
+    """
+
+    def __init__(self, node, fieldname, fieldattrs=None,
+                 fieldcompression=None, datatype=None, shape=None):
+        """ constructor
+
+        :param node: hdf5 parent node
+        :type node: :class:`filewriter.FTGroup` or \
+                    :class:`filewriter.FTLink`
+        :param fieldname: field name
+        :type fieldname: :obj:`str`
+        :param fieldattrs: dictionary with field attributes
+        :type fieldattrs: :obj:`dict` <:obj:`str`, :obj:`str`>
+        :param fieldcompression: field compression rate
+        :type fieldcompression: :obj:`int`
+        :param datatype: field data type
+        :type datatype: :obj:`str`
+        :param shape: field shape
+        :type shape: :obj:`list` <:obj:`int` >
+        """
+        #: (:class:`filewriter.FTGroup`) hdf5 parent node
+        self.node = node
+        #: (:obj:`str`) field name
+        self.fieldname = fieldname
+        #: (:obj:`dict` <:obj:`str`, :obj:`str`>) field attributes
+        self.fieldattrs = fieldattrs
+        #: (:obj:`int`) field compression rate
+        self.fieldcompression = fieldcompression
+        #: (:obj:`str`) field data type
+        self.datatype = datatype
+        #: (:obj:`list` <:obj:`int` >) field shape
+        self.shape = shape
+        #: (:obj:`bool`) if the field is created by this run
+        self.newfield = False
+        #: (:class:`filewriter.FTField`) output field
+        self.field = None
+        #: (:class:`FrameBuffer`) frame buffer of the output field
+        self.buffer = None
+        #: (:obj:`int`) number of preallocated frames
+        self.nframes = None
+        #: (:obj:`int`) deflate level of the field filters
+        self.opts = None
+        #: (:obj:`bool`) if single frames can be written as raw chunks
+        self.directchunk = False
+        #: chunk layout of hdf5 images copied as encoded chunks
+        self.layout = None
+        #: (:obj:`int`) index of the next frame in the output field
+        self.ind = 0
+        #: (:obj:`int`) number of consumed image files
+        self.nitems = 0
+        #: (:obj:`collections.deque` <(:obj:`int`, (:obj:`str`, :obj:`str`))>)
+        #:    (number of consumed image files, (image file, hdf5 path))
+        #:    of images appended to the buffer
+        self.pending = collections.deque()
+        #: ((:obj:`int`, (:obj:`str`, :obj:`str`))) progress of the last
+        #:    written image
+        self.progress = None
+        #: (:obj:`list` <:obj:`str`>) image files written since
+        #:    the last flush
+        self.unflushed = []
+        #: (:obj:`int`) number of image files written since the last flush
+        self.nflush = 0
+        #: (:obj:`float`) time of the last flush
+        self.tflush = time.time()
+        #: (:obj:`list` <:obj:`int`>) indices of missing frames
+        #:    in the output field
+        self.missing = []
+        #: (:obj:`list` <:obj:`str`>) names of missing image files
+        #:    found by this run
+        self.missingfiles = []
+        #: (:obj:`int`) missing frames to fill before the output field
+        #:    is created
+        self.leading = 0
+
+
+class ReadOptions(object):
+
+    """ Options of reading input images
+    """
+
+    def __init__(self, workers=1, mmap=False, chunkcopy=True,
+                 filecache=16, maxmemory=None, prefetch=0):
+        """ constructor
+
+        :param workers: number of threads decoding images
+        :type workers: :obj:`int`
+        :param mmap: if map raw image files into memory
+        :type mmap: :obj:`bool`
+        :param chunkcopy: if copy encoded chunks of hdf5 images
+                          with the same filters as the output field
+        :type chunkcopy: :obj:`bool`
+        :param filecache: number of hdf5 image files kept open
+        :type filecache: :obj:`int`
+        :param maxmemory: memory budget for loaded image data in bytes
+        :type maxmemory: :obj:`int`
+        :param prefetch: number of next image files read in advance
+        :type prefetch: :obj:`int`
+        """
+        #: (:obj:`int`) number of threads decoding images
+        self.workers = workers
+        #: (:obj:`bool`) if map raw image files into memory
+        self.mmap = mmap
+        #: (:obj:`bool`) if copy encoded chunks of hdf5 images
+        self.chunkcopy = chunkcopy
+        #: (:obj:`int`) number of hdf5 image files kept open
+        self.filecache = filecache
+        #: (:obj:`int`) memory budget for loaded image data in bytes
+        self.maxmemory = maxmemory
+        #: (:obj:`int`) number of next image files read in advance
+        self.prefetch = prefetch
+
+
+class WriteOptions(object):
+
+    """ Options of writing output fields
+    """
+
+    def __init__(self, batchsize=1, flushframes=1, flushtime=None,
+                 presize=False, directchunk=False, virtual=False,
+                 chunksize=None, concurrentfields=1):
+        """ constructor
+
+        :param batchsize: number of frames appended at once
+        :type batchsize: :obj:`int`
+        :param flushframes: number of frames between file flushes
+        :type flushframes: :obj:`int`
+        :param flushtime: time in seconds between file flushes
+        :type flushtime: :obj:`float`
+        :param presize: if preallocate fields for known file ranges
+        :type presize: :obj:`bool`
+        :param directchunk: if write raw images as uncompressed chunks
+        :type directchunk: :obj:`bool`
+        :param virtual: if create virtual fields mapping hdf5 images
+        :type virtual: :obj:`bool`
+        :param chunksize: target chunk size of output fields in bytes
+        :type chunksize: :obj:`int`
+        :param concurrentfields: number of output fields collected
+                                 concurrently
+        :type concurrentfields: :obj:`int`
+        """
+        #: (:obj:`int`) number of frames appended at once
+        self.batchsize = batchsize
+        #: (:obj:`int`) number of frames between file flushes
+        self.flushframes = flushframes
+        #: (:obj:`float`) time in seconds between file flushes
+        self.flushtime = flushtime
+        #: (:obj:`bool`) if preallocate fields for known file ranges
+        self.presize = presize
+        #: (:obj:`bool`) if write raw images as uncompressed chunks
+        self.directchunk = directchunk
+        #: (:obj:`bool`) if create virtual fields mapping hdf5 images
+        self.virtual = virtual
+        #: (:obj:`int`) target chunk size of output fields in bytes
+        self.chunksize = chunksize
+        #: (:obj:`int`) number of output fields collected concurrently
+        self.concurrentfields = concurrentfields
+
+
+class FollowOptions(object):
+
+    """ Options of waiting for input files written during collecting
+    """
+
+    def __init__(self, follow=False, timeout=60., pollinterval=1.):
+        """ constructor
+
+        :param follow: if wait for input files which do not exist yet
+        :type follow: :obj:`bool`
+        :param timeout: time in seconds to wait for a next input file
+        :type timeout: :obj:`float`
+        :param pollinterval: time in seconds between checks of input files
+        :type pollinterval: :obj:`float`
+        """
+        #: (:obj:`bool`) if wait for input files which do not exist yet
+        self.follow = follow
+        #: (:obj:`float`) time in seconds to wait for a next input file
+        self.timeout = timeout
+        #: (:obj:`float`) time in seconds between checks of input files
+        self.pollinterval = pollinterval
+
+
+class RecoveryOptions(object):
+
+    """ Options of resuming interrupted runs and of missing images
+    """
+
+    def __init__(self, inplace=False, resume=False, missingframes=False,
+                 fillvalue=None):
+        """ constructor
+
+        :param inplace: if modify the master file in place with a journal
+                        when it cannot be cloned
+        :type inplace: :obj:`bool`
+        :param resume: if record progress in output fields and skip
+                       input files collected by previous runs
+        :type resume: :obj:`bool`
+        :param missingframes: if skip missing images and store
+                              their indices
+        :type missingframes: :obj:`bool`
+        :param fillvalue: value of frames stored in place of missing images
+        :type fillvalue: :obj:`float`
+        """
+        #: (:obj:`bool`) if modify the master file in place with a journal
+        self.inplace = inplace
+        #: (:obj:`bool`) if skip input files collected by previous runs
+        self.resume = resume
+        #: (:obj:`bool`) if skip missing images and store their indices
+        self.missingframes = missingframes
+        #: (:obj:`float`) value of frames stored in place of missing images
+        self.fillvalue = fillvalue
+
+
 class Collector(object):
 
     """ Collector merge images of external file-formats
@@ -217,7 +1215,9 @@ class Collector(object):
 
     def __init__(self, nexusfilename, compression=2,
                  skipmissing=False, storeold=False, testmode=False,
-                 writer=None):
+                 writer=None, stats=False, readoptions=None,
+                 writeoptions=None, followoptions=None,
+                 recoveryoptions=None):
         """ The constructor creates the collector object
 
         :param nexusfilename: the nexus file name
@@ -232,18 +1232,90 @@ class Collector(object):
         :type testmode: :obj:`bool`
         :param writer: the writer module
         :type writer: :obj:`str`
+        :param stats: if record timings and data sizes of collecting stages
+        :type stats: :obj:`bool`
+        :param readoptions: options of reading input images
+        :type readoptions: :class:`ReadOptions`
+        :param writeoptions: options of writing output fields
+        :type writeoptions: :class:`WriteOptions`
+        :param followoptions: options of waiting for input files
+        :type followoptions: :class:`FollowOptions`
+        :param recoveryoptions: options of resuming and of missing images
+        :type recoveryoptions: :class:`RecoveryOptions`
         """
+        rdopts = readoptions or ReadOptions()
+        wropts = writeoptions or WriteOptions()
+        flopts = followoptions or FollowOptions()
+        rcopts = recoveryoptions or RecoveryOptions()
+        follow = flopts.follow
         self.__nexusfilename = nexusfilename
         self.__compression = compression
         self.__skipmissing = skipmissing
         self.__testmode = testmode
         self.__storeold = storeold
         self.__tempfilename = None
-        self.__filepattern = re.compile(".+:\\d+:\\d+")
+        self.__filepattern = re.compile(".+:\\d+:\\d+$")
+        #: (:class:`re.Pattern`) frame selection at the end of hdf5 path,
+        #:     e.g. entry/data/data[100:2000:2]
+        self.__selectionpattern = re.compile(
+            "^(.*)\\[\\s*(-?\\d*)\\s*(?::\\s*(-?\\d*)\\s*)?"
+            "(?::\\s*(\\d*)\\s*)?\\]$")
         self.__nxsfile = None
         self.__break = False
         self.__fullfilename = None
         self.__wrmodule = None
+        self.__workers = max(int(rdopts.workers or 1), 1)
+        self.__batchsize = max(int(wropts.batchsize or 1), 1)
+        self.__flushframes = wropts.flushframes
+        self.__flushtime = wropts.flushtime
+        self.__presize = wropts.presize
+        self.__mmap = rdopts.mmap or wropts.directchunk
+        self.__directchunk = wropts.directchunk
+        self.__chunkcopy = rdopts.chunkcopy
+        self.__virtual = wropts.virtual
+        self.__inplace = rcopts.inplace
+        #: (:obj:`bool`) the follow mode appends input files
+        #:    of grown postrun ranges as in the resume mode
+        self.__resume = rcopts.resume or follow
+        self.__follow = follow
+        self.__timeout = flopts.timeout
+        self.__pollinterval = flopts.pollinterval
+        self.__chunksize = wropts.chunksize
+        self.__withstats = stats
+        self.__maxmemory = rdopts.maxmemory
+        #: (:obj:`float`) value of frames stored in place of missing images
+        self.__fillvalue = rcopts.fillvalue
+        #: (:obj:`bool`) if skip missing images and store their indices
+        self.__missingframes = rcopts.missingframes or \
+            rcopts.fillvalue is not None
+        #: (:obj:`int`) number of output fields collected concurrently
+        self.__concurrentfields = max(int(wropts.concurrentfields or 1), 1)
+        #: (:obj:`int`) number of next image files read in advance,
+        #:    files in the follow mode are read when they appear
+        self.__prefetch = 0 if follow else max(int(rdopts.prefetch or 0), 0)
+        #: (:obj:`int`) number of hdf5 image files kept open,
+        #:    files growing in the follow mode are opened for each frame
+        self.__filecache = 0 if follow else \
+            max(int(rdopts.filecache or 0), 0)
+        #: (:obj:`collections.OrderedDict` <:obj:`str`,
+        #:    (:class:`filewriter.FTFile`,
+        #:     :obj:`dict` <:obj:`str`, :class:`filewriter.FTField`>)>)
+        #:    open hdf5 image files with their image fields
+        self.__h5files = collections.OrderedDict()
+        #: (:class:`Stats`) collecting statistics
+        self.__stats = None
+        #: (:obj:`dict` <(:obj:`str`, :obj:`str`), :obj:`int`>)
+        #:    indices of candidate locations which resolved file sequences
+        self.__rules = {}
+        #: (:obj:`dict` <:obj:`str`, :obj:`set` <:obj:`str`>)
+        #:    cached directory listings
+        self.__dirlists = {}
+        #: (:obj:`set` <:obj:`str`>) directories listed in the current batch
+        self.__relisted = set()
+        #: (:class:`Journal`) journal of in place changes
+        self.__journal = None
+        #: (:class:`threading.RLock`) lock for calls of the hdf5 library
+        self.__h5lock = threading.RLock()
         if writer and writer.lower() in WRITERS.keys():
             self.__wrmodule = WRITERS[writer.lower()]
         self.__siginfo = dict(
@@ -264,13 +1336,68 @@ class Collector(object):
             print("terminated by %s" % self.__siginfo[sig])
 
     def _createtmpfile(self):
-        """ creates temporary file
+        """ creates temporary file, i.e. a copy-on-write clone if the
+        filesystem supports it, otherwise a copy or nothing in the in place
+        mode without a backup file
         """
         self.__tempfilename = self.__nexusfilename + ".__nxscollect_temp__"
         while os.path.exists(self.__tempfilename):
             self.__tempfilename += "_"
+        if reflink(self.__nexusfilename, self.__tempfilename):
+            return
+        if self.__inplace and not self.__storeold and not self.__testmode:
+            self.__tempfilename = None
+            return
         shutil.copy2(self.__nexusfilename, self.__tempfilename)
 
+    def _masterstate(self):
+        """ provides the state of the master file to detect its changes
+
+        :returns: (size, modification time, inode) or None
+        :rtype: (:obj:`int`, :obj:`float`, :obj:`int`)
+        """
+        try:
+            stat = os.stat(self.__nexusfilename)
+        except OSError:
+            return None
+        return (stat.st_size, getattr(stat, "st_mtime_ns", stat.st_mtime),
+                stat.st_ino)
+
+    def _waitformaster(self, state):
+        """ waits until the master file of a running scan is modified
+        and then not modified for the poll interval, i.e. its postrun
+        ranges can be read again
+
+        :param state: state of the collected master file
+        :type state: (:obj:`int`, :obj:`float`, :obj:`int`)
+        :returns: if the master file has been modified
+                  within the follow mode timeout
+        :rtype: :obj:`bool`
+        """
+        start = time.time()
+        last = state
+        while not self.__break:
+            time.sleep(self.__pollinterval)
+            current = self._masterstate()
+            if current != last:
+                last, start = current, time.time()
+            elif current != state:
+                return True
+            elif time.time() - start > self.__timeout:
+                return False
+        return False
+
+    def _journalcreate(self, parent, name):
+        """ records a node to be created in the in place mode
+
+        :param parent: parent group
+        :type parent: :class:`filewriter.FTGroup`
+        :param name: node name
+        :type name: :obj:`str`
+        """
+        if self.__journal is not None:
+            self.__journal.create(parent, name)
+
     def _storeoldfile(self):
         """ makes back up of the input file
         """
@@ -322,45 +1449,145 @@ class Collector(object):
         :returns: absolute image file name
         :rtype: :obj:`str`
         """
-        filelist = []
+        fname, filelist = self._locatefile(filename, nname)
+        if fname is not None:
+            return fname
+        if not self.__skipmissing:
+            raise Exception(
+                "Cannot open any of %s files" % sorted(set(filelist)))
+        else:
+            print("Cannot open any of %s files" % sorted(set(filelist)))
+        return None
 
+    def _waitforfile(self, filename, nname=None):
+        """ waits until the image file exists and is not modified
+        any more, i.e. its size does not change between two checks
+        or it has not been modified for the poll interval
+
+        :param filename: image file name
+        :type: filename: :obj:`str`
+        :param nname: hdf5 node name
+        :typ nname: :obj:`str`
+        :returns: absolute image file name or None after timeout
+        :rtype: :obj:`str`
+        """
+        start = time.time()
+        size = None
+        while not self.__break:
+            fname, _ = self._locatefile(filename, nname)
+            if fname is not None:
+                try:
+                    stat = os.stat(fname)
+                except OSError:
+                    stat = None
+                if stat is not None and (
+                        stat.st_size == size or
+                        time.time() - stat.st_mtime >= self.__pollinterval):
+                    return fname
+                size = stat.st_size if stat is not None else None
+            elif time.time() - start > self.__timeout:
+                return None
+            time.sleep(self.__pollinterval)
+        return None
+
+    def _candidates(self, filename, nname=None):
+        """ provides possible locations of the image file in the search order
+
+        :param filename: image file name
+        :type: filename: :obj:`str`
+        :param nname: hdf5 node name
+        :typ nname: :obj:`str`
+        :returns: generator of absolute image file names
+        :rtype: :obj:`generator`
+        """
         if nname is not None:
-            tmpfname = '%s/%s/%s' % (
+            yield '%s/%s/%s' % (
                 os.path.splitext(self.__nexusfilename)[0],
                 nname,
                 filename.split("/")[-1])
-            if os.path.exists(tmpfname):
-                return tmpfname
-            else:
-                filelist.append(tmpfname)
-            tmpfname = '%s/%s/%s' % (
+            yield '%s/%s/%s' % (
                 os.path.splitext(self.__fullfilename)[0],
                 nname,
                 filename.split("/")[-1])
-            if os.path.exists(tmpfname):
-                return tmpfname
+        yield self._absolutefilename(filename, self.__nexusfilename)
+        yield self._absolutefilename(filename, self.__fullfilename)
+        yield filename
+
+    def _listdir(self, dirname):
+        """ lists and caches names of directory entries
+
+        :param dirname: directory name
+        :type dirname: :obj:`str`
+        :returns: entry names
+        :rtype: :obj:`set` <:obj:`str`>
+        """
+        try:
+            if hasattr(os, "scandir"):
+                names = set(entry.name for entry in os.scandir(dirname))
             else:
-                filelist.append(tmpfname)
-        tmpfname = self._absolutefilename(filename, self.__nexusfilename)
-        if os.path.exists(tmpfname):
-            return tmpfname
-        else:
-            filelist.append(tmpfname)
-        tmpfname = self._absolutefilename(filename, self.__fullfilename)
-        if os.path.exists(tmpfname):
-            return tmpfname
-        else:
+                names = set(os.listdir(dirname))
+        except OSError:
+            names = set()
+        self.__dirlists[dirname] = names
+        self.__relisted.add(dirname)
+        return names
+
+    def _listed(self, filename, refresh=False):
+        """ checks if the file is listed in its directory,
+        the directory is listed only once or, on request,
+        once more per batch of files
+
+        :param filename: file name
+        :type: filename: :obj:`str`
+        :param refresh: list again the directory if it has not been
+                        listed in the current batch
+        :type refresh: :obj:`bool`
+        :returns: if the file exists
+        :rtype: :obj:`bool`
+        """
+        dirname, name = os.path.split(filename)
+        dirname = dirname or "."
+        names = self.__dirlists.get(dirname)
+        if names is None or (
+                refresh and dirname not in self.__relisted):
+            names = self._listdir(dirname)
+        return name in names
+
+    def _locatefile(self, filename, nname=None):
+        """ searches for absolute image file name
+
+        :param filename: image file name
+        :type: filename: :obj:`str`
+        :param nname: hdf5 node name
+        :typ nname: :obj:`str`
+        :returns: (absolute image file name or None, checked file names)
+        :rtype: (:obj:`str`, :obj:`list` <:obj:`str`>)
+        """
+        # files of a sequence are usually found by the same rule
+        # so the first one is searched by stat calls and the next ones
+        # are looked up only in the cached directory listing of the rule
+        key = (nname, os.path.dirname(filename))
+        rule = self.__rules.get(key)
+        if rule is not None:
+            candidates = list(self._candidates(filename, nname))
+            if self._listed(candidates[rule]) or \
+               self._listed(candidates[rule], True):
+                return candidates[rule], []
+            if not self.__follow:
+                # a file absent from the fresh listings is missing,
+                # only files of a running acquisition are checked again
+                for ind, tmpfname in enumerate(candidates):
+                    if ind != rule and self._listed(tmpfname, True):
+                        self.__rules[key] = ind
+                        return tmpfname, []
+                return None, candidates
+        filelist = []
+        for rule, tmpfname in enumerate(self._candidates(filename, nname)):
+            if os.path.exists(tmpfname):
+                self.__rules[key] = rule
+                return tmpfname, filelist
             filelist.append(tmpfname)
-        if os.path.exists(filename):
-            return filename
-        else:
-            filelist.append(filename)
-        if not self.__skipmissing:
-            raise Exception(
-                "Cannot open any of %s files" % sorted(set(filelist)))
-        else:
-            print("Cannot open any of %s files" % sorted(set(filelist)))
-        return None
+        return None, filelist
 
     def _loadrawimage(self, filename, dtype, shape=None):
         """ loads image from file
@@ -377,8 +1604,14 @@ class Collector(object):
         try:
             idata = None
 
-            with open(filename, "rb") as fl:
-                idata = numpy.fromfile(fl, dtype=dtype)
+            if self.__mmap:
+                # a plain array view of the mapping, as some writers
+                # do not accept numpy.ndarray subclasses
+                idata = numpy.asarray(
+                    numpy.memmap(filename, dtype=dtype, mode="r"))
+            else:
+                with open(filename, "rb") as fl:
+                    idata = numpy.fromfile(fl, dtype=dtype)
             if shape:
                 idata = idata.reshape(shape)
             dtype = idata.dtype.__str__()
@@ -424,43 +1657,292 @@ class Collector(object):
 
             return None, None, None
 
-    def _loadh5data(self, filename, path=None):
+    def _openh5field(self, nxsfile, path=None):
+        """ opens image field of hdf5 file
+
+        :param nxsfile: hdf5 image file
+        :type nxsfile: :class:`filewriter.FTFile`
+        :param path: hdf5 field path
+        :type path: :obj:`str`
+        :returns: image field
+        :rtype: :class:`filewriter.FTField`
+        """
+        if path:
+            root = nxsfile.root()
+            parent = root
+            nodes = path.split("/")
+            for nd in nodes:
+                if nd in parent.names():
+                    parent = parent.open(nd)
+                else:
+                    raise Exception(
+                        "Error: path %s in % cannot be open" % (path, nd))
+            image = parent
+        else:
+            image = nxsfile.default_field()
+        if image is None:
+            root = nxsfile.root()
+            image = root.open("data")
+        return image
+
+    def _prefetchitem(self, item):
+        """ reads the image file into the page cache in advance,
+        hdf5 image files are read partially by selections
+
+        :param item: (image file name, hdf5 field path)
+        :type item: (:obj:`str`, :obj:`str`)
+        :returns: if the file was prefetched
+        :rtype: :obj:`bool`
+        """
+        fname = item[0]
+        if fname.endswith(".h5") or fname.endswith(".nxs"):
+            return False
+        return prefetch(fname)
+
+    def _h5selection(self, path):
+        """ splits hdf5 path into the field path and the frame selection
+
+        :param path: hdf5 field path with optional frame selection,
+                     e.g. entry/data/data[100:2000:2]
+        :type path: :obj:`str`
+        :returns: (hdf5 field path, frame index or slice or None)
+        :rtype: (:obj:`str`, :obj:`int` or :obj:`slice`)
+        """
+        found = self.__selectionpattern.match(path) if path else None
+        if not found:
+            return path, None
+        npath, start, stop, step = found.groups()
+        if stop is None and step is None:
+            if not start:
+                raise Exception(
+                    "Error: invalid frame selection of %s" % path)
+            return npath or None, int(start)
+        if step is not None and step and not int(step):
+            raise Exception(
+                "Error: invalid frame selection of %s" % path)
+        return npath or None, slice(
+            int(start) if start else None,
+            int(stop) if stop else None,
+            int(step) if step else None)
+
+    @classmethod
+    def _frameblocks(cls, shape, itemsize, selection, blocksize):
+        """ splits frames of 3D image field into blocks of the given size
+
+        :param shape: image field shape
+        :type shape: :obj:`list` <:obj:`int`>
+        :param itemsize: size of data items in bytes
+        :type itemsize: :obj:`int`
+        :param selection: frame index or slice
+        :type selection: :obj:`int` or :obj:`slice`
+        :param blocksize: maximal size of a block in bytes
+        :type blocksize: :obj:`int`
+        :returns: frame selections of blocks, e.g. ['0:100:1', '100:200:1']
+                  or None if selected frames fit into one block
+        :rtype: :obj:`list` <:obj:`str`>
+        """
+        if len(shape) != 3 or isinstance(selection, (int, long)):
+            return None
+        framesize = shape[1] * shape[2] * itemsize
+        start, stop, step = (selection or slice(None)).indices(shape[0])
+        nframes = len(range(start, stop, step))
+        if nframes * framesize <= blocksize:
+            return None
+        nblock = max(int(blocksize // max(framesize, 1)), 1)
+        blocks = []
+        for first in range(0, nframes, nblock):
+            last = min(first + nblock, nframes) - 1
+            blocks.append("%s:%s:%s" % (
+                start + first * step, start + last * step + 1, step))
+        return blocks
+
+    def _blockitems(self, items):
+        """ splits 3D hdf5 images larger than the memory budget
+        into blocks of frames
+
+        :param items: (image file name, hdf5 field path) generator
+        :type items: :obj:`generator`
+        :returns: (image file name, hdf5 field path with frame selection)
+                  generator
+        :rtype: :obj:`generator`
+        """
+        # blocks loaded by worker threads in advance
+        nloaded = 1 if self.__workers < 2 else 2 * self.__workers + 1
+        blocksize = self.__maxmemory // nloaded
+        for fname, npath in items:
+            blocks = None
+            if fname.endswith(".h5") or fname.endswith(".nxs"):
+                try:
+                    with self.__h5lock:
+                        path, selection = self._h5selection(npath)
+                        try:
+                            image = self._h5image(fname, path)
+                            shape = list(image.shape)
+                            itemsize = numpy.dtype(image.dtype).itemsize
+                        finally:
+                            self._trimh5files()
+                    blocks = self._frameblocks(
+                        shape, itemsize, selection, blocksize)
+                except Exception:
+                    # errors are reported when the image is loaded
+                    blocks = None
+            if not blocks:
+                yield fname, npath
+            else:
+                for block in blocks:
+                    yield fname, "%s[%s]" % (path or "", block)
+
+    @classmethod
+    def _frameselection(cls, shape, selection):
+        """ converts frame selection to hyperslab indices
+
+        :param shape: image field shape
+        :type shape: :obj:`list` <:obj:`int`>
+        :param selection: frame index or slice
+        :type selection: :obj:`int` or :obj:`slice`
+        :returns: (hyperslab indices, selected frame indices)
+        :rtype: (:obj:`tuple`, :obj:`list` <:obj:`int`>)
+        """
+        if len(shape) != 3:
+            raise Exception(
+                "Error: frames can be selected only in 3D fields")
+        if isinstance(selection, slice):
+            start, stop, step = selection.indices(shape[0])
+            frames = list(range(start, stop, step))
+            index = slice(start, stop, step)
+        else:
+            index = selection + shape[0] if selection < 0 else selection
+            frames = [index] if 0 <= index < shape[0] else []
+        if not frames:
+            raise Exception("Error: empty frame selection")
+        return (index, slice(None), slice(None)), frames
+
+    def _h5image(self, filename, path=None):
+        """ opens image field of hdf5 file and keeps the file open
+        for next frames stored in the same file
+
+        :param filename: hdf5 image file name
+        :type filename: :obj:`str`
+        :param path: hdf5 field path
+        :type path: :obj:`str`
+        :returns: image field
+        :rtype: :class:`filewriter.FTField`
+        """
+        nxsfile, images = self.__h5files.pop(filename, (None, {}))
+        if nxsfile is None:
+            nxsfile = filewriter.open_file(
+                filename, readonly=True, views=True, writer=self.__wrmodule)
+        # the most recently used file at the end
+        self.__h5files[filename] = (nxsfile, images)
+        if path not in images:
+            images[path] = self._openh5field(nxsfile, path)
+        return images[path]
+
+    def _trimh5files(self, size=None):
+        """ closes least recently used hdf5 image files
+        above the cache size
+
+        :param size: number of hdf5 image files kept open
+        :type size: :obj:`int`
+        """
+        size = self.__filecache if size is None else size
+        while len(self.__h5files) > size:
+            _, (nxsfile, images) = self.__h5files.popitem(last=False)
+            images.clear()
+            try:
+                nxsfile.close()
+            except Exception as e:
+                print(str(e))
+
+    @classmethod
+    def _chunklayout(cls, field):
+        """ provides layout of raw chunks which can be copied into the field
+
+        :param field: output field
+        :type field: :class:`filewriter.FTField`
+        :returns: (data type, chunk shape, filters) or None
+                  if the field does not store one frame per chunk
+        :rtype: (:obj:`str`, :obj:`list` <:obj:`int`>,
+                 :obj:`list` < (:obj:`int`, :obj:`tuple` <:obj:`int`>) >)
+        """
+        try:
+            chunk = field.chunk
+            filters = field.filters
+        except Exception:
+            return None
+        if not chunk or filters is None or chunk[0] != 1 or \
+           list(chunk[1:]) != list(field.shape[1:]):
+            return None
+        return field.dtype, list(chunk), filters
+
+    @classmethod
+    def _readchunks(cls, image, layout, frames=None):
+        """ reads raw chunks of image frames if they match the layout
+
+        :param image: hdf5 image field
+        :type image: :class:`filewriter.FTField`
+        :param layout: (data type, chunk shape, filters) of output field
+        :type layout: (:obj:`str`, :obj:`list` <:obj:`int`>,
+                 :obj:`list` < (:obj:`int`, :obj:`tuple` <:obj:`int`>) >)
+        :param frames: selected frame indices of 3D image field
+        :type frames: :obj:`list` <:obj:`int`>
+        :returns: a list of (filter mask, raw chunk data) of frames or None
+        :rtype: :obj:`list` < (:obj:`int`, :obj:`bytes`) >
+        """
+        dtype, chunk, filters = layout
+        shape = list(image.shape)
+        if image.dtype != dtype or image.filters != filters:
+            return None
+        if shape == chunk[1:] and image.chunk == chunk[1:]:
+            offsets = [[0] * len(shape)]
+        elif len(shape) == len(chunk) and shape[1:] == chunk[1:] \
+                and image.chunk == chunk:
+            offsets = [[i] + [0] * (len(shape) - 1)
+                       for i in (range(shape[0]) if frames is None
+                                 else frames)]
+        else:
+            return None
+        return [image.read_direct_chunk(offset) for offset in offsets]
+
+    def _loadh5data(self, filename, path=None, layout=None):
         """ loads image from hdf5 file
 
         :param filename: hdf5 image file name
         :type filename: :obj:`str`
         :param path: hdf5 field path
         :type path: :obj:`str`
-        :returns: (image data, image data type, image shape)
+        :param layout: (data type, chunk shape, filters) of output field
+                       to read matching image frames as raw chunks
+        :type layout: (:obj:`str`, :obj:`list` <:obj:`int`>,
+                 :obj:`list` < (:obj:`int`, :obj:`tuple` <:obj:`int`>) >)
+        :returns: (image data or a list of (filter mask, raw chunk data),
+                   image data type, image shape)
         :rtype: (:class:`numpy.ndarray`, :obj:`str`, :obj:`list` <:obj:`int`>)
         """
         try:
             dtype = None
             shape = None
-            nxsfile = filewriter.open_file(
-                filename, readonly=True, writer=self.__wrmodule)
-            if path:
-                root = nxsfile.root()
-                parent = root
-                nodes = path.split("/")
-                for nd in nodes:
-                    if nd in parent.names():
-                        parent = parent.open(nd)
-                    else:
-                        raise Exception(
-                            "Error: path %s in % cannot be open" % (path, nd))
-                image = parent
-            else:
-                image = nxsfile.default_field()
-            if image is None:
-                root = nxsfile.root()
-                image = root.open("data")
-            idata = image.read()
-            if image is not None:
-                idata = image[...]
-                dtype = image.dtype
-                shape = image.shape
-            nxsfile.close()
+            path, selection = self._h5selection(path)
+            image = self._h5image(filename, path)
+            shape = list(image.shape)
+            index = Ellipsis
+            frames = None
+            if selection is not None:
+                # only the selected frames are read
+                index, frames = self._frameselection(shape, selection)
+                shape = shape[1:]
+                if isinstance(selection, slice):
+                    shape = [len(frames)] + shape
+            idata = None
+            if layout is not None:
+                try:
+                    idata = self._readchunks(image, layout, frames)
+                except Exception:
+                    # e.g. unallocated chunks, decode the data
+                    idata = None
+            if idata is None:
+                idata = image[index]
+            dtype = image.dtype
             return idata, dtype, shape
         except Exception as e:
             print(str(e))
@@ -469,6 +1951,8 @@ class Collector(object):
             else:
                 print("Cannot open a file %s" % filename)
             return None, None, None
+        finally:
+            self._trimh5files()
 
     def _addattr(self, node, attrs):
         """ adds attributes to the parent node in nexus file
@@ -485,7 +1969,7 @@ class Collector(object):
             print(" + add attribute: %s = %s" % (name, value))
 
     def _getfield(self, node, fieldname, dtype, shape, fieldattrs,
-                  fieldcompression):
+                  fieldcompression, nframes=0):
         """ creates a field in nexus file
 
         :param node: parent hdf5 node
@@ -501,6 +1985,8 @@ class Collector(object):
         :type fieldattrs: :obj:`dict` <:obj:`str`, :obj:`str`>
         :param fieldcompression: field compression rate
         :type fieldcompression: :obj:`int`
+        :param nframes: initial number of frames
+        :type nframes: :obj:`int`
         :returns: hdf5 field node
         :rtype: :class:`filewriter.FTField`
         """
@@ -520,14 +2006,23 @@ class Collector(object):
                         cfilter.filterid = opts[0]
                         cfilter.options = tuple(opts[1:])
                 if len(shape) == 2:
-                    nshape = [0, shape[0], shape[1]]
+                    nshape = [nframes, shape[0], shape[1]]
                     nchunk = [1, shape[0], shape[1]]
                 elif len(shape) == 3:
-                    nshape = [0, shape[0], shape[1], shape[2]]
+                    nshape = [nframes, shape[0], shape[1], shape[2]]
                     nchunk = [1, shape[0], shape[1], shape[2]]
                 else:
-                    nshape = [0, shape[0]]
+                    nshape = [nframes, shape[0]]
                     nchunk = [1, shape[0]]
+                if self.__chunksize:
+                    try:
+                        itemsize = numpy.dtype(dtype).itemsize
+                    except Exception:
+                        itemsize = None
+                    if itemsize:
+                        nchunk = chunkshape(
+                            nchunk[1:], itemsize, self.__chunksize)
+                self._journalcreate(node, fieldname)
                 field = node.create_field(
                     fieldname,
                     dtype,
@@ -537,33 +2032,52 @@ class Collector(object):
                 self._addattr(field, fieldattrs)
             return field
 
-    def _collectimages(self, files, node, fieldname=None, fieldattrs=None,
-                       fieldcompression=None, datatype=None, shape=None):
-        """ collects images
+    def _flush(self, names=None):
+        """ flushes the master file
+
+        :param names: image files written since the last flush
+        :type names: :obj:`list` <:obj:`str`>
+        """
+        start = time.time()
+        self.__nxsfile.flush()
+        if self.__stats is not None:
+            self.__stats.add("flush", start, names or None)
+
+    @property
+    def stats(self):
+        """ statistics of the last collect call
+
+        :returns: timings and data sizes of collecting stages or None
+        :rtype: :obj:`dict` <:obj:`str`, `any`>
+        """
+        return self.__stats.todict() if self.__stats is not None else None
+
+    def _writer(self):
+        """ provides the writer module of the master file
+
+        :returns: writer module
+        :rtype: :mod:`PNIWriter` or :mod:`H5PYWriter` or :mod:`H5CppWriter`
+        """
+        return getattr(self.__nxsfile, "writer", None) or \
+            self.__wrmodule or filewriter.writer
+
+    def _imagefiles(self, files, node, datatype=None):
+        """ provides image files to collect
 
         :param files: a list of file strings
         :type files: :obj:`list` <:obj:`str`>
         :param node: hdf5 parent node
         :type node: :class:`filewriter.FTGroup` or \
                     :class:`filewriter.FTLink`
-        :param fieldname: field name
-        :type fieldname: :obj:`str`
-        :param fieldattrs: dictionary with field attributes
-        :type fieldattrs: :obj:`dict` <:obj:`str`, :obj:`str`>
-        :param fieldcompression: field compression rate
-        :type fieldcompression: :obj:`int`
         :param datatype: field data type
         :type datatype: :obj:`str`
-        :param shape: field shape
-        :type shape: :obj:`list` <:obj:`int` >
+        :returns: generator of (image file name, hdf5 field path)
+        :rtype: :obj:`generator`
         """
-        fieldname = fieldname or "data"
-        field = None
-        ind = 0
-
         for filestr in files:
             if self.__break:
                 break
+            self.__relisted = set()
             inputfiles = self._filegenerator(filestr)
             for fname in inputfiles():
                 if self.__break:
@@ -572,91 +2086,747 @@ class Collector(object):
                 if not datatype and \
                    ".h5://" in fname or ".nxs://" in fname:
                     fname, npath = fname.split("://", 1)
-                if not self.__testmode or node is not None:
-                    fname = self._findfile(fname, node.name)
+                start = time.time()
+                if self.__follow and not self.__testmode:
+                    ffname = self._waitforfile(fname, node.name)
+                    if self.__stats is not None:
+                        self.__stats.add("wait", start, ffname or fname)
+                    if ffname is None:
+                        if not self.__break:
+                            print("Timeout: %s has not appeared" % fname)
+                        return
+                    fname = ffname
+                elif self.__missingframes and node is not None:
+                    ffname = self._locatefile(fname, node.name)[0]
+                    if self.__stats is not None:
+                        self.__stats.add("find", start, ffname or fname)
+                    fname = ffname or MissingFile(fname)
+                elif not self.__testmode or node is not None:
+                    ffname = self._findfile(fname, node.name)
+                    if self.__stats is not None:
+                        self.__stats.add("find", start, ffname or fname)
+                    fname = ffname
                 if not fname:
                     continue
-                if datatype:
-                    data, dtype, shape = self._loadrawimage(
-                        fname, datatype, shape)
-                elif fname.endswith(".h5") or fname.endswith(".nxs"):
-                    try:
-                        data, dtype, shape = self._loadh5data(fname, npath)
-                    except Exception as e:
-                        print(str(e))
-                        data, dtype, shape = self._loadimage(fname)
+                yield fname, npath
+
+    def _framecount(self, files, items, datatype=None):
+        """ provides a number of frames defined by file patterns
+
+        :param files: a list of file strings
+        :type files: :obj:`list` <:obj:`str`>
+        :param items: a list of (image file name, hdf5 field path)
+        :type items: :obj:`list` <(:obj:`str`, :obj:`str`)>
+        :param datatype: field data type
+        :type datatype: :obj:`str`
+        :returns: number of frames or None if it is not known
+        :rtype: :obj:`int`
+        """
+        for filestr in files:
+            if not self.__filepattern.match(filestr):
+                return None
+        if not datatype:
+            for fname, npath in items:
+                if npath is not None or \
+                   fname.endswith(".h5") or fname.endswith(".nxs"):
+                    return None
+        return len(items)
+
+    def _loadframe(self, fname, npath=None, datatype=None, shape=None,
+                   layout=None):
+        """ loads image data from a file
+
+        :param fname: image file name
+        :type fname: :obj:`str`
+        :param npath: hdf5 field path
+        :type npath: :obj:`str`
+        :param datatype: field data type
+        :type datatype: :obj:`str`
+        :param shape: field shape
+        :type shape: :obj:`list` <:obj:`int` >
+        :param layout: (data type, chunk shape, filters) of output field
+                       to read matching hdf5 image frames as raw chunks
+        :type layout: (:obj:`str`, :obj:`list` <:obj:`int`>,
+                 :obj:`list` < (:obj:`int`, :obj:`tuple` <:obj:`int`>) >)
+        :returns: (image data, image data type, image shape)
+        :rtype: (:class:`numpy.ndarray`, :obj:`str`, :obj:`list` <:obj:`int`>)
+        """
+        if datatype:
+            return self._loadrawimage(fname, datatype, shape)
+        elif fname.endswith(".h5") or fname.endswith(".nxs"):
+            try:
+                with self.__h5lock:
+                    return self._loadh5data(fname, npath, layout)
+            except Exception as e:
+                print(str(e))
+                return self._loadimage(fname)
+        else:
+            return self._loadimage(fname)
+
+    def _h5field(self, items, node, fieldname, fieldattrs,
+                 fieldcompression):
+        """ opens the output field or creates it from metadata
+        of the first hdf5 image
+
+        :param items: (image file name, hdf5 field path) generator
+        :type items: :obj:`generator`
+        :param node: hdf5 parent node
+        :type node: :class:`filewriter.FTGroup` or \
+                    :class:`filewriter.FTLink`
+        :param fieldname: field name
+        :type fieldname: :obj:`str`
+        :param fieldattrs: dictionary with field attributes
+        :type fieldattrs: :obj:`dict` <:obj:`str`, :obj:`str`>
+        :param fieldcompression: field compression rate
+        :type fieldcompression: :obj:`int`
+        :returns: (image file generator, output field or None)
+        :rtype: (:obj:`generator`, :class:`filewriter.FTField`)
+        """
+        items = iter(items)
+        first = next(items, None)
+        if first is None:
+            return items, None
+        items = itertools.chain([first], items)
+        if fieldname in node.names():
+            return items, node.open(fieldname)
+        fname, npath = first
+        if not fname.endswith(".h5") and not fname.endswith(".nxs"):
+            return items, None
+        try:
+            image = self._h5image(fname, self._h5selection(npath)[0])
+            dtype = image.dtype
+            shape = list(image.shape)
+        except Exception:
+            return items, None
+        finally:
+            self._trimh5files()
+        if len(shape) == 3:
+            shape = shape[1:]
+        field = self._getfield(
+            node, fieldname, dtype, shape, fieldattrs, fieldcompression)
+        return items, field
+
+    def _collectvirtual(self, items, node, fieldname, fieldattrs):
+        """ creates a virtual field mapping frames of hdf5 images
+
+        :param items: a list of (image file name, hdf5 field path)
+        :type items: :obj:`list` <(:obj:`str`, :obj:`str`)>
+        :param node: hdf5 parent node
+        :type node: :class:`filewriter.FTGroup` or \
+                    :class:`filewriter.FTLink`
+        :param fieldname: field name
+        :type fieldname: :obj:`str`
+        :param fieldattrs: dictionary with field attributes
+        :type fieldattrs: :obj:`dict` <:obj:`str`, :obj:`str`>
+        :returns: if the virtual field was created
+        :rtype: :obj:`bool`
+        """
+        sources = []
+        dtype = None
+        frameshape = None
+        masterdir = os.path.dirname(os.path.abspath(self.__nexusfilename))
+        for fname, npath in items:
+            if self.__break:
+                return True
+            if isinstance(fname, MissingFile) or \
+               not fname.endswith(".h5") and not fname.endswith(".nxs"):
+                return False
+            if self._h5selection(npath)[1] is not None:
+                # frame selections are copied
+                return False
+            try:
+                nxsfile = filewriter.open_file(
+                    fname, readonly=True, views=True, writer=self.__wrmodule)
+                image = self._openh5field(nxsfile, npath)
+                idtype = image.dtype
+                ishape = list(image.shape)
+                ipath = "/".join(
+                    nd.split(":")[0] for nd in image.path.split("/"))
+                nxsfile.close()
+            except Exception as e:
+                print(str(e))
+                if not self.__skipmissing:
+                    raise Exception("Cannot open a file %s" % fname)
+                print("Cannot open a file %s" % fname)
+                continue
+            nrim = None
+            fshape = ishape
+            if len(ishape) == 3:
+                nrim = ishape[0]
+                fshape = ishape[1:]
+            if dtype is None:
+                dtype = idtype
+                frameshape = fshape
+            if idtype != dtype or fshape != frameshape:
+                return False
+            sources.append((fname, ipath, ishape, nrim))
+        if not sources:
+            return False
+        layout = filewriter.virtual_field_layout(
+            [sum(src[3] or 1 for src in sources)] + frameshape, dtype,
+            parent=node)
+        ind = 0
+        for fname, ipath, ishape, nrim in sources:
+            # source files below the master file directory are stored
+            # with relative paths
+            relname = os.path.relpath(fname, masterdir)
+            if relname.startswith(".."):
+                relname = fname
+            key = ind if nrim is None else slice(ind, ind + nrim)
+            layout[key, ...] = filewriter.external_field(
+                relname, ipath, ishape, dtype, ishape, parent=node)
+            ind += nrim or 1
+        self._journalcreate(node, fieldname)
+        field = node.create_virtual_field(fieldname, layout)
+        self._addattr(field, fieldattrs)
+        for fname, _, _, _ in sources:
+            print(" * append %s " % (fname))
+        self._flush([src[0] for src in sources])
+        return True
+
+    @classmethod
+    def _resumeitems(cls, items, field):
+        """ skips input files collected by previous runs
+
+        :param items: (image file name, hdf5 field path) generator
+        :type items: :obj:`generator`
+        :param field: output field
+        :type field: :class:`filewriter.FTField`
+        :returns: (remaining image files, number of collected frames,
+                  number of collected image files)
+        :rtype: (:obj:`generator`, :obj:`int`, :obj:`int`)
+        """
+        try:
+            if PROGRESS not in field.attributes.names():
+                return items, 0, 0
+            progress = json.loads(field.attributes[PROGRESS][...])
+            nfiles = int(progress["files"])
+            nframes = int(progress["frames"])
+            last = list(progress["last"])
+        except Exception:
+            return items, 0, 0
+        items = iter(items)
+        done = list(itertools.islice(items, nfiles))
+        # the field or the input files changed since the last run
+        if not done or len(done) != nfiles or list(done[-1]) != last \
+           or nframes != field.shape[0]:
+            return itertools.chain(done, items), 0, 0
+        return items, nframes, nfiles
+
+    def _saveprogress(self, field, nfiles, last, nframes):
+        """ records progress of collecting in the output field
+
+        :param field: output field
+        :type field: :class:`filewriter.FTField`
+        :param nfiles: number of collected image files
+        :type nfiles: :obj:`int`
+        :param last: the last collected (image file name, hdf5 field path)
+        :type last: (:obj:`str`, :obj:`str`)
+        :param nframes: number of collected frames
+        :type nframes: :obj:`int`
+        """
+        if self.__journal is not None:
+            self.__journal.setattribute(field, PROGRESS)
+        field.attributes.create(PROGRESS, "string", overwrite=True)[...] = \
+            json.dumps(
+                {"files": nfiles, "frames": nframes, "last": list(last)})
+
+    @classmethod
+    def _loadmissing(cls, node, fieldname):
+        """ reads indices of missing frames stored by previous runs
+
+        :param node: hdf5 parent node
+        :type node: :class:`filewriter.FTGroup` or \
+                    :class:`filewriter.FTLink`
+        :param fieldname: field name
+        :type fieldname: :obj:`str`
+        :returns: indices of missing frames
+        :rtype: :obj:`list` <:obj:`int`>
+        """
+        if fieldname + MISSING not in node.names():
+            return []
+        try:
+            return [int(ind) for ind in
+                    numpy.ravel(node.open(fieldname + MISSING).read())]
+        except Exception:
+            return []
+
+    def _savemissing(self, node, fieldname, missing):
+        """ stores indices of missing frames next to the output field
+
+        :param node: hdf5 parent node
+        :type node: :class:`filewriter.FTGroup` or \
+                    :class:`filewriter.FTLink`
+        :param fieldname: field name
+        :type fieldname: :obj:`str`
+        :param missing: indices of missing frames
+        :type missing: :obj:`list` <:obj:`int`>
+        """
+        name = fieldname + MISSING
+        exists = name in node.names()
+        if self.__journal is not None and (exists or missing):
+            self.__journal.replace(node, name)
+        if exists:
+            node.remove(name)
+        if missing:
+            self._journalcreate(node, name)
+            field = node.create_field(
+                name, "int64", shape=[len(missing)], chunk=[len(missing)])
+            field.write(numpy.array(missing, dtype="int64"))
+
+    def _collectimages(self, files, node, fieldname=None, fieldattrs=None,
+                       fieldcompression=None, datatype=None, shape=None):
+        """ collects images
+
+        :param files: a list of file strings
+        :type files: :obj:`list` <:obj:`str`>
+        :param node: hdf5 parent node
+        :type node: :class:`filewriter.FTGroup` or \
+                    :class:`filewriter.FTLink`
+        :param fieldname: field name
+        :type fieldname: :obj:`str`
+        :param fieldattrs: dictionary with field attributes
+        :type fieldattrs: :obj:`dict` <:obj:`str`, :obj:`str`>
+        :param fieldcompression: field compression rate
+        :type fieldcompression: :obj:`int`
+        :param datatype: field data type
+        :type datatype: :obj:`str`
+        :param shape: field shape
+        :type shape: :obj:`list` <:obj:`int` >
+        """
+        state = FieldState(node, fieldname or "data", fieldattrs,
+                           fieldcompression, datatype, shape)
+        items = self._imagefiles(files, node, datatype)
+        with self.__h5lock:
+            state.newfield = not self.__testmode and node is not None \
+                and state.fieldname not in node.names()
+        if self.__virtual and state.newfield and not datatype and \
+           self._writer().is_vds_supported():
+            items = list(items)
+            with self.__h5lock:
+                if self._collectvirtual(
+                        items, node, state.fieldname, fieldattrs):
+                    return
+        items = self._prepareitems(files, items, state)
+        frames = orderedmap(
+            lambda item: self._loaditem(item, state), items, self.__workers)
+        for fname, npath, data, dtype, dshape in frames:
+            if self.__break:
+                break
+            state.nitems += 1
+            if isinstance(fname, MissingFile):
+                self._collectmissing(state, fname, npath)
+            elif data is None:
+                if not state.pending:
+                    state.progress = (state.nitems, (fname, npath))
+            else:
+                self._collectframe(state, fname, npath, data, dtype, dshape)
+        self._finishfield(state)
+
+    def _prepareitems(self, files, items, state):
+        """ prepares input items and the output field state
+        for the enabled reading strategies
+
+        :param files: a list of file strings
+        :type files: :obj:`list` <:obj:`str`>
+        :param items: (image file, hdf5 path) items
+        :type items: :obj:`iter` <(:obj:`str`, :obj:`str`)>
+        :param state: output field state
+        :type state: :class:`FieldState`
+        :returns: (image file, hdf5 path) items to load
+        :rtype: :obj:`iter` <(:obj:`str`, :obj:`str`)>
+        """
+        node = state.node
+        if self.__maxmemory and not state.datatype:
+            items = self._blockitems(items)
+        if self.__presize and state.newfield and not self.__follow:
+            items = list(items)
+            state.nframes = self._framecount(files, items, state.datatype)
+        # raw chunks can be written if data is not compressed,
+        # i.e. without filters or with the deflate filter of level 0
+        state.opts = getcompression(state.fieldcompression) \
+            if state.fieldcompression else None
+        state.directchunk = self.__directchunk and state.newfield \
+            and state.datatype and state.opts in (None, 0) \
+            and self._writer().is_direct_chunk_supported()
+        # encoded chunks of hdf5 images can be copied
+        # if they have the same filters as the output field
+        if self.__chunkcopy and not state.datatype and not self.__testmode \
+           and node is not None \
+           and self._writer().is_direct_chunk_supported():
+            with self.__h5lock:
+                items, state.field = self._h5field(
+                    items, node, state.fieldname, state.fieldattrs,
+                    state.fieldcompression)
+                if state.field is not None:
+                    state.layout = self._chunklayout(state.field)
+        if self.__resume and not state.newfield and not self.__testmode \
+           and node is not None:
+            with self.__h5lock:
+                state.field = state.field or node.open(state.fieldname)
+                items, state.ind, state.nitems = self._resumeitems(
+                    items, state.field)
+                if self.__missingframes and state.nitems:
+                    state.missing = self._loadmissing(node, state.fieldname)
+        if self.__prefetch and not self.__testmode:
+            items = readahead(items, self.__prefetch, self._prefetchitem)
+        return items
+
+    def _loaditem(self, item, state):
+        """ loads the frame of the input item
+
+        :param item: (image file, hdf5 path)
+        :type item: (:obj:`str`, :obj:`str`)
+        :param state: output field state
+        :type state: :class:`FieldState`
+        :returns: (image file, hdf5 path, image data, image data type,
+                  image shape)
+        :rtype: :obj:`tuple`
+        """
+        fname, npath = item
+        if isinstance(fname, MissingFile):
+            return (fname, npath, None, None, None)
+        start = time.time()
+        frame = tuple(
+            self._loadframe(fname, npath, state.datatype, state.shape,
+                            state.layout))
+        if self.__stats is not None:
+            data = frame[0]
+            if isinstance(data, list):
+                nbytes = sum(len(chunk) for _, chunk in data)
+            else:
+                nbytes = getattr(data, "nbytes", 0)
+            self.__stats.add("decode", start, fname, nbytes)
+        return (fname, npath) + frame
+
+    def _collectmissing(self, state, fname, npath):
+        """ records a missing image file and fills its frame
+        if a fill value is given
+
+        :param state: output field state
+        :type state: :class:`FieldState`
+        :param fname: missing image file
+        :type fname: :class:`MissingFile`
+        :param npath: hdf5 image path
+        :type npath: :obj:`str`
+        """
+        # without filling the next frames are shifted down
+        state.missing.append(
+            state.ind if self.__fillvalue is not None
+            else state.ind + len(state.missing))
+        state.missingfiles.append(fname)
+        if self.__fillvalue is not None:
+            with self.__h5lock:
+                if state.buffer is None:
+                    state.leading += 1
+                elif state.ind == state.buffer.length \
+                        and not self.__testmode:
+                    self._appended(
+                        state, state.buffer.fill(self.__fillvalue))
+                state.ind += 1
+        if not state.pending:
+            state.progress = (state.nitems, (fname, npath))
+
+    def _collectframe(self, state, fname, npath, data, dtype, dshape):
+        """ appends the loaded image data to the output field
+
+        :param state: output field state
+        :type state: :class:`FieldState`
+        :param fname: image file
+        :type fname: :obj:`str`
+        :param npath: hdf5 image path
+        :type npath: :obj:`str`
+        :param data: image data or raw chunks of an hdf5 image
+        :type data: :class:`numpy.ndarray` or \
+                    :obj:`list` < (:obj:`int`, :obj:`bytes`) >
+        :param dtype: image data type
+        :type dtype: :obj:`str`
+        :param dshape: image shape
+        :type dshape: :obj:`list` <:obj:`int` >
+        """
+        ishape = dshape
+        nrim = 1
+        if len(dshape) == 3:
+            ishape = [dshape[1], dshape[2]]
+            nrim = dshape[0]
+        with self.__h5lock:
+            if state.field is None and \
+               (not self.__testmode or state.node is not None):
+                state.field = self._getfield(
+                    state.node, state.fieldname, dtype, ishape,
+                    state.fieldattrs, state.fieldcompression,
+                    state.nframes or 0)
+            if state.field and state.buffer is None:
+                self._createbuffer(state)
+            if state.field and state.ind == state.buffer.length:
+                state.pending.append((state.nitems, (fname, npath)))
+                if self.__testmode:
+                    written = [fname]
+                elif isinstance(data, list):
+                    # raw chunks copied from hdf5 images
+                    written = state.buffer.append_chunks(fname, data)
                 else:
-                    data, dtype, shape = self._loadimage(fname)
-
-                if data is not None:
-                    ishape = shape
-                    nrim = 1
-                    if len(shape) == 3:
-                        ishape = [shape[1], shape[2]]
-                        nrim = shape[0]
-                    if field is None:
-                        if not self.__testmode or node is not None:
-                            field = self._getfield(
-                                node, fieldname, dtype, ishape,
-                                fieldattrs, fieldcompression)
-                    if field and ind == field.shape[0]:
-                        if not self.__testmode:
-                            if nrim == 1:
-                                field.grow(0, 1)
-                                field[-1, ...] = data
-                            else:
-                                field.grow(0, nrim)
-                                field[field.shape[0]-nrim:, ...] = data
-                        print(" * append %s " % (fname))
-                    ind += nrim
-                    if not self.__testmode:
-                        self.__nxsfile.flush()
+                    written = state.buffer.append(fname, data, nrim)
+                if self.__stats is not None:
+                    self.__stats.frames += nrim
+                self._appended(state, written)
+            elif not state.pending:
+                state.progress = (state.nitems, (fname, npath))
+            state.ind += nrim
+            if not self.__testmode and state.nflush and (
+                    (self.__flushframes and
+                     state.nflush >= self.__flushframes) or
+                    (self.__flushtime is not None and
+                     time.time() - state.tflush >= self.__flushtime)):
+                if self.__resume and state.progress:
+                    self._saveprogress(
+                        state.field, state.progress[0], state.progress[1],
+                        state.buffer.written)
+                self._flush(state.unflushed)
+                state.unflushed = []
+                state.nflush = 0
+                state.tflush = time.time()
+
+    def _createbuffer(self, state):
+        """ creates the frame buffer of the output field
+
+        :param state: output field state
+        :type state: :class:`FieldState`
+        """
+        if self.__journal is not None:
+            self.__journal.extend(state.field)
+        # single frames can be written as raw chunks
+        # only into fields with one frame per chunk
+        directchunk = state.directchunk and \
+            self._chunklayout(state.field) is not None
+        state.buffer = FrameBuffer(
+            state.field, self.__batchsize,
+            0 if state.nframes else None,
+            bool(directchunk), 1 if state.opts == 0 else 0,
+            self.__stats)
+        if state.leading and not self.__testmode:
+            for _ in range(min(state.leading,
+                               state.ind - state.buffer.length)):
+                state.buffer.fill(self.__fillvalue)
+
+    def _appended(self, state, written):
+        """ reports image files written into the output field
+
+        :param state: output field state
+        :type state: :class:`FieldState`
+        :param written: names of written image files
+        :type written: :obj:`list` <:obj:`str`>
+        """
+        for name in written:
+            print(" * append %s " % (name))
+            state.progress = state.pending.popleft()
+        state.unflushed.extend(written)
+        state.nflush += len(written)
+
+    def _finishfield(self, state):
+        """ writes buffered frames, progress and missing frames
+        of the output field
+
+        :param state: output field state
+        :type state: :class:`FieldState`
+        """
+        if state.buffer is not None and not self.__testmode:
+            with self.__h5lock:
+                self._appended(state, state.buffer.write())
+                state.buffer.trim()
+                if self.__resume and state.progress:
+                    self._saveprogress(
+                        state.field, state.progress[0], state.progress[1],
+                        state.buffer.written)
+                if state.nflush:
+                    self._flush(state.unflushed)
+        with self.__h5lock:
+            if self.__missingframes and not self.__testmode \
+               and state.node is not None:
+                self._savemissing(state.node, state.fieldname, state.missing)
+            if state.missingfiles:
+                print("Missing %s of %s files, e.g. %s" % (
+                    len(state.missingfiles), state.nitems,
+                    state.missingfiles[0]))
+
+    def _postrunfield(self, parent):
+        """ reads the output field parameters defined by the postrun field
+        of the NXcollection group
+
+        :param parent: hdf5 NXcollection group
+        :type parent: :class:`filewriter.FTGroup` or \
+                      :class:`filewriter.FTLink`
+        :returns: (input file strings, hdf5 parent node, field name,
+                  field attributes, field compression, field data type,
+                  field shape)
+        :rtype: :obj:`tuple`
+        """
+        inputfiles = parent.open("postrun")
+        files = inputfiles[...]
+        if isinstance(files, (str, unicode, bytes)):
+            files = [files]
+        if any(isinstance(fl, bytes) and not isinstance(fl, str)
+               for fl in files):
+            # h5py 3 reads variable length strings as bytes
+            files = [_tostr(fl) for fl in files]
+        fieldname = "data"
+        fielddtype = None
+        fieldshape = None
+        fieldattrs = {}
+        fieldcompression = None
+        for at in inputfiles.attributes:
+            if at.name == "fieldname":
+                fieldname = _tostr(at[...])
+            elif at.name == "fieldcompression":
+                fieldcompression = at[...]
+                if isinstance(fieldcompression, bytes):
+                    fieldcompression = _tostr(fieldcompression)
+            elif at.name == "fielddtype":
+                fielddtype = _tostr(at[...])
+            elif at.name == "fieldshape":
+                fieldshape = json.loads(_tostr(at[...]))
+            elif at.name.startswith("fieldattr_"):
+                atname = at.name[10:]
+                if atname:
+                    fieldattrs[atname] = (
+                        at[...], at.dtype, at.shape
+                    )
+        if fieldcompression is None:
+            fieldcompression = self.__compression
+        return (files, parent.parent, fieldname, fieldattrs,
+                fieldcompression, fielddtype, fieldshape)
+
+    def _collectfield(self, field):
+        """ collects the image files of the output field
+
+        :param field: (input file strings, hdf5 parent node, field name,
+                      field attributes, field compression, field data type,
+                      field shape)
+        :type field: :obj:`tuple`
+        """
+        try:
+            with self.__h5lock:
+                print("populate: %s/%s with %s" % (
+                    field[1].path, field[2], field[0]))
+            self._collectimages(*field)
+        except Exception:
+            # stops collecting of the other fields
+            self.__break = True
+            raise
+
+    def _collectfields(self, fields):
+        """ collects the image files of output fields, independent fields
+        are decoded concurrently and written by the serialized hdf5 writer
+
+        :param fields: a list of (input file strings, hdf5 parent node,
+                       field name, field attributes, field compression,
+                       field data type, field shape)
+        :type fields: :obj:`list` <:obj:`tuple`>
+        """
+        if self.__concurrentfields < 2 or len(fields) < 2:
+            for field in fields:
+                self._collectfield(field)
+            return
+        pool = ThreadPool(min(self.__concurrentfields, len(fields)))
+        try:
+            pool.map(self._collectfield, fields, 1)
+        finally:
+            pool.close()
+            pool.join()
 
-    def _inspect(self, parent, collection=False):
-        """ collects recursively the all image files defined
+    @classmethod
+    def _postrunpaths(cls, root):
+        """ finds NXcollection groups with postrun fields
+        in a single walk over the native hdf5 tree
+
+        Contrary to :meth:`_inspect`, which opens every link name
+        and so follows soft and external links to groups, the native
+        walk visits only nodes reached by hard links, i.e. a collection
+        group linked from several places is collected once.
+
+        :param root: hdf5 root group
+        :type root: :class:`filewriter.FTGroup`
+        :returns: hdf5 paths of NXcollection groups with postrun fields
+                  or None if the writer does not provide a tree walk
+        :rtype: :obj:`list` <:obj:`str`>
+        """
+        h5object = getattr(root, "h5object", None)
+        if hasattr(h5object, "visititems"):
+            return cls._h5pypostrunpaths(h5object)
+        if hasattr(getattr(h5object, "nodes", None), "recursive"):
+            return cls._h5cpppostrunpaths(h5object)
+        return None
+
+    @classmethod
+    def _h5pypostrunpaths(cls, h5object):
+        """ finds NXcollection groups with postrun fields
+        with the h5py visitor
+
+        :param h5object: h5py root group
+        :type h5object: :class:`h5py.Group`
+        :returns: hdf5 paths of NXcollection groups with postrun fields
+        :rtype: :obj:`list` <:obj:`str`>
+        """
+        paths = []
+
+        def _visit(name, obj):
+            if hasattr(obj, "keys") and "postrun" in obj:
+                gtype = obj.attrs.get("NX_class")
+                if isinstance(gtype, bytes):
+                    gtype = _tostr(gtype)
+                if gtype == 'NXcollection':
+                    paths.append(name)
+
+        h5object.visititems(_visit)
+        return paths
+
+    @classmethod
+    def _h5cpppostrunpaths(cls, h5object):
+        """ finds NXcollection groups with postrun fields
+        with the h5cpp recursive node iterator
+
+        :param h5object: h5cpp root group
+        :type h5object: :class:`pninexus.h5cpp.node.Group`
+        :returns: hdf5 paths of NXcollection groups with postrun fields
+        :rtype: :obj:`list` <:obj:`str`>
+        """
+        paths = []
+        linked = []
+        for node in h5object.nodes.recursive:
+            path = str(node.link.path)
+            # the iterator descends into soft and external links
+            if any(path.startswith(lpath + "/") for lpath in linked):
+                continue
+            if str(node.link.type()) != "HARD":
+                linked.append(path)
+                continue
+            if not hasattr(node, "has_dataset") \
+               or not node.has_dataset("postrun") \
+               or not node.attributes.exists("NX_class"):
+                continue
+            gtype = node.attributes["NX_class"].read()
+            if isinstance(gtype, bytes):
+                gtype = _tostr(gtype)
+            if gtype == 'NXcollection':
+                paths.append(path)
+        return paths
+
+    def _inspect(self, parent, fields, collection=False):
+        """ finds recursively the all output fields defined
         by hdf5 postrun fields bellow hdf5 parent node
 
         :param parent: hdf5 parent node
         :type parent: :class:`filewriter.FTGroup` or \
                       :class:`filewriter.FTLink`
+        :param fields: a list to append output field parameters to
+        :type fields: :obj:`list` <:obj:`tuple`>
         :param collection: if parent is of NXcollection type
         :type collection: :obj:`bool`
         """
         if hasattr(parent, "names"):
             if collection:
                 if "postrun" in parent.names():
-                    inputfiles = parent.open("postrun")
-                    files = inputfiles[...]
-                    if isinstance(files, (str, unicode)):
-                        files = [files]
-                    fieldname = "data"
-                    fielddtype = None
-                    fieldshape = None
-                    fieldattrs = {}
-                    fieldcompression = None
-                    for at in inputfiles.attributes:
-                        if at.name == "fieldname":
-                            fieldname = at[...]
-                        elif at.name == "fieldcompression":
-                            fieldcompression = at[...]
-                        elif at.name == "fielddtype":
-                            fielddtype = at[...]
-                        elif at.name == "fieldshape":
-                            fieldshape = json.loads(at[...])
-                        elif at.name.startswith("fieldattr_"):
-                            atname = at.name[10:]
-                            if atname:
-                                fieldattrs[atname] = (
-                                    at[...], at.dtype, at.shape
-                                )
-
-                    print("populate: %s/%s with %s" % (
-                        parent.parent.path, fieldname, files))
-                    if fieldcompression is None:
-                        fieldcompression = self.__compression
-                    self._collectimages(
-                        files, parent.parent, fieldname, fieldattrs,
-                        fieldcompression, fielddtype, fieldshape)
+                    fields.append(self._postrunfield(parent))
             try:
                 names = parent.names()
             except Exception:
@@ -665,12 +2835,12 @@ class Collector(object):
                 coll = False
                 child = parent.open(name)
                 if hasattr(child, "attributes"):
-                    for at in child.attributes:
-                        if at.name == "NX_class":
-                            gtype = at[...]
-                            if gtype == 'NXcollection':
-                                coll = True
-                    self._inspect(child, coll)
+                    attrs = child.attributes
+                    if "NX_class" in attrs.names():
+                        gtype = attrs.read_all(["NX_class"])["NX_class"]
+                        if gtype == 'NXcollection':
+                            coll = True
+                    self._inspect(child, fields, coll)
 
     def _add(self, root, path, inputfiles, fieldtype=None, fieldshape=None):
         """appends specific data if path and inputfiles are given
@@ -697,6 +2867,7 @@ class Collector(object):
                     if not tgr:
                         tgr = "NX" + gr
                     if not self.__testmode:
+                        self._journalcreate(parent, gr)
                         parent = parent.create_group(gr, tgr)
                     else:
                         parent = None
@@ -731,13 +2902,64 @@ class Collector(object):
         :type datatype: :obj:`str`
         :param shape: field shape
         :type shape: :obj:`list` <:obj:`int` >
+        :returns: if images were collected without errors
+        :rtype: :obj:`bool`
         """
+        status = True
+        start = time.time()
+        if self.__withstats:
+            self.__stats = Stats(
+                self.__nexusfilename,
+                getattr(self._writer(), "__name__", "").split(".")[-1])
+            size = os.path.getsize(self.__nexusfilename)
+        status, state = self._collectmaster(
+            path, inputfiles, datatype, shape)
+        # postrun ranges of a running scan grow in the master file,
+        # so new input files are appended until it is not modified
+        # any more within the follow mode timeout
+        while self.__follow and not self.__testmode and status \
+                and self._waitformaster(state):
+            status, state = self._collectmaster(
+                path, inputfiles, datatype, shape)
+        if self.__stats is not None:
+            self.__stats.bytesout = max(
+                os.path.getsize(self.__nexusfilename) - size, 0)
+            self.__stats.duration = time.time() - start
+        return status
+
+    def _collectmaster(self, path, inputfiles, datatype, shape):
+        """ collects images of the master file in its temporary copy
+        or in place
+
+        :param path: nexus path of the data field
+        :type path: :obj:`str`
+        :param inputfiles: a list of file strings
+        :type inputfiles: :obj:`list` <:obj:`str`>
+        :param datatype: field data type
+        :type datatype: :obj:`str`
+        :param shape: field shape
+        :type shape: :obj:`list` <:obj:`int` >
+        :returns: (if images were collected without errors,
+                  state of the master file with the collected images)
+        :rtype: (:obj:`bool`, (:obj:`int`, :obj:`float`, :obj:`int`))
+        """
+        status = True
+        state = self._masterstate()
         self._createtmpfile()
+        journal = Journal(self.__nexusfilename + ".__nxscollect_journal__")
+        if self.__tempfilename is None:
+            self.__journal = journal
         try:
             self.__nxsfile = filewriter.open_file(
-                self.__tempfilename, readonly=self.__testmode,
+                self.__tempfilename or self.__nexusfilename,
+                readonly=self.__testmode,
                 writer=self.__wrmodule)
             root = self.__nxsfile.root()
+            if not self.__testmode and journal.changed:
+                # changes of an interrupted in place run
+                journal.rollback(root)
+                if self.__journal is not None:
+                    journal.save()
             try:
                 self.__fullfilename = root.attributes['file_name'][...]
                 # print self.__fullfilename
@@ -746,14 +2968,55 @@ class Collector(object):
             if path and inputfiles:
                 self._add(root, path, inputfiles, datatype, shape)
             else:
-                self._inspect(root)
+                # the native walk does not open every node
+                # via the writer objects
+                paths = self._postrunpaths(root)
+                fields = []
+                if paths is None:
+                    self._inspect(root, fields)
+                for gpath in paths or []:
+                    fields.append(
+                        self._postrunfield(Journal._open(root, gpath)))
+                self._collectfields(fields)
+            self._trimh5files(0)
             self.__nxsfile.close()
-            if self.__storeold:
-                self._storeoldfile()
-            shutil.move(self.__tempfilename, self.__nexusfilename)
+            if self.__tempfilename is not None:
+                # changes of the master file made by other processes
+                # are not overwritten by its older copy
+                if self._masterstate() != state:
+                    if not self.__follow:
+                        raise Exception(
+                            "Error: %s has been modified during collecting"
+                            % self.__nexusfilename)
+                    # the next pass collects the modified master file
+                    print("%s has been modified during collecting"
+                          % self.__nexusfilename)
+                    os.remove(self.__tempfilename)
+                else:
+                    if self.__storeold:
+                        self._storeoldfile()
+                    shutil.move(self.__tempfilename, self.__nexusfilename)
+                    state = self._masterstate()
+            elif not self.__testmode:
+                state = self._masterstate()
+            if not self.__testmode:
+                journal.remove()
         except Exception as e:
             print(str(e))
-            os.remove(self.__tempfilename)
+            status = False
+            self._trimh5files(0)
+            if self.__tempfilename is not None:
+                os.remove(self.__tempfilename)
+            else:
+                try:
+                    journal.rollback(self.__nxsfile.root())
+                    self.__nxsfile.close()
+                    journal.remove()
+                except Exception as e:
+                    # the journal is rolled back by the next run
+                    print(str(e))
+        self.__journal = None
+        return status, state
 
 
 class Link(Runner):
@@ -880,7 +3143,9 @@ class Execute(Runner):
             action="store", type=str, default="2",
             help="deflate compression rate from 0 to 9 (default: 2)"
             " or <filterid>:opt1,opt2,..."
-            " e.g.  -c 32008:0,2  for bitshuffle with lz4")
+            " e.g.  -c 32008:0,2  for bitshuffle with lz4"
+            " or a preset of filter plugins: %s" %
+            ", ".join(sorted(COMPRESSIONS.keys())))
         parser.add_argument(
             "-p", "--path", dest="path",
             action="store", type=str, default=None,
@@ -910,6 +3175,134 @@ class Execute(Runner):
             "-s", "--skip_missing", action="store_true",
             default=False, dest="skipmissing",
             help="skip missing files")
+        parser.add_argument(
+            "--missing_frames", action="store_true",
+            default=False, dest="missingframes",
+            help="skip missing files, report them in one line per field"
+            " and store frame indices of missing files"
+            " in '<field>_missing_frames' fields")
+        parser.add_argument(
+            "--fill_value", dest="fillvalue",
+            action="store", type=float, default=None,
+            help="store frames filled with the value in place of missing"
+            " files to keep frame indices, implies --missing_frames")
+        parser.add_argument(
+            "-w", "--workers", dest="workers",
+            action="store", type=int, default=1,
+            help="number of threads decoding input images in parallel"
+            " (default: 1)")
+        parser.add_argument(
+            "--concurrent_fields", dest="concurrentfields",
+            action="store", type=int, default=1,
+            help="number of output fields of a master file, e.g. images"
+            " of different detectors, collected concurrently (default: 1)")
+        parser.add_argument(
+            "--processes", dest="processes",
+            action="store", type=int, default=1,
+            help="number of processes collecting master files in parallel"
+            " (default: 1)")
+        parser.add_argument(
+            "--batch_size", dest="batchsize",
+            action="store", type=int, default=1,
+            help="number of images appended to the field at once"
+            " (default: 1)")
+        parser.add_argument(
+            "--flush_frames", dest="flushframes",
+            action="store", type=int, default=1,
+            help="number of appended images between flushes of"
+            " the master file, 0 for no flushes (default: 1)")
+        parser.add_argument(
+            "--flush_time", dest="flushtime",
+            action="store", type=float, default=None,
+            help="time in seconds between flushes of the master file,"
+            " e.g. 5.0")
+        parser.add_argument(
+            "--mmap", action="store_true",
+            default=False, dest="mmap",
+            help="map raw input data files into memory instead of"
+            " reading them")
+        parser.add_argument(
+            "--direct_chunk", action="store_true",
+            default=False, dest="directchunk",
+            help="write raw input data directly as chunks of"
+            " uncompressed output fields")
+        parser.add_argument(
+            "--no_chunk_copy", action="store_false",
+            default=True, dest="chunkcopy",
+            help="decode hdf5 input data even if its chunks could be"
+            " copied into the output field")
+        parser.add_argument(
+            "--virtual", action="store_true",
+            default=False, dest="virtual",
+            help="create virtual fields mapping hdf5 input data"
+            " instead of copying it")
+        parser.add_argument(
+            "--in_place", action="store_true",
+            default=False, dest="inplace",
+            help="modify the master file in place and roll back changes"
+            " on failure if the file cannot be cloned and"
+            " -r/--replace_nexus_file is set")
+        parser.add_argument(
+            "--resume", action="store_true",
+            default=False, dest="resume",
+            help="record progress in output fields and skip input files"
+            " collected by previous runs")
+        parser.add_argument(
+            "--follow", action="store_true",
+            default=False, dest="follow",
+            help="collect input files during the acquisition, i.e."
+            " wait for input files which do not exist yet and append"
+            " input files of postrun ranges growing in the master file"
+            " until it is not modified within the timeout. It implies"
+            " --resume")
+        parser.add_argument(
+            "--timeout", dest="timeout",
+            action="store", type=float, default=60.,
+            help="time in seconds to wait for a next input file"
+            " or a change of the master file in the follow mode"
+            " (default: 60)")
+        parser.add_argument(
+            "--poll_interval", dest="pollinterval",
+            action="store", type=float, default=1.,
+            help="time in seconds between checks of input files"
+            " in the follow mode (default: 1)")
+        parser.add_argument(
+            "--file_cache", dest="filecache",
+            action="store", type=int, default=16,
+            help="number of hdf5 input files kept open between frames"
+            " (default: 16)")
+        parser.add_argument(
+            "--max_memory", dest="maxmemory",
+            action="store", type=float, default=None,
+            help="memory budget for loaded image data in MiB, e.g. 1024;"
+            " larger 3D hdf5 input fields are appended in blocks of frames"
+            " (default: no limit)")
+        parser.add_argument(
+            "--prefetch", dest="prefetch",
+            action="store", type=int, default=0,
+            help="number of next input files read into the page cache"
+            " in advance, e.g. 8 for network filesystems (default: 0)")
+        parser.add_argument(
+            "--chunk_size", dest="chunksize",
+            action="store", type=float, default=None,
+            help="target chunk size of output fields in MiB, e.g. 2;"
+            " frames of small images are merged and large images are tiled"
+            " (default: one frame per chunk)")
+        parser.add_argument(
+            "--presize", action="store_true",
+            default=False, dest="presize",
+            help="create output fields with the final size if it is known"
+            " from the input file patterns")
+        parser.add_argument(
+            "--stats", action="store_true",
+            default=False, dest="stats",
+            help="print timings, data sizes and frame rates"
+            " of collecting stages")
+        parser.add_argument(
+            "--stats_file", dest="statsfile",
+            action="store", type=str, default=None,
+            help="JSON file to store timings and data sizes of collecting"
+            " stages and image files")
         parser.add_argument(
             "-r", "--replace_nexus_file", action="store_true",
             default=False, dest="replaceold",
@@ -938,7 +3331,8 @@ class Execute(Runner):
         parser = self._parser
         parser.add_argument('args', metavar='nexus_file',
                             type=str, nargs='*',
-                            help='nexus files to be collected')
+                            help='nexus files, directories or glob'
+                            ' patterns of nexus files to be collected')
 
     def run(self, options):
         """ the main program function
@@ -1008,13 +3402,84 @@ class Execute(Runner):
                 parser.print_help()
                 sys.exit(255)
 
-        # configuration server
-        for nxsfile in nexusfiles:
-            collector = Collector(
-                nxsfile, options.compression, options.skipmissing,
-                not options.replaceold, options.testmode, writer=writer)
-            collector.collect(options.path, inputfiles,
-                              options.datatype, shape)
+        pars = {
+            "compression": options.compression,
+            "skipmissing": options.skipmissing,
+            "storeold": not options.replaceold,
+            "testmode": options.testmode,
+            "writer": writer,
+            "stats": bool(options.stats or options.statsfile),
+            "readoptions": ReadOptions(
+                workers=options.workers,
+                mmap=options.mmap,
+                chunkcopy=options.chunkcopy,
+                filecache=options.filecache,
+                maxmemory=(int(options.maxmemory * 1024 * 1024)
+                           if options.maxmemory else None),
+                prefetch=options.prefetch),
+            "writeoptions": WriteOptions(
+                batchsize=options.batchsize,
+                flushframes=options.flushframes,
+                flushtime=options.flushtime,
+                presize=options.presize,
+                directchunk=options.directchunk,
+                virtual=options.virtual,
+                chunksize=(int(options.chunksize * 1024 * 1024)
+                           if options.chunksize else None),
+                concurrentfields=options.concurrentfields),
+            "followoptions": FollowOptions(
+                follow=options.follow,
+                timeout=options.timeout,
+                pollinterval=options.pollinterval),
+            "recoveryoptions": RecoveryOptions(
+                inplace=options.inplace,
+                resume=options.resume,
+                missingframes=options.missingframes,
+                fillvalue=options.fillvalue),
+        }
+        nexusfiles = masterfiles(nexusfiles)
+        tasks = [(nxsfile, pars, options.path, inputfiles,
+                  options.datatype, shape) for nxsfile in nexusfiles]
+        failed = []
+        allstats = []
+        if options.processes > 1 and len(tasks) > 1:
+            # each master file is collected in a separate process
+            # and its output is printed when it is finished
+            pool = multiprocessing.Pool(
+                min(options.processes, len(tasks)))
+            try:
+                for nxsfile, status, output, stats in pool.imap(
+                        _collectfile, tasks):
+                    sys.stdout.write(output)
+                    sys.stdout.flush()
+                    if not status:
+                        failed.append(nxsfile)
+                    if stats is not None:
+                        allstats.append(stats)
+                        if options.stats:
+                            print(Stats.report(stats))
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            for task in tasks:
+                nxsfile, pars, path, inputfiles, datatype, shape = task
+                collector = Collector(nxsfile, **pars)
+                if not collector.collect(path, inputfiles, datatype, shape):
+                    failed.append(nxsfile)
+                stats = collector.stats
+                if stats is not None:
+                    allstats.append(stats)
+                    if options.stats:
+                        print(Stats.report(stats))
+        if len(tasks) > 1:
+            print("summary: %s of %s master files collected" % (
+                len(tasks) - len(failed), len(tasks)))
+            for nxsfile in failed:
+                print(" * failed %s " % nxsfile)
+        if options.statsfile:
+            with open(options.statsfile, "w") as fl:
+                json.dump(allstats, fl, indent=2)
 
 
 def _supportoldcommands():
@@ -112,7 +112,7 @@ class General(Runner):
         wrmodule = WRITERS[writer.lower()]
         try:
             fl = filewriter.open_file(
-                options.args[0], readonly=True,
+                options.args[0], readonly=True, views=True,
                 writer=wrmodule)
         except Exception:
             sys.stderr.write("nxsfileinfo: File '%s' cannot be opened\n"
@@ -168,7 +168,8 @@ class General(Runner):
                     "nxsfileinfo: experiment identifier cannot be found\n")
                 sys.stderr.flush()
             for ins in entry:
-                if isinstance(ins, filewriter.FTGroup):
+                if isinstance(
+                        ins, (filewriter.FTGroup, filewriter.FTGroupView)):
                     iat = ins.attributes["NX_class"]
                     if iat and iat[...] == 'NXinstrument':
                         try:
@@ -195,7 +196,9 @@ class General(Runner):
                             sys.stderr.flush()
 
                         for sr in ins:
-                            if isinstance(sr, filewriter.FTGroup):
+                            if isinstance(
+                                    sr, (filewriter.FTGroup,
+                                         filewriter.FTGroupView)):
                                 sat = sr.attributes["NX_class"]
                                 if sat and sat[...] == 'NXsource':
                                     try:
@@ -391,7 +394,7 @@ class Field(Runner):
         wrmodule = WRITERS[writer.lower()]
         try:
             fl = filewriter.open_file(
-                options.args[0], readonly=True,
+                options.args[0], readonly=True, views=True,
                 writer=wrmodule)
         except Exception:
             sys.stderr.write("nxsfileinfo: File '%s' cannot be opened\n"
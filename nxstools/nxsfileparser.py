@@ -175,10 +175,12 @@ class NXSFileParser(object):
             desc["shape"] = [int(n) for n in (node.shape or [])]
         if hasattr(node, "attributes"):
             attrs = node.attributes
-            anames = [at.name for at in attrs]
+            anames = set(attrs.names())
+            avalues = attrs.read_all(list(set(
+                vl[0] for vl in self.attrdesc.values() if vl[0] in anames)))
             for key, vl in self.attrdesc.items():
-                if vl[0] in anames:
-                    desc[key] = vl[1](filewriter.first(attrs[vl[0]][...]))
+                if vl[0] in avalues:
+                    desc[key] = vl[1](filewriter.first(avalues[vl[0]]))
         if node.name in self.valuestostore and node.is_valid:
             vl = node[...]
             while (not isinstance(vl, str) and
@@ -210,7 +212,7 @@ class NXSFileParser(object):
         """
         self.__addnode(node, tgpath)
         names = []
-        if isinstance(node, filewriter.FTGroup):
+        if isinstance(node, (filewriter.FTGroup, filewriter.FTGroupView)):
             names = [
                 (ch.name,
                  str(ch.target_path) if hasattr(ch, "target_path") else None)
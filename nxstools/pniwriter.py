@@ -58,6 +58,15 @@ def is_vds_supported():
     return False
 
 
+def is_direct_chunk_supported():
+    """ provides if direct chunk writing is supported
+
+    :retruns: if direct chunk writing is supported
+    :rtype: :obj:`bool`
+    """
+    return False
+
+
 def load_file(membuffer, filename=None, readonly=False, **pars):
     """ load a file from memory byte buffer
 
@@ -259,15 +268,19 @@ class PNIGroup(filewriter.FTGroup):
         """
 
         filewriter.FTGroup.__init__(self, h5object, tparent)
-        #: (:obj:`str`) object nexus path
-        self.path = None
         #: (:obj:`str`) object name
         self.name = None
-        if hasattr(h5object, "path"):
-            self.path = h5object.path
         if hasattr(h5object, "name"):
             self.name = h5object.name
 
+    def _nexuspath(self):
+        """ resolve the nexus path from the pni object
+
+        :returns: object nexus path
+        :rtype: :obj:`str`
+        """
+        return getattr(self._h5object, "path", None)
+
     def open(self, name):
         """ open a file tree element
 
@@ -401,6 +414,14 @@ s
         """
         return self._h5object.exists(name)
 
+    def remove(self, name):
+        """ remove a child
+
+        :param name: child name
+        :type name: :obj:`str`
+        """
+        self._h5object.remove(name)
+
     def names(self):
         """ read the child names
 
@@ -474,15 +495,19 @@ class PNIField(filewriter.FTField):
         :type tparent: :obj:`FTObject`
         """
         filewriter.FTField.__init__(self, h5object, tparent)
-        #: (:obj:`str`) object nexus path
-        self.path = None
         #: (:obj:`str`) object name
         self.name = None
-        if hasattr(h5object, "path"):
-            self.path = h5object.path
         if hasattr(h5object, "name"):
             self.name = h5object.name
 
+    def _nexuspath(self):
+        """ resolve the nexus path from the pni object
+
+        :returns: object nexus path
+        :rtype: :obj:`str`
+        """
+        return getattr(self._h5object, "path", None)
+
     @property
     def attributes(self):
         """ return the attribute manager
@@ -568,6 +593,29 @@ class PNIField(filewriter.FTField):
         """
         return self._h5object.__getitem__(t)
 
+    def write_direct_chunk(self, data, offset, filtermask=0):
+        """ write a raw chunk bypassing the filter pipeline
+
+        :param data: raw chunk data
+        :type data: :obj:`bytes` or :class:`numpy.ndarray`
+        :param offset: logical position of the chunk in the field
+        :type offset: :obj:`list` < :obj:`int` >
+        :param filtermask: mask of filters which have not been applied
+        :type filtermask: :obj:`int`
+        """
+        raise Exception("Direct chunk writing not supported")
+
+    def read_direct_chunk(self, offset):
+        """ read a raw chunk bypassing the filter pipeline
+
+        :param offset: logical position of the chunk in the field
+        :type offset: :obj:`list` < :obj:`int` >
+        :returns: (mask of filters which have not been applied,
+                   raw chunk data)
+        :rtype: (:obj:`int`, :obj:`bytes`)
+        """
+        raise Exception("Direct chunk reading not supported")
+
     @property
     def is_valid(self):
         """ check if field is valid
@@ -604,6 +652,25 @@ class PNIField(filewriter.FTField):
         """
         return self._h5object.size
 
+    @property
+    def chunk(self):
+        """ field chunk shape
+
+        :returns: field chunk shape or None for contiguous fields
+        :rtype: :obj:`list` < :obj:`int` >
+        """
+        return None
+
+    @property
+    def filters(self):
+        """ field filter pipeline
+
+        :returns: a list of (filter id, filter options) or None
+                  if the pipeline cannot be inspected
+        :rtype: :obj:`list` < (:obj:`int`, :obj:`tuple` <:obj:`int`>) >
+        """
+        return None
+
 
 class PNILink(filewriter.FTLink):
 
@@ -619,15 +686,19 @@ class PNILink(filewriter.FTLink):
         :type tparent: :obj:`FTObject`
         """
         filewriter.FTLink.__init__(self, h5object, tparent)
-        #: (:obj:`str`) object nexus path
-        self.path = None
         #: (:obj:`str`) object name
         self.name = None
-        if hasattr(h5object, "path"):
-            self.path = h5object.path
         if hasattr(h5object, "name"):
             self.name = h5object.name
 
+    def _nexuspath(self):
+        """ resolve the nexus path from the pni object
+
+        :returns: object nexus path
+        :rtype: :obj:`str`
+        """
+        return getattr(self._h5object, "path", None)
+
     @property
     def is_valid(self):
         """ check if link is valid
@@ -781,6 +852,39 @@ class PNIAttributeManager(filewriter.FTAttributeManager):
         """
         return [att.name for att in self._h5object]
 
+    def remove(self, name):
+        """ remove the attribute
+
+        :param name: attribute name
+        :type name: :obj:`str`
+        """
+        self._h5object.remove(name)
+
+    def read_all(self, names=None):
+        """ reads values of many attributes at once
+
+        :param names: attribute names, all attributes if None
+        :type names: :obj:`list` <:obj:`str`>
+        :returns: dictionary with attribute values
+        :rtype: :obj:`dict` <:obj:`str`, `any`>
+        """
+        if names is None:
+            attrs = list(self._h5object)
+        else:
+            attrs = [self._h5object[name] for name in names]
+        return dict((at.name, at[...]) for at in attrs)
+
+    def write_many(self, attributes):
+        """ creates or overwrites many attributes at once,
+        data types and shapes are taken from the values
+
+        :param attributes: dictionary with attribute values
+        :type attributes: :obj:`dict` <:obj:`str`, `any`>
+        """
+        for name, value in attributes.items():
+            dtype, shape = self._valuetype(value)
+            self._h5object.create(name, dtype, shape, True)[...] = value
+
 
 class PNIAttribute(filewriter.FTAttribute):
 
@@ -796,15 +900,19 @@ class PNIAttribute(filewriter.FTAttribute):
         :type tparent: :obj:`FTObject`
         """
         filewriter.FTAttribute.__init__(self, h5object, tparent)
-        #: (:obj:`str`) object nexus path
-        self.path = None
         #: (:obj:`str`) object name
         self.name = None
-        if hasattr(h5object, "path"):
-            self.path = h5object.path
         if hasattr(h5object, "name"):
             self.name = h5object.name
 
+    def _nexuspath(self):
+        """ resolve the nexus path from the pni object
+
+        :returns: object nexus path
+        :rtype: :obj:`str`
+        """
+        return getattr(self._h5object, "path", None)
+
     def close(self):
         """ close attribute
         """
@@ -850,6 +850,113 @@ class FileWriterH5CppTest(unittest.TestCase):
         finally:
             os.remove(self._fname)
 
+    def test_h5cppfile_views(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+        self._fname = '%s/%s%s.h5' % (
+            os.getcwd(), self.__class__.__name__, fun)
+
+        try:
+            FileWriter.writer = H5CppWriter
+            fl = FileWriter.create_file(self._fname)
+            rt = fl.root()
+            entry = rt.create_group("entry12345", "NXentry")
+            ins = entry.create_group("instrument", "NXinstrument")
+            det = ins.create_group("detector", "NXdetector")
+            data = det.create_field("data", "uint32", [2, 3], [1, 3])
+            data[...] = [[1, 2, 3], [4, 5, 6]]
+            data.attributes.create("units", "string").write("counts")
+            entry.create_field("title", "string").write("my title")
+            H5CppWriter.link(
+                "/entry12345/instrument/detector/data", entry, "data")
+            fl.close()
+
+            fl = FileWriter.open_file(self._fname, readonly=True)
+            wpaths = []
+            self._walk(fl.root(), wpaths)
+            fl.close()
+
+            fl = FileWriter.open_file(
+                self._fname, readonly=True, views=True)
+            self.assertTrue(isinstance(fl, H5CppWriter.H5CppFileView))
+            self.assertTrue(isinstance(fl, FileWriter.FTFileView))
+            self.assertEqual(fl.writer, H5CppWriter)
+            self.assertEqual(fl.readonly, True)
+            self.assertEqual(fl.is_valid, True)
+            self.assertEqual(fl.name, self._fname)
+            rt = fl.root()
+            self.assertTrue(isinstance(rt, H5CppWriter.H5CppGroupView))
+            self.assertEqual(rt.parent, fl)
+            self.assertEqual(rt.path, "/")
+            self.assertEqual(
+                rt.attributes["file_name"][...], self._fname)
+            vpaths = []
+            self._walk(rt, vpaths)
+            self.assertEqual(vpaths, wpaths)
+
+            entry = rt.open("entry12345")
+            self.assertTrue(isinstance(entry, FileWriter.FTGroupView))
+            self.assertTrue(not hasattr(entry, "__dict__"))
+            self.assertEqual(
+                sorted(entry.names()), ["data", "instrument", "title"])
+            self.assertEqual(entry.exists("title"), True)
+            self.assertEqual(entry.exists("notitle"), False)
+            self.assertEqual(entry.size, 3)
+            self.assertEqual(entry.open("title").read(), "my title")
+            data = entry.open("instrument").open("detector").open("data")
+            self.assertTrue(isinstance(data, H5CppWriter.H5CppFieldView))
+            self.assertTrue(not hasattr(data, "__dict__"))
+            self.assertEqual(
+                data.path,
+                "/entry12345:NXentry/instrument:NXinstrument"
+                "/detector:NXdetector/data")
+            self.assertEqual(data.dtype, "uint32")
+            self.assertEqual(list(data.shape), [2, 3])
+            self.assertEqual(data.chunk, [1, 3])
+            self.assertEqual(data[1, 2], 6)
+            self.assertEqual(
+                [list(row) for row in data.read()], [[1, 2, 3], [4, 5, 6]])
+            self.assertEqual(data.attributes["units"][...], "counts")
+            self.assertEqual(data.is_valid, True)
+            self.assertEqual(data.size, 6)
+            # names, attributes and field data are read
+            # without full objects
+            self.assertEqual(entry._node, None)
+            self.assertEqual(data._node, None)
+            det = entry.open("instrument").open("detector")
+            dview = det.open("data")
+            self.assertEqual(
+                sorted(dview.attributes.names()), ["units"])
+            self.assertEqual(dview.is_valid, True)
+            self.assertEqual(dview._node, None)
+            self.assertEqual(det._node, None)
+            self.assertEqual(
+                fl.default_field().path, "/entry12345:NXentry/data")
+            links = dict(
+                (lk.name, lk.target_path)
+                for lk in FileWriter.get_links(entry))
+            self.assertTrue(links["data"].endswith(
+                "%s://entry12345/instrument/detector/data" % self._fname))
+
+            self.myAssertRaise(Exception, fl.reopen)
+            self.myAssertRaise(Exception, entry.reopen)
+            self.myAssertRaise(Exception, data.reopen)
+            fl.close()
+            self.assertEqual(fl.is_valid, False)
+
+            # views are provided only for readonly files
+            fl = FileWriter.open_file(self._fname, views=True)
+            self.assertTrue(isinstance(fl, H5CppWriter.H5CppFile))
+            fl.close()
+        finally:
+            os.remove(self._fname)
+
+    def _walk(self, node, paths):
+        paths.append((node.name, node.path))
+        if hasattr(node, "names"):
+            for name in sorted(node.names()):
+                self._walk(node.open(name), paths)
+
     # default createfile test
     # \brief It tests default settings
     def test_h5cppgroup(self):
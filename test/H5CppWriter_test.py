@@ -28,6 +28,7 @@ import binascii
 import string
 import time
 import io
+import numpy as np
 
 import nxstools.filewriter as FileWriter
 import nxstools.h5cppwriter as H5CppWriter
@@ -2280,6 +2281,83 @@ class H5CppWriterTest(unittest.TestCase):
         finally:
             os.remove(self._fname)
 
+    def test_h5cppfield_selections(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+        self._fname = '%s/%s%s.h5' % (
+            os.getcwd(), self.__class__.__name__, fun)
+
+        try:
+            fl = H5CppWriter.create_file(self._fname)
+            rt = fl.root()
+            entry = rt.create_group("entry12345", "NXentry")
+            intspec = entry.create_field("intspec", "int64", [0], [10])
+            intimage = entry.create_field(
+                "intimage", "uint32", [0, 4], [1, 4])
+
+            vl = [[self.__rnd.randint(0, 1000) for _ in range(4)]
+                  for _ in range(20)]
+            H5CppWriter._SELECTIONS.clear()
+            for i in range(20):
+                intspec.grow()
+                self.assertEqual(intspec.shape, (i + 1,))
+                intspec[i] = vl[i][0]
+                intimage.grow()
+                self.assertEqual(intimage.shape, (i + 1, 4))
+                intimage[i, :] = vl[i]
+            # selections with single indices are cached once for all
+            # indices and sizes of the growing dimension
+            self.assertEqual(len(H5CppWriter._SELECTIONS), 2)
+            # mutable selections are not shared between calls
+            self.assertTrue(
+                H5CppWriter._slice2selection(
+                    (slice(0, 5), slice(None)), intimage.shape) is not
+                H5CppWriter._slice2selection(
+                    (slice(0, 5), slice(None)), intimage.shape))
+            self.assertEqual(len(H5CppWriter._SELECTIONS), 3)
+            size = H5CppWriter.SELECTIONCACHESIZE
+            try:
+                H5CppWriter.SELECTIONCACHESIZE = 3
+                for i in range(5):
+                    H5CppWriter._slice2selection(
+                        (slice(0, i + 1), slice(None)), intimage.shape)
+                self.assertEqual(len(H5CppWriter._SELECTIONS), 3)
+            finally:
+                H5CppWriter.SELECTIONCACHESIZE = size
+
+            # shapes are cached by every wrapper and updated by its grow(),
+            # i.e. a field grown via another object has to be refreshed
+            other = entry.open("intspec")
+            self.assertEqual(other.shape, (20,))
+            intspec.grow()
+            self.assertEqual(intspec.shape, (21,))
+            self.assertEqual(other.shape, (20,))
+            self.assertTrue(other.refresh())
+            self.assertEqual(other.shape, (21,))
+            other.h5object.extent(0, 1)
+            self.assertEqual(intspec.shape, (21,))
+            intspec.reopen()
+            self.assertEqual(intspec.shape, (22,))
+            intspec.grow(0, -2)
+            self.assertEqual(intspec.shape, (20,))
+
+            self.assertEqual(
+                list(intspec.read()), [row[0] for row in vl])
+            self.assertEqual(intspec[-1], vl[-1][0])
+            self.assertEqual(list(intspec[-3:]), [row[0] for row in vl[-3:]])
+            self.assertEqual(list(intimage[-1, :]), vl[-1])
+            # offsets of single indices are filled in cached selections
+            self.assertEqual(list(intimage[-2, :]), vl[-2])
+            self.assertEqual(list(intimage[2, :]), vl[2])
+            self.assertEqual(list(intimage[5, 1:3]), vl[5][1:3])
+            self.assertEqual(list(intimage[6, 1:3]), vl[6][1:3])
+            self.assertEqual(
+                [list(row) for row in intimage[...]], vl)
+            self.assertEqual(intimage.dtype, "uint32")
+            fl.close()
+        finally:
+            os.remove(self._fname)
+
     # default createfile test
     # \brief It tests default settings
     def test_h5cppdeflate(self):
@@ -3330,6 +3408,67 @@ class H5CppWriterTest(unittest.TestCase):
         finally:
             os.remove(self._fname)
 
+    def test_h5cppattributemanager_bulk(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+        self._fname = '%s/%s%s.h5' % (
+            os.getcwd(), self.__class__.__name__, fun)
+
+        try:
+            fl = H5CppWriter.create_file(self._fname)
+            rt = fl.root()
+            entry = rt.create_group("entry12345", "NXentry")
+            intscalar = entry.create_field("intscalar", "uint64")
+            values = {
+                "strscalar": "Something",
+                "intscalar": 12,
+                "floatscalar": 1.25,
+                "boolscalar": True,
+                "intspec": [1, 2, 3],
+                "floatspec": [1.5, -2.5],
+                "strspec": ["a", "bc", "def"],
+            }
+            dtypes = {
+                "strscalar": "string",
+                "intscalar": "int64",
+                "floatscalar": "float64",
+                "boolscalar": "bool",
+                "intspec": "int64",
+                "floatspec": "float64",
+                "strspec": "string",
+            }
+            for node in [entry, intscalar]:
+                node.attributes.write_many(values)
+                attrs = node.attributes
+                for name, value in values.items():
+                    self.assertEqual(attrs[name].dtype, dtypes[name])
+                    self.assertEqual(
+                        list(np.array(attrs[name][...]).flatten()),
+                        list(np.array(value).flatten()))
+                allvalues = attrs.read_all()
+                self.assertEqual(
+                    set(allvalues.keys()),
+                    set(attrs.names()))
+                for name in attrs.names():
+                    self.assertEqual(
+                        list(np.array(allvalues[name]).flatten()),
+                        list(np.array(attrs[name][...]).flatten()))
+                some = attrs.read_all(["intspec", "strscalar"])
+                self.assertEqual(sorted(some.keys()),
+                                 ["intspec", "strscalar"])
+                self.assertEqual(some["strscalar"], "Something")
+                self.assertEqual(list(some["intspec"]), [1, 2, 3])
+
+                # overwrite with other types and shapes
+                node.attributes.write_many(
+                    {"intscalar": "twelve", "strspec": [4.5, 5.5]})
+                some = node.attributes.read_all(["intscalar", "strspec"])
+                self.assertEqual(some["intscalar"], "twelve")
+                self.assertEqual(list(some["strspec"]), [4.5, 5.5])
+            fl.close()
+        finally:
+            os.remove(self._fname)
+
     # default createfile test
     # \brief It tests default settings
     def test_h5cppattribute_scalar(self):
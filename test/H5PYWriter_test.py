@@ -28,7 +28,9 @@ import binascii
 import string
 import h5py
 import time
+import gc
 import io
+import numpy as np
 
 import nxstools.filewriter as FileWriter
 import nxstools.h5pywriter as H5PYWriter
@@ -2892,6 +2894,161 @@ class H5PYWriterTest(unittest.TestCase):
         finally:
             os.remove(self._fname)
 
+    def test_h5pyattributemanager_bulk(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+        self._fname = '%s/%s%s.h5' % (
+            os.getcwd(), self.__class__.__name__, fun)
+
+        try:
+            fl = H5PYWriter.create_file(self._fname)
+            rt = fl.root()
+            entry = rt.create_group("entry12345", "NXentry")
+            intscalar = entry.create_field("intscalar", "uint64")
+            values = {
+                "strscalar": "Something",
+                "intscalar": 12,
+                "floatscalar": 1.25,
+                "boolscalar": True,
+                "intspec": [1, 2, 3],
+                "floatspec": [1.5, -2.5],
+                "strspec": ["a", "bc", "def"],
+            }
+            dtypes = {
+                "strscalar": "string",
+                "intscalar": "int64",
+                "floatscalar": "float64",
+                "boolscalar": "bool",
+                "intspec": "int64",
+                "floatspec": "float64",
+                "strspec": "string",
+            }
+            for node in [entry, intscalar]:
+                node.attributes.write_many(values)
+                attrs = node.attributes
+                for name, value in values.items():
+                    self.assertEqual(attrs[name].dtype, dtypes[name])
+                    self.assertEqual(
+                        list(np.array(attrs[name][...]).flatten()),
+                        list(np.array(value).flatten()))
+                allvalues = attrs.read_all()
+                self.assertEqual(
+                    set(allvalues.keys()),
+                    set(attrs.names()))
+                for name in attrs.names():
+                    self.assertEqual(
+                        list(np.array(allvalues[name]).flatten()),
+                        list(np.array(attrs[name][...]).flatten()))
+                some = attrs.read_all(["intspec", "strscalar"])
+                self.assertEqual(sorted(some.keys()),
+                                 ["intspec", "strscalar"])
+                self.assertEqual(some["strscalar"], "Something")
+                self.assertEqual(list(some["intspec"]), [1, 2, 3])
+
+                # overwrite with other types and shapes
+                node.attributes.write_many(
+                    {"intscalar": "twelve", "strspec": [4.5, 5.5]})
+                some = node.attributes.read_all(["intscalar", "strspec"])
+                self.assertEqual(some["intscalar"], "twelve")
+                self.assertEqual(list(some["strspec"]), [4.5, 5.5])
+            fl.close()
+        finally:
+            os.remove(self._fname)
+
+    def test_h5pygroup_lazypath(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+        self._fname = '%s/%s%s.h5' % (
+            os.getcwd(), self.__class__.__name__, fun)
+
+        try:
+            fl = H5PYWriter.create_file(self._fname)
+            rt = fl.root()
+            entry = rt.create_group("entry12345", "NXentry")
+            entry.create_group("instrument", "NXinstrument")
+            entry.create_field("intscalar", "uint64")
+            entry.create_group("notype")
+
+            ins = entry.open("instrument")
+            self.assertEqual(ins._path, None)
+            self.assertEqual(
+                ins.path, "/entry12345:NXentry/instrument:NXinstrument")
+            self.assertEqual(
+                ins._path, "/entry12345:NXentry/instrument:NXinstrument")
+            field = entry.open("intscalar")
+            self.assertEqual(field._path, None)
+            self.assertEqual(field.path, "/entry12345:NXentry/intscalar")
+            attr = ins.attributes["NX_class"]
+            self.assertEqual(attr._path, None)
+            self.assertEqual(
+                attr.path,
+                "/entry12345:NXentry/instrument:NXinstrument@NX_class")
+
+            # NX_class written after opening is resolved on first access
+            nt = entry.open("notype")
+            nt.attributes.create("NX_class", "string").write("NXcollection")
+            self.assertEqual(
+                nt.path, "/entry12345:NXentry/notype:NXcollection")
+
+            lk = H5PYWriter.link(
+                "/entry12345/instrument", entry, "ilink")
+            self.assertEqual(lk.path, "/entry12345:NXentry/ilink")
+
+            nt.path = "/entry/other"
+            self.assertEqual(nt.path, "/entry/other")
+
+            # paths stay unresolved on closing and NX_class of created
+            # groups is not read from their attributes
+            grp = entry.create_group("closed", "NXcollection")
+            fld = grp.create_field("closedfield", "uint64")
+            self.assertEqual(grp._nxclass, "NXcollection")
+            self.assertEqual(grp._path, None)
+            self.assertEqual(fld._path, None)
+            fl.close()
+            self.assertEqual(grp.h5object, None)
+            self.assertEqual(fld.h5object, None)
+            self.assertEqual(grp._path, None)
+            self.assertEqual(fld._path, None)
+            self.assertEqual(
+                grp.path, "/entry12345:NXentry/closed:NXcollection")
+            self.assertEqual(
+                fld.path,
+                "/entry12345:NXentry/closed:NXcollection/closedfield")
+            self.assertEqual(
+                ins.path, "/entry12345:NXentry/instrument:NXinstrument")
+        finally:
+            os.remove(self._fname)
+
+    def test_h5pygroup_children(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+        self._fname = '%s/%s%s.h5' % (
+            os.getcwd(), self.__class__.__name__, fun)
+
+        try:
+            fl = H5PYWriter.create_file(self._fname)
+            rt = fl.root()
+            entry = rt.create_group("entry12345", "NXentry")
+            for i in range(10):
+                entry.create_field("field_%02d" % i, "uint64")
+            fields = [entry.open("field_%02d" % i) for i in range(10)]
+            # created fields are dropped already
+            self.assertEqual(len(entry._FTObject__tchildren), 10)
+            del fields[5:]
+            gc.collect()
+            self.assertEqual(len(entry._FTObject__tchildren), 5)
+            for fd in fields:
+                self.assertTrue(fd.is_valid)
+            fl.close()
+            for fd in fields:
+                self.assertTrue(not fd.is_valid)
+            fl.reopen()
+            for fd in fields:
+                self.assertTrue(fd.is_valid)
+            fl.close()
+        finally:
+            os.remove(self._fname)
+
     # default createfile test
     # \brief It tests default settings
     def test_h5pyattribute_scalar(self):
@@ -4115,6 +4272,58 @@ class H5PYWriterTest(unittest.TestCase):
             os.remove(fname3)
             os.remove(self._fname)
 
+    def test_h5pyfield_write_direct_chunk(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+        if not H5PYWriter.is_direct_chunk_supported():
+            print("Skip the test")
+            return
+        self._fname = '%s/%s%s.h5' % (
+            os.getcwd(), self.__class__.__name__, fun)
+
+        try:
+            vl = [[[self.__rnd.randint(1, 1600) for _ in range(20)]
+                   for _ in range(10)]
+                  for _ in range(3)]
+
+            fl = H5PYWriter.create_file(self._fname, overwrite=True)
+            rt = fl.root()
+            entry = rt.create_group("entry1", "NXentry")
+            dt = entry.create_group("data", "NXdata")
+            intimage = dt.create_field(
+                "data", "uint32", [0, 10, 20], [1, 10, 20])
+            for i in range(3):
+                intimage.grow()
+                intimage.write_direct_chunk(
+                    struct.pack("<200I", *sum(vl[i], [])), [i, 0, 0])
+            deflate = H5PYWriter.data_filter()
+            deflate.rate = 0
+            defimage = dt.create_field(
+                "defdata", "uint32", [3, 10, 20], [1, 10, 20], deflate)
+            for i in range(3):
+                defimage.write_direct_chunk(
+                    struct.pack("<200I", *sum(vl[i], [])), [i, 0, 0], 1)
+            rw = intimage.read()
+            drw = defimage.read()
+            for i in range(3):
+                self.myAssertImage(rw[i], vl[i])
+                self.myAssertImage(drw[i], vl[i])
+            self.assertEqual(intimage.chunk, [1, 10, 20])
+            self.assertEqual(intimage.filters, [])
+            self.assertEqual(defimage.filters, [(1, (0,))])
+            for i in range(3):
+                self.assertEqual(
+                    intimage.read_direct_chunk([i, 0, 0]),
+                    (0, struct.pack("<200I", *sum(vl[i], []))))
+            intimage.close()
+            defimage.close()
+            dt.close()
+            entry.close()
+            fl.close()
+
+        finally:
+            os.remove(self._fname)
+
 
 if __name__ == '__main__':
     unittest.main()
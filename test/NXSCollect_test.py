@@ -29,7 +29,7 @@ import shutil
 import fabio
 import numpy as np
 # import time
-# import threading
+import threading
 # import PyTango
 import json
 from nxstools import nxscollect
@@ -1744,6 +1744,366 @@ For more help:
                 for i in range(6):
                     os.remove("rawtest1_%05d.dat" % i)
 
+    def test_append_file_withpostrun_raw_many(self):
+        """ test nxsconfig append file with postrun fields
+        in many NXcollection groups
+        """
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        filename = 'testcollect.nxs'
+        commands = [
+            ('nxscollect append  %s %s' % (filename, self.flags)).split(),
+            ('nxscollect -x %s -r %s' % (filename, self.flags)).split(),
+            ('nxscollect -x %s -r --prefetch 4 %s' %
+             (filename, self.flags)).split(),
+            ('nxscollect -x %s -r --prefetch 2 -w 2 %s' %
+             (filename, self.flags)).split(),
+            ('nxscollect -x %s -r --concurrent_fields 2 %s' %
+             (filename, self.flags)).split(),
+            ('nxscollect -x %s -r --concurrent_fields 4 -w 2 %s' %
+             (filename, self.flags)).split(),
+        ]
+        wrmodule = WRITERS[self.writer]
+        filewriter.writer = wrmodule
+        mlen = [self.__rnd.randint(10, 200),
+                self.__rnd.randint(10, 200)]
+        dets = ["pilatus1", "pilatus2"]
+        images = {}
+        for det in dets:
+            images[det] = np.array(
+                [[[self.__rnd.randint(0, 3000)
+                   for c in range(mlen[1])]
+                  for i in range(mlen[0])]
+                 for _ in range(6)],
+                dtype="uint32")
+        try:
+            for det in dets:
+                for i in range(6):
+                    with open("%s_%05d.dat" % (det, i), "w") as fl:
+                        images[det][i].tofile(fl)
+            for cmd in commands:
+                nxsfile = filewriter.create_file(
+                    filename, overwrite=True)
+                rt = nxsfile.root()
+                entry = rt.create_group("entry12345", "NXentry")
+                ins = entry.create_group("instrument", "NXinstrument")
+                for det in dets:
+                    dt = ins.create_group(det, "NXdetector")
+                    for i in range(20):
+                        log = dt.create_group("log%s" % i, "NXlog")
+                        log.create_field("value", "float64")
+                    dt.create_group("nopostrun", "NXcollection")
+                    col = dt.create_group("collection", "NXcollection")
+                    postrun = col.create_field("postrun", "string")
+                    postrun.write("%s_%%05d.dat:0:5" % det)
+                    atts = postrun.attributes
+                    atts.create("fielddtype", "string").write("uint32")
+                    atts.create("fieldshape", "string").write(
+                        json.dumps(mlen))
+                nxsfile.close()
+
+                old_stdout = sys.stdout
+                old_stderr = sys.stderr
+                sys.stdout = mystdout = StringIO()
+                sys.stderr = mystderr = StringIO()
+                old_argv = sys.argv
+                sys.argv = cmd
+                nxscollect.main()
+
+                sys.argv = old_argv
+                sys.stdout = old_stdout
+                sys.stderr = old_stderr
+                vl = mystdout.getvalue()
+                er = mystderr.getvalue()
+
+                self.assertEqual('', er)
+                svl = vl.split("\n")
+                self.assertEqual(len(svl), 15)
+                for k, det in enumerate(dets):
+                    if '--concurrent_fields' in cmd:
+                        # lines of fields collected concurrently interleave
+                        dvl = [ln for ln in svl if "%s_" % det in ln]
+                    else:
+                        dvl = svl[7 * k:7 * k + 7]
+                    self.assertEqual(len(dvl), 7)
+                    self.assertEqual(
+                        dvl[0],
+                        "populate: /entry12345:NXentry/"
+                        "instrument:NXinstrument/%s:NXdetector"
+                        "/data with ['%s_%%05d.dat:0:5']" % (det, det))
+                    for i in range(6):
+                        self.assertTrue(
+                            dvl[i + 1].startswith(' * append '))
+                        self.assertTrue(
+                            dvl[i + 1].endswith(
+                                '%s_%05d.dat ' % (det, i)))
+
+                if '-r' not in cmd:
+                    os.remove("%s.__nxscollect_old__" % filename)
+                nxsfile = filewriter.open_file(filename, readonly=True)
+                rt = nxsfile.root()
+                entry = rt.open("entry12345")
+                ins = entry.open("instrument")
+                for det in dets:
+                    dt = ins.open(det).open("data")
+                    buffer = dt.read()
+                    self.assertEqual(buffer.shape, images[det].shape)
+                    self.assertTrue((buffer == images[det]).all())
+                    self.assertTrue(
+                        "data" not in ins.open(det).open("nopostrun").names())
+                nxsfile.close()
+                os.remove(filename)
+
+        finally:
+            for det in dets:
+                for i in range(6):
+                    os.remove("%s_%05d.dat" % (det, i))
+
+    def _concurrentmaster(self, filename, dets, images):
+        """ creates a master file with a postrun field for every detector
+
+        :param filename: master file name
+        :type filename: :obj:`str`
+        :param dets: detector names
+        :type dets: :obj:`list` <:obj:`str`>
+        :param images: detector images
+        :type images: :obj:`dict` <:obj:`str`, :class:`numpy.ndarray`>
+        """
+        nxsfile = filewriter.create_file(filename, overwrite=True)
+        rt = nxsfile.root()
+        entry = rt.create_group("entry12345", "NXentry")
+        ins = entry.create_group("instrument", "NXinstrument")
+        for det in dets:
+            dt = ins.create_group(det, "NXdetector")
+            col = dt.create_group("collection", "NXcollection")
+            postrun = col.create_field("postrun", "string")
+            postrun.write(
+                "%s_%%05d.dat:0:%s" % (det, len(images[det]) - 1))
+            atts = postrun.attributes
+            atts.create("fielddtype", "string").write(
+                str(images[det].dtype))
+            atts.create("fieldshape", "string").write(
+                json.dumps(list(images[det].shape[1:])))
+        nxsfile.close()
+
+    def _runcollect(self, cmd):
+        """ runs nxscollect with the given command
+
+        :param cmd: command arguments
+        :type cmd: :obj:`list` <:obj:`str`>
+        :returns: (standard output, standard error)
+        :rtype: (:obj:`str`, :obj:`str`)
+        """
+        old_stdout = sys.stdout
+        old_stderr = sys.stderr
+        sys.stdout = mystdout = StringIO()
+        sys.stderr = mystderr = StringIO()
+        old_argv = sys.argv
+        sys.argv = cmd
+        try:
+            nxscollect.main()
+        finally:
+            sys.argv = old_argv
+            sys.stdout = old_stdout
+            sys.stderr = old_stderr
+        return mystdout.getvalue(), mystderr.getvalue()
+
+    def test_append_file_withpostrun_raw_concurrent(self):
+        """ test nxsconfig append file with fields collected concurrently
+        """
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        filename = 'testcollect.nxs'
+        commands = [
+            ('nxscollect append %s -r --concurrent_fields 3 %s' %
+             (filename, self.flags)).split(),
+            ('nxscollect append %s -r --concurrent_fields 2 -w 2 %s' %
+             (filename, self.flags)).split(),
+            ('nxscollect append %s -r --concurrent_fields 3 -w 2'
+             ' --batch_size 2 %s' % (filename, self.flags)).split(),
+            ('nxscollect append %s -r --in_place --concurrent_fields 3 %s' %
+             (filename, self.flags)).split(),
+        ]
+        wrmodule = WRITERS[self.writer]
+        filewriter.writer = wrmodule
+        dets = ["pilatus1", "pilatus2", "pilatus3"]
+        dtypes = ["uint32", "int16", "float32"]
+        nframes = [6, 4, 5]
+        images = {}
+        for k, det in enumerate(dets):
+            # frames differ from each other to detect their order
+            images[det] = np.array(
+                [[[self.__rnd.randint(0, 3000)
+                   for c in range(7 + k)]
+                  for i in range(9 - k)]
+                 for _ in range(nframes[k])],
+                dtype=dtypes[k])
+        try:
+            for det in dets:
+                for i, image in enumerate(images[det]):
+                    with open("%s_%05d.dat" % (det, i), "w") as fl:
+                        image.tofile(fl)
+            for cmd in commands:
+                self._concurrentmaster(filename, dets, images)
+                vl, er = self._runcollect(cmd)
+
+                self.assertEqual('', er)
+                svl = vl.split("\n")
+                self.assertEqual(len(svl), sum(nframes) + len(dets) + 1)
+                for k, det in enumerate(dets):
+                    # lines of fields collected concurrently interleave
+                    # but the frames of every field keep their order
+                    dvl = [ln for ln in svl if "%s_" % det in ln]
+                    self.assertEqual(len(dvl), nframes[k] + 1)
+                    self.assertEqual(
+                        dvl[0],
+                        "populate: /entry12345:NXentry/"
+                        "instrument:NXinstrument/%s:NXdetector"
+                        "/data with ['%s_%%05d.dat:0:%s']"
+                        % (det, det, nframes[k] - 1))
+                    for i in range(nframes[k]):
+                        self.assertTrue(
+                            dvl[i + 1].startswith(' * append '))
+                        self.assertTrue(
+                            dvl[i + 1].endswith(
+                                '%s_%05d.dat ' % (det, i)))
+
+                nxsfile = filewriter.open_file(filename, readonly=True)
+                ins = nxsfile.root().open("entry12345").open("instrument")
+                for det in dets:
+                    dt = ins.open(det).open("data")
+                    self.assertEqual(dt.dtype, str(images[det].dtype))
+                    buffer = dt.read()
+                    self.assertEqual(buffer.shape, images[det].shape)
+                    self.assertTrue((buffer == images[det]).all())
+                nxsfile.close()
+                os.remove(filename)
+        finally:
+            for det in dets:
+                for i in range(len(images[det])):
+                    os.remove("%s_%05d.dat" % (det, i))
+
+    def test_append_file_withpostrun_raw_concurrent_error(self):
+        """ test nxsconfig append file with fields collected concurrently
+        and an error in one of them
+        """
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        filename = 'testcollect.nxs'
+        commands = [
+            ('nxscollect append %s -r --concurrent_fields 3 %s' %
+             (filename, self.flags)).split(),
+            ('nxscollect append %s -r --in_place --concurrent_fields 3'
+             ' -w 2 %s' % (filename, self.flags)).split(),
+            ('nxscollect append %s -r -s --concurrent_fields 3 %s' %
+             (filename, self.flags)).split(),
+            ('nxscollect append %s -r -s --in_place --concurrent_fields 2'
+             ' -w 2 %s' % (filename, self.flags)).split(),
+        ]
+        wrmodule = WRITERS[self.writer]
+        filewriter.writer = wrmodule
+        dets = ["pilatus1", "pilatus2", "pilatus3"]
+        images = {}
+        for det in dets:
+            images[det] = np.array(
+                [[[self.__rnd.randint(0, 3000)
+                   for c in range(11)]
+                  for i in range(13)]
+                 for _ in range(5)],
+                dtype="uint32")
+        try:
+            for det in dets:
+                for i, image in enumerate(images[det]):
+                    with open("%s_%05d.dat" % (det, i), "w") as fl:
+                        if det == "pilatus2" and i == 2:
+                            # a broken frame of the second field
+                            fl.write("123")
+                        else:
+                            image.tofile(fl)
+            for cmd in commands:
+                self._concurrentmaster(filename, dets, images)
+                vl, er = self._runcollect(cmd)
+
+                self.assertEqual('', er)
+                # the error is reported
+                self.assertTrue(
+                    "Cannot open a file %s" % os.path.abspath(
+                        "pilatus2_00002.dat") in vl)
+                self.assertEqual(
+                    [fl for fl in os.listdir(".")
+                     if fl.startswith(filename + ".")], [])
+                nxsfile = filewriter.open_file(filename, readonly=True)
+                ins = nxsfile.root().open("entry12345").open("instrument")
+                if '-s' not in cmd:
+                    # the failed run leaves the master file unchanged
+                    for det in dets:
+                        self.assertEqual(
+                            sorted(ins.open(det).names()), ["collection"])
+                else:
+                    # the other fields are collected completely
+                    for det in dets:
+                        buffer = ins.open(det).open("data").read()
+                        if det == "pilatus2":
+                            expected = images[det][[0, 1, 3, 4]]
+                        else:
+                            expected = images[det]
+                        self.assertEqual(buffer.shape, expected.shape)
+                        self.assertTrue((buffer == expected).all())
+                nxsfile.close()
+                os.remove(filename)
+        finally:
+            for det in dets:
+                for i in range(len(images[det])):
+                    os.remove("%s_%05d.dat" % (det, i))
+
+    def test_postrunpaths(self):
+        """ test native search of NXcollection groups with postrun fields
+        """
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        filename = 'testcollect.nxs'
+        wrmodule = WRITERS[self.writer]
+        filewriter.writer = wrmodule
+        try:
+            nxsfile = filewriter.create_file(filename, overwrite=True)
+            rt = nxsfile.root()
+            entry = rt.create_group("entry12345", "NXentry")
+            ins = entry.create_group("instrument", "NXinstrument")
+            for det in ["pilatus1", "pilatus2"]:
+                dt = ins.create_group(det, "NXdetector")
+                col = dt.create_group("collection", "NXcollection")
+                col.create_field("postrun", "string").write(
+                    "%s_%%05d.dat:0:5" % det)
+                dt.create_group("nopostrun", "NXcollection")
+                # postrun fields outside NXcollection groups are skipped
+                dt.create_field("postrun", "string").write(
+                    "%s_%%05d.dat:0:5" % det)
+            # linked collections are found only once
+            filewriter.link(
+                "/entry12345/instrument/pilatus1/collection",
+                entry, "collection")
+            filewriter.link(
+                "/entry12345/instrument/pilatus2", entry, "pilatus2")
+            nxsfile.close()
+
+            nxsfile = filewriter.open_file(filename, readonly=True)
+            paths = nxscollect.Collector._postrunpaths(nxsfile.root())
+            if self.writer == "pni":
+                self.assertEqual(paths, None)
+            else:
+                self.assertEqual(
+                    sorted(path.strip("/") for path in paths),
+                    ["entry12345/instrument/pilatus1/collection",
+                     "entry12345/instrument/pilatus2/collection"])
+            nxsfile.close()
+        finally:
+            if os.path.isfile(filename):
+                os.remove(filename)
+
     def test_append_file_withpostrun_h5(self):
         """ test nxsconfig append file with a cbf postrun field
         """
@@ -1972,32 +2332,23 @@ For more help:
             os.remove('./test1_00004.tif')
             os.remove('./test1_00005.tif')
 
-    def test_append_file_parameters_tif_list(self):
-        """ test nxsconfig append file with a tif postrun field
+    def test_append_file_parameters_tif_workers(self):
+        """ test nxsconfig append file with tif images decoded by workers
         """
         fun = sys._getframe().f_code.co_name
         print("Run: %s.%s() " % (self.__class__.__name__, fun))
 
         filename = 'testcollect.nxs'
-        ifiles = 'test1_00000.tif,test1_00001.tif,test1_00002.tif,' \
-            'test1_00003.tif,test1_00004.tif,test1_00005.tif'
+        ifiles = 'test1_%05d.tif:0:5'
         path = '/entry12345/instrument/pilatus300k/data'
         commands = [
-            ('nxscollect append  %s %s -i %s -p %s' %
-             (filename, self.flags, ifiles, path)).split(),
-            ('nxscollect -x %s %s -i %s --path %s' %
-             (filename, self.flags, ifiles, path)).split(),
-            ('nxscollect append  %s -r %s -i %s -p %s' %
-             (filename, self.flags, ifiles, path)).split(),
-            ('nxscollect -x %s -r %s -i %s --path %s' %
-             (filename, self.flags, ifiles, path)).split(),
-            ('nxscollect append  %s -s %s --input_files %s -p %s' %
+            ('nxscollect append  %s %s -i %s -p %s -w 2' %
              (filename, self.flags, ifiles, path)).split(),
-            ('nxscollect -x %s -s %s --input_files %s --path %s' %
+            ('nxscollect -x %s %s -i %s --path %s --workers 3' %
              (filename, self.flags, ifiles, path)).split(),
-            ('nxscollect append  %s -r -s %s --input_files %s -p %s' %
+            ('nxscollect append  %s -r %s -i %s -p %s --workers 8' %
              (filename, self.flags, ifiles, path)).split(),
-            ('nxscollect -x %s -r -s %s --input_files %s --path %s' %
+            ('nxscollect -x %s -r -s %s --input_files %s --path %s -w 4' %
              (filename, self.flags, ifiles, path)).split(),
         ]
 
@@ -2005,23 +2356,17 @@ For more help:
         filewriter.writer = wrmodule
 
         try:
-            shutil.copy2('test/files/test_file0.tif', './test1_00000.tif')
-            shutil.copy2('test/files/test_file1.tif', './test1_00001.tif')
-            shutil.copy2('test/files/test_file2.tif', './test1_00002.tif')
-            shutil.copy2('test/files/test_file3.tif', './test1_00003.tif')
-            shutil.copy2('test/files/test_file4.tif', './test1_00004.tif')
-            shutil.copy2('test/files/test_file5.tif', './test1_00005.tif')
+            for i in range(6):
+                shutil.copy2('test/files/test_file%s.tif' % i,
+                             './test1_%05d.tif' % i)
             for cmd in commands:
                 nxsfile = filewriter.create_file(
                     filename, overwrite=True)
                 rt = nxsfile.root()
                 entry = rt.create_group("entry12345", "NXentry")
                 ins = entry.create_group("instrument", "NXinstrument")
-                det = ins.create_group("pilatus300k", "NXdetector")
+                ins.create_group("pilatus300k", "NXdetector")
                 entry.create_group("data", "NXdata")
-                # col = det.create_group("collection", "NXcollection")
-                # postrun = col.create_field("postrun", "string")
-                # postrun.write("test1_%05d.tif:0:5")
                 nxsfile.close()
 
                 old_stdout = sys.stdout
@@ -2036,21 +2381,14 @@ For more help:
                 sys.stdout = old_stdout
                 sys.stderr = old_stderr
                 vl = mystdout.getvalue()
-                # er =
                 mystderr.getvalue()
 
-                # self.assertEqual('', er)
                 self.assertTrue(vl)
                 svl = vl.split("\n")
                 if len(svl) != 8:
                     print(svl)
                 self.assertEqual(len(svl), 8)
-                self.assertTrue(
-                    svl[0],
-                    "populate: /entry12345:NXentry/instrument:NXinstrument/"
-                    "pilatus300k:NXdetector/data with ['test1_%05d.tif:0:5']")
                 for i in range(1, 6):
-
                     self.assertTrue(svl[i].startswith(' * append '))
                     self.assertTrue(
                         svl[i].endswith('test1_%05d.tif ' % (i - 1)))
@@ -2074,67 +2412,46 @@ For more help:
                 os.remove(filename)
 
         finally:
-            os.remove('./test1_00000.tif')
-            os.remove('./test1_00001.tif')
-            os.remove('./test1_00002.tif')
-            os.remove('./test1_00003.tif')
-            os.remove('./test1_00004.tif')
-            os.remove('./test1_00005.tif')
+            for i in range(6):
+                os.remove('./test1_%05d.tif' % i)
 
-    def test_append_file_parameters_tif_list_sep(self):
-        """ test nxsconfig append file with a tif postrun field
+    def test_append_file_parameters_tif_presize(self):
+        """ test nxsconfig append file with tif images into a presized field
         """
         fun = sys._getframe().f_code.co_name
         print("Run: %s.%s() " % (self.__class__.__name__, fun))
 
         filename = 'testcollect.nxs'
-        ifiles = 'test1_00000.tif:test1_00001.tif:test1_00002.tif:' \
-            'test1_00003.tif:test1_00004.tif:test1_00005.tif'
+        ifiles = 'test1_%05d.tif:0:5'
         path = '/entry12345/instrument/pilatus300k/data'
         commands = [
-            ('nxscollect append  %s %s -i %s -p %s --separator :' %
-             (filename, self.flags, ifiles, path)).split(),
-            ('nxscollect -x %s %s -i %s --path %s --separator :' %
-             (filename, self.flags, ifiles, path)).split(),
-            ('nxscollect append  %s -r %s -i %s -p %s --separator :' %
-             (filename, self.flags, ifiles, path)).split(),
-            ('nxscollect -x %s -r %s -i %s --path %s --separator :' %
-             (filename, self.flags, ifiles, path)).split(),
-            ('nxscollect append  %s -s %s --input_files %s -p %s'
-             ' --separator :' %
+            ('nxscollect append  %s %s -i %s -p %s --presize' %
              (filename, self.flags, ifiles, path)).split(),
-            ('nxscollect -x %s -s %s --input_files %s --path %s'
-             ' --separator :' %
+            ('nxscollect -x %s %s -i %s --path %s --presize'
+             ' --batch_size 4' %
              (filename, self.flags, ifiles, path)).split(),
-            ('nxscollect append  %s -r -s %s --input_files %s -p %s'
-             ' --separator :' %
+            ('nxscollect append  %s -r -s %s -i %s -p %s --presize -w 3' %
              (filename, self.flags, ifiles, path)).split(),
             ('nxscollect -x %s -r -s %s --input_files %s --path %s'
-             ' --separator :' %
-             (filename, self.flags, ifiles, path)).split(),
+             ' --presize --batch_size 4' %
+             (filename, self.flags, "test1_%05d.tif:0:7", path)).split(),
         ]
 
         wrmodule = WRITERS[self.writer]
         filewriter.writer = wrmodule
 
         try:
-            shutil.copy2('test/files/test_file0.tif', './test1_00000.tif')
-            shutil.copy2('test/files/test_file1.tif', './test1_00001.tif')
-            shutil.copy2('test/files/test_file2.tif', './test1_00002.tif')
-            shutil.copy2('test/files/test_file3.tif', './test1_00003.tif')
-            shutil.copy2('test/files/test_file4.tif', './test1_00004.tif')
-            shutil.copy2('test/files/test_file5.tif', './test1_00005.tif')
+            for i in range(6):
+                shutil.copy2('test/files/test_file%s.tif' % i,
+                             './test1_%05d.tif' % i)
             for cmd in commands:
                 nxsfile = filewriter.create_file(
                     filename, overwrite=True)
                 rt = nxsfile.root()
                 entry = rt.create_group("entry12345", "NXentry")
                 ins = entry.create_group("instrument", "NXinstrument")
-                det = ins.create_group("pilatus300k", "NXdetector")
+                ins.create_group("pilatus300k", "NXdetector")
                 entry.create_group("data", "NXdata")
-                # col = det.create_group("collection", "NXcollection")
-                # postrun = col.create_field("postrun", "string")
-                # postrun.write("test1_%05d.tif:0:5")
                 nxsfile.close()
 
                 old_stdout = sys.stdout
@@ -2149,24 +2466,17 @@ For more help:
                 sys.stdout = old_stdout
                 sys.stderr = old_stderr
                 vl = mystdout.getvalue()
-                # er =
                 mystderr.getvalue()
 
-                # self.assertEqual('', er)
                 self.assertTrue(vl)
-                svl = vl.split("\n")
-                if len(svl) != 8:
+                svl = [ln for ln in vl.split("\n")
+                       if ln.startswith(' * append ')]
+                if len(svl) != 6:
                     print(svl)
-                self.assertEqual(len(svl), 8)
-                self.assertTrue(
-                    svl[0],
-                    "populate: /entry12345:NXentry/instrument:NXinstrument/"
-                    "pilatus300k:NXdetector/data with ['test1_%05d.tif:0:5']")
-                for i in range(1, 6):
-
-                    self.assertTrue(svl[i].startswith(' * append '))
+                self.assertEqual(len(svl), 6)
+                for i in range(6):
                     self.assertTrue(
-                        svl[i].endswith('test1_%05d.tif ' % (i - 1)))
+                        svl[i].endswith('test1_%05d.tif ' % i))
 
                 if '-r' not in cmd:
                     os.remove("%s.__nxscollect_old__" % filename)
@@ -2187,30 +2497,113 @@ For more help:
                 os.remove(filename)
 
         finally:
-            os.remove('./test1_00000.tif')
-            os.remove('./test1_00001.tif')
-            os.remove('./test1_00002.tif')
-            os.remove('./test1_00003.tif')
-            os.remove('./test1_00004.tif')
-            os.remove('./test1_00005.tif')
+            for i in range(6):
+                os.remove('./test1_%05d.tif' % i)
 
-    def test_append_file_parameters_cbf(self):
-        """ test nxsconfig append file with a cbf postrun field
+    def test_append_file_parameters_tif_batch(self):
+        """ test nxsconfig append file with tif images appended in batches
         """
         fun = sys._getframe().f_code.co_name
         print("Run: %s.%s() " % (self.__class__.__name__, fun))
 
         filename = 'testcollect.nxs'
-        ifiles = 'test1_%05d.cbf:0:5'
+        ifiles = 'test1_%05d.tif:0:5'
         path = '/entry12345/instrument/pilatus300k/data'
         commands = [
-            ('nxscollect append  %s %s -i %s -p %s' %
+            ('nxscollect append  %s %s -i %s -p %s --batch_size 2' %
              (filename, self.flags, ifiles, path)).split(),
-            ('nxscollect -x %s %s -i %s --path %s' %
+            ('nxscollect -x %s %s -i %s --path %s --batch_size 4'
+             ' --flush_frames 0' %
              (filename, self.flags, ifiles, path)).split(),
-            ('nxscollect append  %s -r %s -i %s -p %s' %
+            ('nxscollect append  %s -r %s -i %s -p %s --batch_size 10'
+             ' --flush_time 0.5' %
              (filename, self.flags, ifiles, path)).split(),
-            ('nxscollect -x %s -r %s -i %s --path %s' %
+            ('nxscollect -x %s -r -s %s --input_files %s --path %s'
+             ' --batch_size 4 --flush_frames 3 -w 2' %
+             (filename, self.flags, ifiles, path)).split(),
+        ]
+
+        wrmodule = WRITERS[self.writer]
+        filewriter.writer = wrmodule
+
+        try:
+            for i in range(6):
+                shutil.copy2('test/files/test_file%s.tif' % i,
+                             './test1_%05d.tif' % i)
+            for cmd in commands:
+                nxsfile = filewriter.create_file(
+                    filename, overwrite=True)
+                rt = nxsfile.root()
+                entry = rt.create_group("entry12345", "NXentry")
+                ins = entry.create_group("instrument", "NXinstrument")
+                ins.create_group("pilatus300k", "NXdetector")
+                entry.create_group("data", "NXdata")
+                nxsfile.close()
+
+                old_stdout = sys.stdout
+                old_stderr = sys.stderr
+                sys.stdout = mystdout = StringIO()
+                sys.stderr = mystderr = StringIO()
+                old_argv = sys.argv
+                sys.argv = cmd
+                nxscollect.main()
+
+                sys.argv = old_argv
+                sys.stdout = old_stdout
+                sys.stderr = old_stderr
+                vl = mystdout.getvalue()
+                mystderr.getvalue()
+
+                self.assertTrue(vl)
+                svl = vl.split("\n")
+                if len(svl) != 8:
+                    print(svl)
+                self.assertEqual(len(svl), 8)
+                for i in range(1, 6):
+                    self.assertTrue(svl[i].startswith(' * append '))
+                    self.assertTrue(
+                        svl[i].endswith('test1_%05d.tif ' % (i - 1)))
+
+                if '-r' not in cmd:
+                    os.remove("%s.__nxscollect_old__" % filename)
+                nxsfile = filewriter.open_file(filename, readonly=True)
+                rt = nxsfile.root()
+                entry = rt.open("entry12345")
+                ins = entry.open("instrument")
+                det = ins.open("pilatus300k")
+                dt = det.open("data")
+                buffer = dt.read()
+                self.assertEqual(buffer.shape, (6, 195, 487))
+                for i in range(6):
+                    fbuffer = fabio.open('./test1_%05d.tif' % i)
+                    fimage = fbuffer.data[...]
+                    image = buffer[i, :, :]
+                    self.assertTrue((image == fimage).all())
+                nxsfile.close()
+                os.remove(filename)
+
+        finally:
+            for i in range(6):
+                os.remove('./test1_%05d.tif' % i)
+
+    def test_append_file_parameters_tif_list(self):
+        """ test nxsconfig append file with a tif postrun field
+        """
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        filename = 'testcollect.nxs'
+        ifiles = 'test1_00000.tif,test1_00001.tif,test1_00002.tif,' \
+            'test1_00003.tif,test1_00004.tif,test1_00005.tif'
+        path = '/entry12345/instrument/pilatus300k/data'
+        commands = [
+            ('nxscollect append  %s %s -i %s -p %s' %
+             (filename, self.flags, ifiles, path)).split(),
+            ('nxscollect -x %s %s -i %s --path %s' %
+             (filename, self.flags, ifiles, path)).split(),
+            ('nxscollect append  %s -r %s -i %s -p %s' %
+             (filename, self.flags, ifiles, path)).split(),
+            ('nxscollect -x %s -r %s -i %s --path %s' %
              (filename, self.flags, ifiles, path)).split(),
             ('nxscollect append  %s -s %s --input_files %s -p %s' %
              (filename, self.flags, ifiles, path)).split(),
@@ -2226,12 +2619,12 @@ For more help:
         filewriter.writer = wrmodule
 
         try:
-            shutil.copy2('test/files/test_file.cbf', './test1_00000.cbf')
-            shutil.copy2('test/files/test_file.cbf', './test1_00001.cbf')
-            shutil.copy2('test/files/test_file.cbf', './test1_00002.cbf')
-            shutil.copy2('test/files/test_file.cbf', './test1_00003.cbf')
-            shutil.copy2('test/files/test_file.cbf', './test1_00004.cbf')
-            shutil.copy2('test/files/test_file.cbf', './test1_00005.cbf')
+            shutil.copy2('test/files/test_file0.tif', './test1_00000.tif')
+            shutil.copy2('test/files/test_file1.tif', './test1_00001.tif')
+            shutil.copy2('test/files/test_file2.tif', './test1_00002.tif')
+            shutil.copy2('test/files/test_file3.tif', './test1_00003.tif')
+            shutil.copy2('test/files/test_file4.tif', './test1_00004.tif')
+            shutil.copy2('test/files/test_file5.tif', './test1_00005.tif')
             for cmd in commands:
                 nxsfile = filewriter.create_file(
                     filename, overwrite=True)
@@ -2242,7 +2635,7 @@ For more help:
                 entry.create_group("data", "NXdata")
                 # col = det.create_group("collection", "NXcollection")
                 # postrun = col.create_field("postrun", "string")
-                # postrun.write("test1_%05d.cbf:0:5")
+                # postrun.write("test1_%05d.tif:0:5")
                 nxsfile.close()
 
                 old_stdout = sys.stdout
@@ -2269,12 +2662,12 @@ For more help:
                 self.assertTrue(
                     svl[0],
                     "populate: /entry12345:NXentry/instrument:NXinstrument/"
-                    "pilatus300k:NXdetector/data with ['test1_%05d.cbf:0:5']")
+                    "pilatus300k:NXdetector/data with ['test1_%05d.tif:0:5']")
                 for i in range(1, 6):
 
                     self.assertTrue(svl[i].startswith(' * append '))
                     self.assertTrue(
-                        svl[i].endswith('test1_%05d.cbf ' % (i - 1)))
+                        svl[i].endswith('test1_%05d.tif ' % (i - 1)))
 
                 if '-r' not in cmd:
                     os.remove("%s.__nxscollect_old__" % filename)
@@ -2287,7 +2680,7 @@ For more help:
                 buffer = dt.read()
                 self.assertEqual(buffer.shape, (6, 195, 487))
                 for i in range(6):
-                    fbuffer = fabio.open('./test1_%05d.cbf' % i)
+                    fbuffer = fabio.open('./test1_%05d.tif' % i)
                     fimage = fbuffer.data[...]
                     image = buffer[i, :, :]
                     self.assertTrue((image == fimage).all())
@@ -2295,22 +2688,134 @@ For more help:
                 os.remove(filename)
 
         finally:
-            os.remove('./test1_00000.cbf')
-            os.remove('./test1_00001.cbf')
-            os.remove('./test1_00002.cbf')
-            os.remove('./test1_00003.cbf')
-            os.remove('./test1_00004.cbf')
-            os.remove('./test1_00005.cbf')
+            os.remove('./test1_00000.tif')
+            os.remove('./test1_00001.tif')
+            os.remove('./test1_00002.tif')
+            os.remove('./test1_00003.tif')
+            os.remove('./test1_00004.tif')
+            os.remove('./test1_00005.tif')
 
-    def test_append_file_parameters_cbf_list(self):
+    def test_append_file_parameters_tif_list_sep(self):
+        """ test nxsconfig append file with a tif postrun field
+        """
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        filename = 'testcollect.nxs'
+        ifiles = 'test1_00000.tif:test1_00001.tif:test1_00002.tif:' \
+            'test1_00003.tif:test1_00004.tif:test1_00005.tif'
+        path = '/entry12345/instrument/pilatus300k/data'
+        commands = [
+            ('nxscollect append  %s %s -i %s -p %s --separator :' %
+             (filename, self.flags, ifiles, path)).split(),
+            ('nxscollect -x %s %s -i %s --path %s --separator :' %
+             (filename, self.flags, ifiles, path)).split(),
+            ('nxscollect append  %s -r %s -i %s -p %s --separator :' %
+             (filename, self.flags, ifiles, path)).split(),
+            ('nxscollect -x %s -r %s -i %s --path %s --separator :' %
+             (filename, self.flags, ifiles, path)).split(),
+            ('nxscollect append  %s -s %s --input_files %s -p %s'
+             ' --separator :' %
+             (filename, self.flags, ifiles, path)).split(),
+            ('nxscollect -x %s -s %s --input_files %s --path %s'
+             ' --separator :' %
+             (filename, self.flags, ifiles, path)).split(),
+            ('nxscollect append  %s -r -s %s --input_files %s -p %s'
+             ' --separator :' %
+             (filename, self.flags, ifiles, path)).split(),
+            ('nxscollect -x %s -r -s %s --input_files %s --path %s'
+             ' --separator :' %
+             (filename, self.flags, ifiles, path)).split(),
+        ]
+
+        wrmodule = WRITERS[self.writer]
+        filewriter.writer = wrmodule
+
+        try:
+            shutil.copy2('test/files/test_file0.tif', './test1_00000.tif')
+            shutil.copy2('test/files/test_file1.tif', './test1_00001.tif')
+            shutil.copy2('test/files/test_file2.tif', './test1_00002.tif')
+            shutil.copy2('test/files/test_file3.tif', './test1_00003.tif')
+            shutil.copy2('test/files/test_file4.tif', './test1_00004.tif')
+            shutil.copy2('test/files/test_file5.tif', './test1_00005.tif')
+            for cmd in commands:
+                nxsfile = filewriter.create_file(
+                    filename, overwrite=True)
+                rt = nxsfile.root()
+                entry = rt.create_group("entry12345", "NXentry")
+                ins = entry.create_group("instrument", "NXinstrument")
+                det = ins.create_group("pilatus300k", "NXdetector")
+                entry.create_group("data", "NXdata")
+                # col = det.create_group("collection", "NXcollection")
+                # postrun = col.create_field("postrun", "string")
+                # postrun.write("test1_%05d.tif:0:5")
+                nxsfile.close()
+
+                old_stdout = sys.stdout
+                old_stderr = sys.stderr
+                sys.stdout = mystdout = StringIO()
+                sys.stderr = mystderr = StringIO()
+                old_argv = sys.argv
+                sys.argv = cmd
+                nxscollect.main()
+
+                sys.argv = old_argv
+                sys.stdout = old_stdout
+                sys.stderr = old_stderr
+                vl = mystdout.getvalue()
+                # er =
+                mystderr.getvalue()
+
+                # self.assertEqual('', er)
+                self.assertTrue(vl)
+                svl = vl.split("\n")
+                if len(svl) != 8:
+                    print(svl)
+                self.assertEqual(len(svl), 8)
+                self.assertTrue(
+                    svl[0],
+                    "populate: /entry12345:NXentry/instrument:NXinstrument/"
+                    "pilatus300k:NXdetector/data with ['test1_%05d.tif:0:5']")
+                for i in range(1, 6):
+
+                    self.assertTrue(svl[i].startswith(' * append '))
+                    self.assertTrue(
+                        svl[i].endswith('test1_%05d.tif ' % (i - 1)))
+
+                if '-r' not in cmd:
+                    os.remove("%s.__nxscollect_old__" % filename)
+                nxsfile = filewriter.open_file(filename, readonly=True)
+                rt = nxsfile.root()
+                entry = rt.open("entry12345")
+                ins = entry.open("instrument")
+                det = ins.open("pilatus300k")
+                dt = det.open("data")
+                buffer = dt.read()
+                self.assertEqual(buffer.shape, (6, 195, 487))
+                for i in range(6):
+                    fbuffer = fabio.open('./test1_%05d.tif' % i)
+                    fimage = fbuffer.data[...]
+                    image = buffer[i, :, :]
+                    self.assertTrue((image == fimage).all())
+                nxsfile.close()
+                os.remove(filename)
+
+        finally:
+            os.remove('./test1_00000.tif')
+            os.remove('./test1_00001.tif')
+            os.remove('./test1_00002.tif')
+            os.remove('./test1_00003.tif')
+            os.remove('./test1_00004.tif')
+            os.remove('./test1_00005.tif')
+
+    def test_append_file_parameters_cbf(self):
         """ test nxsconfig append file with a cbf postrun field
         """
         fun = sys._getframe().f_code.co_name
         print("Run: %s.%s() " % (self.__class__.__name__, fun))
 
         filename = 'testcollect.nxs'
-        ifiles = 'test1_00000.cbf,test1_00001.cbf,test1_00002.cbf,' \
-            'test1_00003.cbf,test1_00004.cbf,test1_00005.cbf'
+        ifiles = 'test1_%05d.cbf:0:5'
         path = '/entry12345/instrument/pilatus300k/data'
         commands = [
             ('nxscollect append  %s %s -i %s -p %s' %
@@ -2411,36 +2916,32 @@ For more help:
             os.remove('./test1_00004.cbf')
             os.remove('./test1_00005.cbf')
 
-    def test_append_file_parameters_cbf_list_sep(self):
+    def test_append_file_parameters_cbf_list(self):
         """ test nxsconfig append file with a cbf postrun field
         """
         fun = sys._getframe().f_code.co_name
         print("Run: %s.%s() " % (self.__class__.__name__, fun))
 
         filename = 'testcollect.nxs'
-        ifiles = 'test1_00000.cbf:test1_00001.cbf:test1_00002.cbf:' \
-            'test1_00003.cbf:test1_00004.cbf:test1_00005.cbf'
+        ifiles = 'test1_00000.cbf,test1_00001.cbf,test1_00002.cbf,' \
+            'test1_00003.cbf,test1_00004.cbf,test1_00005.cbf'
         path = '/entry12345/instrument/pilatus300k/data'
         commands = [
-            ('nxscollect append  %s %s -i %s -p %s --separator :' %
+            ('nxscollect append  %s %s -i %s -p %s' %
              (filename, self.flags, ifiles, path)).split(),
-            ('nxscollect -x %s %s -i %s --path %s --separator :' %
+            ('nxscollect -x %s %s -i %s --path %s' %
              (filename, self.flags, ifiles, path)).split(),
-            ('nxscollect append  %s -r %s -i %s -p %s --separator :' %
+            ('nxscollect append  %s -r %s -i %s -p %s' %
              (filename, self.flags, ifiles, path)).split(),
-            ('nxscollect -x %s -r %s -i %s --path %s --separator :' %
+            ('nxscollect -x %s -r %s -i %s --path %s' %
              (filename, self.flags, ifiles, path)).split(),
-            ('nxscollect append  %s -s %s --input_files %s -p %s'
-             ' --separator :' %
+            ('nxscollect append  %s -s %s --input_files %s -p %s' %
              (filename, self.flags, ifiles, path)).split(),
-            ('nxscollect -x %s -s %s --input_files %s --path %s'
-             ' --separator :' %
+            ('nxscollect -x %s -s %s --input_files %s --path %s' %
              (filename, self.flags, ifiles, path)).split(),
-            ('nxscollect append  %s -r -s %s --input_files %s -p %s'
-             ' --separator :' %
+            ('nxscollect append  %s -r -s %s --input_files %s -p %s' %
              (filename, self.flags, ifiles, path)).split(),
-            ('nxscollect -x %s -r -s %s --input_files %s --path %s'
-             ' --separator :' %
+            ('nxscollect -x %s -r -s %s --input_files %s --path %s' %
              (filename, self.flags, ifiles, path)).split(),
         ]
 
@@ -2517,14 +3018,1921 @@ For more help:
                 os.remove(filename)
 
         finally:
-            os.remove('./test1_00000.cbf')
-            os.remove('./test1_00001.cbf')
-            os.remove('./test1_00002.cbf')
-            os.remove('./test1_00003.cbf')
-            os.remove('./test1_00004.cbf')
-            os.remove('./test1_00005.cbf')
+            os.remove('./test1_00000.cbf')
+            os.remove('./test1_00001.cbf')
+            os.remove('./test1_00002.cbf')
+            os.remove('./test1_00003.cbf')
+            os.remove('./test1_00004.cbf')
+            os.remove('./test1_00005.cbf')
+
+    def test_append_file_parameters_cbf_list_sep(self):
+        """ test nxsconfig append file with a cbf postrun field
+        """
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        filename = 'testcollect.nxs'
+        ifiles = 'test1_00000.cbf:test1_00001.cbf:test1_00002.cbf:' \
+            'test1_00003.cbf:test1_00004.cbf:test1_00005.cbf'
+        path = '/entry12345/instrument/pilatus300k/data'
+        commands = [
+            ('nxscollect append  %s %s -i %s -p %s --separator :' %
+             (filename, self.flags, ifiles, path)).split(),
+            ('nxscollect -x %s %s -i %s --path %s --separator :' %
+             (filename, self.flags, ifiles, path)).split(),
+            ('nxscollect append  %s -r %s -i %s -p %s --separator :' %
+             (filename, self.flags, ifiles, path)).split(),
+            ('nxscollect -x %s -r %s -i %s --path %s --separator :' %
+             (filename, self.flags, ifiles, path)).split(),
+            ('nxscollect append  %s -s %s --input_files %s -p %s'
+             ' --separator :' %
+             (filename, self.flags, ifiles, path)).split(),
+            ('nxscollect -x %s -s %s --input_files %s --path %s'
+             ' --separator :' %
+             (filename, self.flags, ifiles, path)).split(),
+            ('nxscollect append  %s -r -s %s --input_files %s -p %s'
+             ' --separator :' %
+             (filename, self.flags, ifiles, path)).split(),
+            ('nxscollect -x %s -r -s %s --input_files %s --path %s'
+             ' --separator :' %
+             (filename, self.flags, ifiles, path)).split(),
+        ]
+
+        wrmodule = WRITERS[self.writer]
+        filewriter.writer = wrmodule
+
+        try:
+            shutil.copy2('test/files/test_file.cbf', './test1_00000.cbf')
+            shutil.copy2('test/files/test_file.cbf', './test1_00001.cbf')
+            shutil.copy2('test/files/test_file.cbf', './test1_00002.cbf')
+            shutil.copy2('test/files/test_file.cbf', './test1_00003.cbf')
+            shutil.copy2('test/files/test_file.cbf', './test1_00004.cbf')
+            shutil.copy2('test/files/test_file.cbf', './test1_00005.cbf')
+            for cmd in commands:
+                nxsfile = filewriter.create_file(
+                    filename, overwrite=True)
+                rt = nxsfile.root()
+                entry = rt.create_group("entry12345", "NXentry")
+                ins = entry.create_group("instrument", "NXinstrument")
+                det = ins.create_group("pilatus300k", "NXdetector")
+                entry.create_group("data", "NXdata")
+                # col = det.create_group("collection", "NXcollection")
+                # postrun = col.create_field("postrun", "string")
+                # postrun.write("test1_%05d.cbf:0:5")
+                nxsfile.close()
+
+                old_stdout = sys.stdout
+                old_stderr = sys.stderr
+                sys.stdout = mystdout = StringIO()
+                sys.stderr = mystderr = StringIO()
+                old_argv = sys.argv
+                sys.argv = cmd
+                nxscollect.main()
+
+                sys.argv = old_argv
+                sys.stdout = old_stdout
+                sys.stderr = old_stderr
+                vl = mystdout.getvalue()
+                # er =
+                mystderr.getvalue()
+
+                # self.assertEqual('', er)
+                self.assertTrue(vl)
+                svl = vl.split("\n")
+                if len(svl) != 8:
+                    print(svl)
+                self.assertEqual(len(svl), 8)
+                self.assertTrue(
+                    svl[0],
+                    "populate: /entry12345:NXentry/instrument:NXinstrument/"
+                    "pilatus300k:NXdetector/data with ['test1_%05d.cbf:0:5']")
+                for i in range(1, 6):
+
+                    self.assertTrue(svl[i].startswith(' * append '))
+                    self.assertTrue(
+                        svl[i].endswith('test1_%05d.cbf ' % (i - 1)))
+
+                if '-r' not in cmd:
+                    os.remove("%s.__nxscollect_old__" % filename)
+                nxsfile = filewriter.open_file(filename, readonly=True)
+                rt = nxsfile.root()
+                entry = rt.open("entry12345")
+                ins = entry.open("instrument")
+                det = ins.open("pilatus300k")
+                dt = det.open("data")
+                buffer = dt.read()
+                self.assertEqual(buffer.shape, (6, 195, 487))
+                for i in range(6):
+                    fbuffer = fabio.open('./test1_%05d.cbf' % i)
+                    fimage = fbuffer.data[...]
+                    image = buffer[i, :, :]
+                    self.assertTrue((image == fimage).all())
+                nxsfile.close()
+                os.remove(filename)
+
+        finally:
+            os.remove('./test1_00000.cbf')
+            os.remove('./test1_00001.cbf')
+            os.remove('./test1_00002.cbf')
+            os.remove('./test1_00003.cbf')
+            os.remove('./test1_00004.cbf')
+            os.remove('./test1_00005.cbf')
+
+    def test_append_file_parameters_raw(self):
+        """ test nxsconfig append file with a cbf postrun field
+        """
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        filename = 'testcollect.nxs'
+        attrs = {
+            "int": [-123, "NX_INT", "int64", (1,)],
+            "int8": [12, "NX_INT8", "int8", (1,)],
+            "int16": [-123, "NX_INT16", "int16", (1,)],
+            "int32": [12345, "NX_INT32", "int32", (1,)],
+            "int64": [-12345, "NX_INT64", "int64", (1,)],
+            "uint": [123, "NX_UINT", "uint64", (1,)],
+            "uint8": [12, "NX_UINT8", "uint8", (1,)],
+            "uint16": [123, "NX_UINT16", "uint16", (1,)],
+            "uint32": [12345, "NX_UINT32", "uint32", (1,)],
+            "uint64": [12345, "NX_UINT64", "uint64", (1,)],
+            "float": [-12.345, "NX_FLOAT", "float64", (1,), 1.e-14],
+            "number": [-12.345e+2, "NX_NUMBER", "float64", (1,), 1.e-14],
+            "float32": [-12.345e-1, "NX_FLOAT32", "float32", (1,), 1.e-5],
+            "float64": [-12.345, "NX_FLOAT64", "float64", (1,), 1.e-14],
+        }
+
+        commands = [
+            ('nxscollect append  %s %s' % (filename, self.flags)).split(),
+            ('nxscollect -x %s %s' % (filename, self.flags)).split(),
+            ('nxscollect append  %s -r %s' % (filename, self.flags)).split(),
+            ('nxscollect -x %s -r %s' % (filename, self.flags)).split(),
+            ('nxscollect append  %s -s %s' % (filename, self.flags)).split(),
+            ('nxscollect -x %s -s %s' % (filename, self.flags)).split(),
+            ('nxscollect append  %s -r -s %s' %
+             (filename, self.flags)).split(),
+            ('nxscollect -x %s -r -s %s' % (filename, self.flags)).split(),
+        ]
+        wrmodule = WRITERS[self.writer]
+        filewriter.writer = wrmodule
+        for k in attrs.keys():
+            mlen = [self.__rnd.randint(10, 200),
+                    self.__rnd.randint(10, 200)]
+
+            attrs[k][0] = np.array(
+                [[[attrs[k][0] * self.__rnd.randint(0, 3)
+                   for c in range(mlen[1])]
+                  for i in range(mlen[0])]
+                 for _ in range(6)],
+                dtype=attrs[k][2]
+                )
+            try:
+                for i in range(6):
+                    with open("rawtest1_%05d.dat" % i, "w") as fl:
+                        attrs[k][0][i].tofile(fl)
+                for cmd in commands:
+                    nxsfile = filewriter.create_file(
+                        filename, overwrite=True)
+                    rt = nxsfile.root()
+                    entry = rt.create_group("entry12345", "NXentry")
+                    # to be created
+                    # ins = entry.create_group("instrument", "NXinstrument")
+                    # det = ins.create_group("pilatus300k", "NXdetector")
+                    entry.create_group("data", "NXdata")
+                    nxsfile.close()
+                    pcmd = cmd
+                    pcmd.extend(["-i", "rawtest1_%05d.dat:0:5"])
+                    pcmd.extend(
+                        ["-p", '/entry12345/instrument/pilatus300k/data'])
+                    pcmd.extend(
+                        ["--shape", json.dumps(attrs[k][0].shape[1:])])
+                    pcmd.extend(
+                        ["--dtype", attrs[k][2]])
+
+                    old_stdout = sys.stdout
+                    old_stderr = sys.stderr
+                    sys.stdout = mystdout = StringIO()
+                    sys.stderr = mystderr = StringIO()
+                    old_argv = sys.argv
+                    sys.argv = pcmd
+                    nxscollect.main()
+
+                    sys.argv = old_argv
+                    sys.stdout = old_stdout
+                    sys.stderr = old_stderr
+                    vl = mystdout.getvalue()
+                    er = mystderr.getvalue()
+
+                    self.assertEqual('', er)
+                    self.assertTrue(vl)
+                    svl = vl.split("\n")
+                    self.assertEqual(len(svl), 8)
+                    self.assertTrue(
+                        svl[0],
+                        "populate: /entry12345:NXentry/"
+                        "instrument:NXinstrument/pilatus300k:NXdetector"
+                        "/data with ['test1_%05d.cbf:0:5']")
+                    for i in range(1, 6):
+                        self.assertTrue(svl[i].startswith(' * append '))
+                        self.assertTrue(
+                            svl[i].endswith('test1_%05d.dat ' % (i - 1)))
+
+                    if '-r' not in cmd:
+                        os.remove("%s.__nxscollect_old__" % filename)
+                    nxsfile = filewriter.open_file(filename, readonly=True)
+                    rt = nxsfile.root()
+                    entry = rt.open("entry12345")
+                    ins = entry.open("instrument")
+                    det = ins.open("pilatus300k")
+                    dt = det.open("data")
+                    buffer = dt.read()
+                    self.assertEqual(buffer.shape, attrs[k][0].shape)
+                    for i in range(6):
+                        fimage = attrs[k][0][i]
+                        image = buffer[i, :, :]
+                        self.assertTrue((image == fimage).all())
+                    nxsfile.close()
+                    os.remove(filename)
+
+            finally:
+                for i in range(6):
+                    os.remove("rawtest1_%05d.dat" % i)
+
+    def test_append_file_withpostrun_raw_batch(self):
+        """ test nxsconfig append many master files in parallel
+        """
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        dirname = 'testcollect_batch'
+        commands = [
+            ('nxscollect append %s -r --processes 2 %s' %
+             (dirname, self.flags)).split(),
+            ('nxscollect -x %s/scan_*.nxs -r %s' %
+             (dirname, self.flags)).split(),
+        ]
+        wrmodule = WRITERS[self.writer]
+        filewriter.writer = wrmodule
+        mlen = [self.__rnd.randint(10, 200),
+                self.__rnd.randint(10, 200)]
+        images = np.array(
+            [[[self.__rnd.randint(0, 3000)
+               for c in range(mlen[1])]
+              for i in range(mlen[0])]
+             for _ in range(6)],
+            dtype="uint16")
+        masters = [os.path.join(dirname, "scan_%s.nxs" % i)
+                   for i in range(4)]
+        os.mkdir(dirname)
+        try:
+            for i in range(6):
+                with open(os.path.join(
+                        dirname, "rawbatch_%05d.dat" % i), "w") as fl:
+                    images[i].tofile(fl)
+            for cmd in commands:
+                for filename in masters[:3]:
+                    nxsfile = filewriter.create_file(
+                        filename, overwrite=True)
+                    rt = nxsfile.root()
+                    entry = rt.create_group("entry12345", "NXentry")
+                    ins = entry.create_group("instrument", "NXinstrument")
+                    det = ins.create_group("pilatus300k", "NXdetector")
+                    col = det.create_group("collection", "NXcollection")
+                    postrun = col.create_field("postrun", "string")
+                    postrun.write("rawbatch_%05d.dat:0:5")
+                    atts = postrun.attributes
+                    atts.create("fielddtype", "string").write("uint16")
+                    atts.create("fieldshape", "string").write(
+                        json.dumps(mlen))
+                    nxsfile.close()
+                # a broken master file
+                with open(masters[3], "w") as fl:
+                    fl.write("not a nexus file")
+
+                old_stdout = sys.stdout
+                old_stderr = sys.stderr
+                sys.stdout = mystdout = StringIO()
+                sys.stderr = mystderr = StringIO()
+                old_argv = sys.argv
+                sys.argv = cmd
+                nxscollect.main()
+
+                sys.argv = old_argv
+                sys.stdout = old_stdout
+                sys.stderr = old_stderr
+                vl = mystdout.getvalue()
+                er = mystderr.getvalue()
+
+                self.assertEqual('', er)
+                svl = vl.split("\n")
+                self.assertEqual(
+                    len([ln for ln in svl if ln.startswith(" * append ")]),
+                    18)
+                self.assertEqual(
+                    len([ln for ln in svl if ln.startswith("populate: ")]),
+                    3)
+                self.assertEqual(
+                    svl[-3], "summary: 3 of 4 master files collected")
+                self.assertEqual(svl[-2], " * failed %s " % masters[3])
+                self.assertEqual(svl[-1], "")
+
+                for filename in masters[:3]:
+                    nxsfile = filewriter.open_file(filename, readonly=True)
+                    rt = nxsfile.root()
+                    dt = rt.open("entry12345").open("instrument").open(
+                        "pilatus300k").open("data")
+                    buffer = dt.read()
+                    self.assertEqual(buffer.shape, images.shape)
+                    self.assertTrue((buffer == images).all())
+                    nxsfile.close()
+                    os.remove(filename)
+                self.assertEqual(
+                    sorted(os.listdir(dirname)),
+                    sorted(["rawbatch_%05d.dat" % i for i in range(6)] +
+                           ["scan_3.nxs"]))
+                os.remove(masters[3])
+
+        finally:
+            shutil.rmtree(dirname)
+
+    def test_append_file_parameters_raw_chunk_size(self):
+        """ test nxsconfig append file with the auto chunk shape
+        """
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        filename = 'testcollect.nxs'
+        # (frame shape, chunk size in MiB, expected chunk shape)
+        layouts = [
+            ([16, 32], "0.01", [10, 16, 32]),
+            ([128, 200], "0.01", [1, 64, 50]),
+            ([64, 80], "0.009765625", [1, 64, 80]),
+        ]
+        commands = [
+            ('nxscollect append  %s %s' % (filename, self.flags)).split(),
+            ('nxscollect -x %s -r %s --batch_size 4 --direct_chunk -c0' %
+             (filename, self.flags)).split(),
+        ]
+        wrmodule = WRITERS[self.writer]
+        filewriter.writer = wrmodule
+        for shape, chunksize, chunk in layouts:
+            images = np.array(
+                [[[self.__rnd.randint(0, 3000)
+                   for c in range(shape[1])]
+                  for i in range(shape[0])]
+                 for _ in range(6)],
+                dtype="uint16")
+            try:
+                for i in range(6):
+                    with open("rawtest1_%05d.dat" % i, "w") as fl:
+                        images[i].tofile(fl)
+                for cmd in commands:
+                    nxsfile = filewriter.create_file(
+                        filename, overwrite=True)
+                    rt = nxsfile.root()
+                    rt.create_group("entry12345", "NXentry")
+                    nxsfile.close()
+                    pcmd = list(cmd)
+                    pcmd.extend(["-i", "rawtest1_%05d.dat:0:5"])
+                    pcmd.extend(
+                        ["-p", '/entry12345/instrument/pilatus300k/data'])
+                    pcmd.extend(["--shape", json.dumps(shape)])
+                    pcmd.extend(["--dtype", "uint16"])
+                    pcmd.extend(["--chunk_size", chunksize])
+
+                    old_stdout = sys.stdout
+                    old_stderr = sys.stderr
+                    sys.stdout = mystdout = StringIO()
+                    sys.stderr = mystderr = StringIO()
+                    old_argv = sys.argv
+                    sys.argv = pcmd
+                    nxscollect.main()
+
+                    sys.argv = old_argv
+                    sys.stdout = old_stdout
+                    sys.stderr = old_stderr
+                    vl = mystdout.getvalue()
+                    er = mystderr.getvalue()
+
+                    self.assertEqual('', er)
+                    svl = vl.split("\n")
+                    self.assertEqual(len(svl), 8)
+                    for i in range(1, 7):
+                        self.assertTrue(svl[i].startswith(' * append '))
+                        self.assertTrue(
+                            svl[i].endswith('test1_%05d.dat ' % (i - 1)))
+
+                    if '-r' not in cmd:
+                        os.remove("%s.__nxscollect_old__" % filename)
+                    nxsfile = filewriter.open_file(filename, readonly=True)
+                    rt = nxsfile.root()
+                    dt = rt.open("entry12345").open("instrument").open(
+                        "pilatus300k").open("data")
+                    self.assertEqual(list(dt.chunk), chunk)
+                    buffer = dt.read()
+                    self.assertEqual(buffer.shape, images.shape)
+                    self.assertTrue((buffer == images).all())
+                    nxsfile.close()
+                    os.remove(filename)
+
+            finally:
+                for i in range(6):
+                    os.remove("rawtest1_%05d.dat" % i)
+
+    def test_append_file_parameters_h5_file_cache(self):
+        """ test nxsconfig append file with many images of one hdf5 file
+        """
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        filename = 'testcollect.nxs'
+        h5name = 'h5cachetest.h5'
+        inputfiles = ",".join(
+            "%s://entry/data/data%s" % (h5name, i) for i in range(6))
+        # (command, number of opened hdf5 input files)
+        commands = [
+            (('nxscollect append  %s %s' % (filename, self.flags)).split(),
+             1),
+            (('nxscollect -x %s -r %s --file_cache 0' %
+              (filename, self.flags)).split(), 7),
+            (('nxscollect -x %s -r %s --file_cache 1 --no_chunk_copy' %
+              (filename, self.flags)).split(), 1),
+        ]
+        wrmodule = WRITERS[self.writer]
+        filewriter.writer = wrmodule
+        mlen = [self.__rnd.randint(10, 200), self.__rnd.randint(10, 200)]
+        images = np.array(
+            [[[self.__rnd.randint(0, 3000)
+               for c in range(mlen[1])]
+              for i in range(mlen[0])]
+             for _ in range(6)],
+            dtype="uint32")
+        opened = []
+        open_file = filewriter.open_file
+
+        def _open_file(fname, *args, **kwargs):
+            if fname.endswith(h5name):
+                opened.append(fname)
+            return open_file(fname, *args, **kwargs)
+
+        try:
+            fl = filewriter.create_file(h5name, overwrite=True)
+            rt = fl.root()
+            dt = rt.create_group("entry", "NXentry").create_group(
+                "data", "NXdata")
+            for i in range(6):
+                data = dt.create_field("data%s" % i, "uint32", mlen, mlen)
+                data.write(images[i])
+                data.close()
+            fl.close()
+            filewriter.open_file = _open_file
+            for cmd, nopened in commands:
+                nxsfile = filewriter.create_file(
+                    filename, overwrite=True)
+                rt = nxsfile.root()
+                rt.create_group("entry12345", "NXentry")
+                nxsfile.close()
+                pcmd = list(cmd)
+                pcmd.extend(["-i", inputfiles])
+                pcmd.extend(
+                    ["-p", '/entry12345/instrument/pilatus300k/data'])
+
+                old_stdout = sys.stdout
+                old_stderr = sys.stderr
+                sys.stdout = mystdout = StringIO()
+                sys.stderr = mystderr = StringIO()
+                old_argv = sys.argv
+                sys.argv = pcmd
+                opened[:] = []
+                nxscollect.main()
+
+                sys.argv = old_argv
+                sys.stdout = old_stdout
+                sys.stderr = old_stderr
+                vl = mystdout.getvalue()
+                er = mystderr.getvalue()
+
+                self.assertEqual('', er)
+                svl = vl.split("\n")
+                self.assertEqual(len(svl), 8)
+                for i in range(1, 7):
+                    self.assertTrue(svl[i].startswith(' * append '))
+                    self.assertTrue(svl[i].endswith('%s ' % h5name))
+                self.assertEqual(len(opened), nopened)
+
+                if '-r' not in cmd:
+                    os.remove("%s.__nxscollect_old__" % filename)
+                nxsfile = filewriter.open_file(filename, readonly=True)
+                rt = nxsfile.root()
+                dt = rt.open("entry12345").open("instrument").open(
+                    "pilatus300k").open("data")
+                buffer = dt.read()
+                self.assertEqual(buffer.shape, images.shape)
+                self.assertTrue((buffer == images).all())
+                nxsfile.close()
+                os.remove(filename)
+
+        finally:
+            filewriter.open_file = open_file
+            os.remove(h5name)
+
+    def test_append_file_parameters_h5_selection(self):
+        """ test nxsconfig append file with frame selections of hdf5 fields
+        """
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        filename = 'testcollect.nxs'
+        h5name = 'h5selectiontest.h5'
+        inputfiles = "%s://entry/data/data[2:14:3],%s://entry/data/data[-1]," \
+            "%s://entry/data/data[15:]" % (h5name, h5name, h5name)
+        selected = [2, 5, 8, 11, 19, 15, 16, 17, 18, 19]
+        commands = [
+            ('nxscollect append  %s %s' % (filename, self.flags)).split(),
+            ('nxscollect -x %s -r %s --no_chunk_copy -w 2' %
+             (filename, self.flags)).split(),
+            ('nxscollect -x %s -r %s --virtual --batch_size 4' %
+             (filename, self.flags)).split(),
+        ]
+        wrmodule = WRITERS[self.writer]
+        filewriter.writer = wrmodule
+        mlen = [self.__rnd.randint(10, 200), self.__rnd.randint(10, 200)]
+        images = np.array(
+            [[[self.__rnd.randint(0, 3000)
+               for c in range(mlen[1])]
+              for i in range(mlen[0])]
+             for _ in range(20)],
+            dtype="uint32")
+        try:
+            fl = filewriter.create_file(h5name, overwrite=True)
+            rt = fl.root()
+            dt = rt.create_group("entry", "NXentry").create_group(
+                "data", "NXdata")
+            cfilter = filewriter.data_filter(rt)
+            cfilter.rate = 2
+            data = dt.create_field(
+                "data", "uint32", [20] + mlen, [1] + mlen, cfilter)
+            data.write(images)
+            data.close()
+            fl.close()
+            for cmd in commands:
+                nxsfile = filewriter.create_file(
+                    filename, overwrite=True)
+                rt = nxsfile.root()
+                rt.create_group("entry12345", "NXentry")
+                nxsfile.close()
+                pcmd = list(cmd)
+                pcmd.extend(["-i", inputfiles])
+                pcmd.extend(
+                    ["-p", '/entry12345/instrument/pilatus300k/data'])
+
+                old_stdout = sys.stdout
+                old_stderr = sys.stderr
+                sys.stdout = mystdout = StringIO()
+                sys.stderr = mystderr = StringIO()
+                old_argv = sys.argv
+                sys.argv = pcmd
+                nxscollect.main()
+
+                sys.argv = old_argv
+                sys.stdout = old_stdout
+                sys.stderr = old_stderr
+                vl = mystdout.getvalue()
+                er = mystderr.getvalue()
+
+                self.assertEqual('', er)
+                svl = vl.split("\n")
+                self.assertEqual(len(svl), 5)
+                for i in range(1, 4):
+                    self.assertTrue(svl[i].startswith(' * append '))
+                    self.assertTrue(svl[i].endswith('%s ' % h5name))
+
+                if '-r' not in cmd:
+                    os.remove("%s.__nxscollect_old__" % filename)
+                nxsfile = filewriter.open_file(filename, readonly=True)
+                rt = nxsfile.root()
+                dt = rt.open("entry12345").open("instrument").open(
+                    "pilatus300k").open("data")
+                buffer = dt.read()
+                self.assertEqual(
+                    list(buffer.shape), [len(selected)] + mlen)
+                self.assertTrue((buffer == images[selected]).all())
+                nxsfile.close()
+                os.remove(filename)
+
+        finally:
+            os.remove(h5name)
+
+    def test_append_file_parameters_h5_max_memory(self):
+        """ test nxsconfig append file with blocks of 3D hdf5 fields
+        """
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        filename = 'testcollect.nxs'
+        h5name = 'h5memorytest.h5'
+        inputfiles = "%s://entry/data/data,%s://entry/data/data[1:20:2]" % (
+            h5name, h5name)
+        selected = list(range(20)) + list(range(1, 20, 2))
+        # frames of 2048 bytes, a budget of 3 frames
+        mlen = [16, 32]
+        # (command, number of appended blocks)
+        commands = [
+            (('nxscollect append  %s %s --max_memory 0.005859375' %
+              (filename, self.flags)).split(), 11),
+            (('nxscollect -x %s -r %s --max_memory 0.005859375'
+              ' --no_chunk_copy --batch_size 2' %
+              (filename, self.flags)).split(), 11),
+            (('nxscollect -x %s -r %s --max_memory 0.005859375 -w 2' %
+              (filename, self.flags)).split(), 30),
+            (('nxscollect -x %s -r %s --max_memory 1' %
+              (filename, self.flags)).split(), 2),
+        ]
+        wrmodule = WRITERS[self.writer]
+        filewriter.writer = wrmodule
+        images = np.array(
+            [[[self.__rnd.randint(0, 3000)
+               for c in range(mlen[1])]
+              for i in range(mlen[0])]
+             for _ in range(20)],
+            dtype="uint32")
+        try:
+            fl = filewriter.create_file(h5name, overwrite=True)
+            rt = fl.root()
+            dt = rt.create_group("entry", "NXentry").create_group(
+                "data", "NXdata")
+            cfilter = filewriter.data_filter(rt)
+            cfilter.rate = 2
+            data = dt.create_field(
+                "data", "uint32", [20] + mlen, [1] + mlen, cfilter)
+            data.write(images)
+            data.close()
+            fl.close()
+            for cmd, nblocks in commands:
+                nxsfile = filewriter.create_file(
+                    filename, overwrite=True)
+                rt = nxsfile.root()
+                rt.create_group("entry12345", "NXentry")
+                nxsfile.close()
+                pcmd = list(cmd)
+                pcmd.extend(["-i", inputfiles])
+                pcmd.extend(
+                    ["-p", '/entry12345/instrument/pilatus300k/data'])
+
+                old_stdout = sys.stdout
+                old_stderr = sys.stderr
+                sys.stdout = mystdout = StringIO()
+                sys.stderr = mystderr = StringIO()
+                old_argv = sys.argv
+                sys.argv = pcmd
+                nxscollect.main()
+
+                sys.argv = old_argv
+                sys.stdout = old_stdout
+                sys.stderr = old_stderr
+                vl = mystdout.getvalue()
+                er = mystderr.getvalue()
+
+                self.assertEqual('', er)
+                svl = vl.split("\n")
+                self.assertEqual(len(svl), nblocks + 2)
+                for i in range(1, nblocks + 1):
+                    self.assertTrue(svl[i].startswith(' * append '))
+                    self.assertTrue(svl[i].endswith('%s ' % h5name))
+
+                if '-r' not in cmd:
+                    os.remove("%s.__nxscollect_old__" % filename)
+                nxsfile = filewriter.open_file(filename, readonly=True)
+                rt = nxsfile.root()
+                dt = rt.open("entry12345").open("instrument").open(
+                    "pilatus300k").open("data")
+                buffer = dt.read()
+                self.assertEqual(
+                    list(buffer.shape), [len(selected)] + mlen)
+                self.assertTrue((buffer == images[selected]).all())
+                nxsfile.close()
+                os.remove(filename)
+
+        finally:
+            os.remove(h5name)
+
+    def test_append_file_parameters_raw_missing_frames(self):
+        """ test nxsconfig append file with a map of missing frames
+        """
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        filename = 'testcollect.nxs'
+        commands = [
+            ('nxscollect append  %s %s --missing_frames' %
+             (filename, self.flags)).split(),
+            ('nxscollect -x %s -r %s --fill_value 7' %
+             (filename, self.flags)).split(),
+            ('nxscollect -x %s -r %s --fill_value 7 --batch_size 3'
+             ' --presize' % (filename, self.flags)).split(),
+        ]
+        wrmodule = WRITERS[self.writer]
+        filewriter.writer = wrmodule
+        shape = [self.__rnd.randint(10, 200), self.__rnd.randint(10, 200)]
+        images = np.array(
+            [[[self.__rnd.randint(10, 3000)
+               for c in range(shape[1])]
+              for i in range(shape[0])]
+             for _ in range(8)],
+            dtype="uint16")
+        found = [1, 4, 5, 7]
+        missing = [0, 2, 3, 6]
+        try:
+            for i in found:
+                with open("rawtest1_%05d.dat" % i, "w") as fl:
+                    images[i].tofile(fl)
+            for cmd in commands:
+                nxsfile = filewriter.create_file(
+                    filename, overwrite=True)
+                rt = nxsfile.root()
+                rt.create_group("entry12345", "NXentry")
+                nxsfile.close()
+                pcmd = list(cmd)
+                pcmd.extend(["-i", "rawtest1_%05d.dat:0:7"])
+                pcmd.extend(
+                    ["-p", '/entry12345/instrument/pilatus300k/data'])
+                pcmd.extend(["--shape", json.dumps(shape)])
+                pcmd.extend(["--dtype", "uint16"])
+
+                old_stdout = sys.stdout
+                old_stderr = sys.stderr
+                sys.stdout = mystdout = StringIO()
+                sys.stderr = mystderr = StringIO()
+                old_argv = sys.argv
+                sys.argv = pcmd
+                nxscollect.main()
+
+                sys.argv = old_argv
+                sys.stdout = old_stdout
+                sys.stderr = old_stderr
+                vl = mystdout.getvalue()
+                er = mystderr.getvalue()
+
+                self.assertEqual('', er)
+                svl = vl.split("\n")
+                self.assertEqual(len(svl), 7)
+                self.assertTrue(svl[0].startswith("populate: "))
+                for i, ind in enumerate(found):
+                    self.assertTrue(svl[i + 1].startswith(' * append '))
+                    self.assertTrue(svl[i + 1].endswith(
+                        "rawtest1_%05d.dat " % ind))
+                self.assertEqual(
+                    svl[5], "Missing 4 of 8 files, e.g. rawtest1_00000.dat")
+                self.assertEqual(svl[6], "")
+
+                if '-r' not in cmd:
+                    os.remove("%s.__nxscollect_old__" % filename)
+                nxsfile = filewriter.open_file(filename, readonly=True)
+                rt = nxsfile.root()
+                det = rt.open("entry12345").open("instrument").open(
+                    "pilatus300k")
+                buffer = det.open("data").read()
+                self.assertEqual(
+                    list(det.open("data_missing_frames").read()), missing)
+                if "--fill_value" in cmd:
+                    self.assertEqual(buffer.shape[0], 8)
+                    self.assertTrue((buffer[found] == images[found]).all())
+                    self.assertTrue((buffer[missing] == 7).all())
+                else:
+                    self.assertEqual(buffer.shape[0], 4)
+                    self.assertTrue((buffer == images[found]).all())
+                nxsfile.close()
+                os.remove(filename)
+
+        finally:
+            for i in found:
+                os.remove("rawtest1_%05d.dat" % i)
+
+    def test_append_file_parameters_raw_stats(self):
+        """ test nxsconfig append file with timings of collecting stages
+        """
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        filename = 'testcollect.nxs'
+        statsfile = 'testcollect_stats.json'
+        commands = [
+            ('nxscollect append  %s %s --stats' %
+             (filename, self.flags)).split(),
+            ('nxscollect -x %s -r %s --batch_size 4 --stats'
+             ' --stats_file %s' % (filename, self.flags, statsfile)).split(),
+        ]
+        wrmodule = WRITERS[self.writer]
+        filewriter.writer = wrmodule
+        shape = [self.__rnd.randint(10, 200), self.__rnd.randint(10, 200)]
+        images = np.array(
+            [[[self.__rnd.randint(0, 3000)
+               for c in range(shape[1])]
+              for i in range(shape[0])]
+             for _ in range(6)],
+            dtype="uint16")
+        try:
+            for i in range(6):
+                with open("rawtest1_%05d.dat" % i, "w") as fl:
+                    images[i].tofile(fl)
+            for cmd in commands:
+                nxsfile = filewriter.create_file(
+                    filename, overwrite=True)
+                rt = nxsfile.root()
+                rt.create_group("entry12345", "NXentry")
+                nxsfile.close()
+                pcmd = list(cmd)
+                pcmd.extend(["-i", "rawtest1_%05d.dat:0:5"])
+                pcmd.extend(
+                    ["-p", '/entry12345/instrument/pilatus300k/data'])
+                pcmd.extend(["--shape", json.dumps(shape)])
+                pcmd.extend(["--dtype", "uint16"])
+
+                old_stdout = sys.stdout
+                old_stderr = sys.stderr
+                sys.stdout = mystdout = StringIO()
+                sys.stderr = mystderr = StringIO()
+                old_argv = sys.argv
+                sys.argv = pcmd
+                nxscollect.main()
+
+                sys.argv = old_argv
+                sys.stdout = old_stdout
+                sys.stderr = old_stderr
+                vl = mystdout.getvalue()
+                er = mystderr.getvalue()
+
+                self.assertEqual('', er)
+                svl = vl.split("\n")
+                self.assertEqual(len(svl), 17)
+                for i in range(1, 7):
+                    self.assertTrue(svl[i].startswith(' * append '))
+                self.assertTrue(svl[7].startswith("stats: %s (" % filename))
+                for i, stage in enumerate(
+                        ["find", "wait", "decode", "write", "grow",
+                         "flush"]):
+                    self.assertTrue(svl[8 + i].startswith("  %s " % stage))
+                self.assertTrue(svl[14].startswith("  frames: 6 in "))
+                self.assertTrue(svl[15].startswith(
+                    "  bytes in: %s, bytes out: " % images.nbytes))
+
+                if '-r' not in cmd:
+                    os.remove("%s.__nxscollect_old__" % filename)
+                else:
+                    with open(statsfile) as fl:
+                        stats = json.load(fl)
+                    self.assertEqual(len(stats), 1)
+                    stats = stats[0]
+                    self.assertEqual(stats["file"], filename)
+                    self.assertEqual(stats["frames"], 6)
+                    self.assertEqual(stats["bytes_in"], images.nbytes)
+                    self.assertTrue(stats["bytes_out"] > 0)
+                    self.assertTrue(stats["compression_ratio"] > 0)
+                    self.assertTrue(stats["frames_per_second"] > 0)
+                    self.assertEqual(stats["stages"]["find"]["calls"], 6)
+                    self.assertEqual(stats["stages"]["decode"]["calls"], 6)
+                    self.assertEqual(stats["stages"]["write"]["calls"], 2)
+                    self.assertEqual(stats["stages"]["grow"]["calls"], 2)
+                    self.assertEqual(stats["stages"]["flush"]["calls"], 2)
+                    self.assertEqual(stats["stages"]["wait"]["calls"], 0)
+                    for stage in stats["stages"].values():
+                        self.assertTrue(stage["time"] >= 0)
+                    self.assertEqual(len(stats["images"]), 6)
+                    for i, image in enumerate(stats["images"]):
+                        self.assertTrue(image["file"].endswith(
+                            "rawtest1_%05d.dat" % i))
+                        self.assertEqual(
+                            image["bytes"], images[i].nbytes)
+                        # writing of batches is shared by their images
+                        for stage in ["find", "decode", "write", "grow",
+                                      "flush"]:
+                            self.assertTrue(stage in image)
+                            self.assertTrue(image[stage] >= 0)
+                        self.assertTrue("wait" not in image)
+                    self.assertAlmostEqual(
+                        sum(image["write"] for image in stats["images"]),
+                        stats["stages"]["write"]["time"])
+                    os.remove(statsfile)
+                nxsfile = filewriter.open_file(filename, readonly=True)
+                rt = nxsfile.root()
+                dt = rt.open("entry12345").open("instrument").open(
+                    "pilatus300k").open("data")
+                buffer = dt.read()
+                self.assertTrue((buffer == images).all())
+                nxsfile.close()
+                os.remove(filename)
+
+        finally:
+            for i in range(6):
+                os.remove("rawtest1_%05d.dat" % i)
+
+    def test_prefetch(self):
+        """ test prefetch and readahead of input files
+        """
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        fname = "prefetchtest.dat"
+        with open(fname, "w") as fl:
+            fl.write("0123456789" * 1000)
+        try:
+            self.assertTrue(nxscollect.prefetch(fname))
+            self.assertTrue(not nxscollect.prefetch(fname + "_missing"))
+        finally:
+            os.remove(fname)
+
+        called = []
+        for depth in [0, 1, 3, 20]:
+            called[:] = []
+            items = list(nxscollect.readahead(
+                iter(range(10)), depth, called.append))
+            self.assertEqual(items, list(range(10)))
+            # prefetching of consumed items can be cancelled
+            self.assertEqual(called, sorted(set(called)))
+            self.assertTrue(set(called) <= set(range(10)))
+            if not depth:
+                self.assertEqual(called, [])
+
+    def test_locatefile_rules(self):
+        """ test lookup of input files by cached rules and directory listings
+        """
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        dirname = os.path.abspath("locatefiletest")
+        master = os.path.join(dirname, "master.nxs")
+        detdir = os.path.join(dirname, "master", "det")
+        os.makedirs(detdir)
+        try:
+            collector = nxscollect.Collector(
+                master, writer=self.writer)
+            collector._Collector__fullfilename = master
+            rules = collector._Collector__rules
+            for i in [0, 1, 2, 4]:
+                with open(os.path.join(dirname, "img_%05d.dat" % i),
+                          "w") as fl:
+                    fl.write("%s" % i)
+
+            calls = []
+            exists = os.path.exists
+            stat = os.stat
+            listdir = collector._listdir
+
+            def cexists(name):
+                calls.append("exists")
+                try:
+                    stat(name)
+                except OSError:
+                    return False
+                return True
+
+            def cstat(name, *args, **kwargs):
+                calls.append("stat")
+                return stat(name, *args, **kwargs)
+
+            def clistdir(name):
+                calls.append("list")
+                return listdir(name)
+
+            collector._listdir = clistdir
+            os.path.exists = cexists
+            os.stat = cstat
+            try:
+                # the first file is searched by stat calls
+                fname, checked = collector._locatefile(
+                    "img_00000.dat", "det")
+                self.assertEqual(
+                    fname, os.path.join(dirname, "img_00000.dat"))
+                self.assertEqual(
+                    checked, [os.path.join(detdir, "img_00000.dat")] * 2)
+                self.assertEqual(rules, {("det", ""): 2})
+                self.assertEqual(calls, ["exists"] * 3)
+
+                # the next ones are looked up in the listing of the rule
+                # without checking candidates with higher priority
+                with open(os.path.join(detdir, "img_00001.dat"), "w") as fl:
+                    fl.write("1")
+                calls[:] = []
+                for i in [1, 2]:
+                    fname, checked = collector._locatefile(
+                        "img_%05d.dat" % i, "det")
+                    self.assertEqual(
+                        fname, os.path.join(dirname, "img_%05d.dat" % i))
+                    self.assertEqual(checked, [])
+                self.assertEqual(rules, {("det", ""): 2})
+                self.assertEqual(calls, ["list"])
+
+                # files created after the directory was listed are found
+                # in its new listing of the next batch
+                collector._Collector__relisted = set()
+                with open(os.path.join(dirname, "img_00003.dat"), "w") as fl:
+                    fl.write("3")
+                calls[:] = []
+                fname, checked = collector._locatefile("img_00003.dat", "det")
+                self.assertEqual(fname, os.path.join(dirname, "img_00003.dat"))
+                self.assertEqual(checked, [])
+                self.assertEqual(calls, ["list"])
+                calls[:] = []
+                fname, checked = collector._locatefile("img_00004.dat", "det")
+                self.assertEqual(fname, os.path.join(dirname, "img_00004.dat"))
+                self.assertEqual(calls, [])
+
+                # a file absent from the fresh listings is missing
+                calls[:] = []
+                fname, checked = collector._locatefile("img_00005.dat", "det")
+                self.assertEqual(fname, None)
+                self.assertEqual(len(checked), 5)
+                self.assertEqual(calls, ["list", "list"])
+                calls[:] = []
+                fname, checked = collector._locatefile("img_00005.dat", "det")
+                self.assertEqual(fname, None)
+                self.assertEqual(calls, [])
+
+                # the rule is changed by a listing of the next batch
+                collector._Collector__relisted = set()
+                with open(os.path.join(detdir, "img_00006.dat"), "w") as fl:
+                    fl.write("6")
+                calls[:] = []
+                fname, checked = collector._locatefile("img_00006.dat", "det")
+                self.assertEqual(fname, os.path.join(detdir, "img_00006.dat"))
+                self.assertEqual(checked, [])
+                self.assertEqual(rules, {("det", ""): 0})
+                self.assertEqual(calls, ["list", "list"])
+
+                # files of a running acquisition are checked again
+                collector._Collector__follow = True
+                with open(os.path.join(detdir, "img_00007.dat"), "w") as fl:
+                    fl.write("7")
+                calls[:] = []
+                fname, checked = collector._locatefile("img_00007.dat", "det")
+                self.assertEqual(fname, os.path.join(detdir, "img_00007.dat"))
+                self.assertEqual(rules, {("det", ""): 0})
+                self.assertEqual(calls, ["exists"])
+            finally:
+                os.path.exists = exists
+                os.stat = stat
+        finally:
+            shutil.rmtree(dirname)
+
+    def test_collector_options(self):
+        """ test collector options given by option objects
+        """
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        collector = nxscollect.Collector("testcollect.nxs")
+        self.assertEqual(collector._Collector__workers, 1)
+        self.assertEqual(collector._Collector__batchsize, 1)
+        self.assertEqual(collector._Collector__flushframes, 1)
+        self.assertEqual(collector._Collector__chunkcopy, True)
+        self.assertEqual(collector._Collector__mmap, False)
+        self.assertEqual(collector._Collector__follow, False)
+        self.assertEqual(collector._Collector__timeout, 60.)
+        self.assertEqual(collector._Collector__filecache, 16)
+        self.assertEqual(collector._Collector__missingframes, False)
+        self.assertEqual(collector._Collector__concurrentfields, 1)
+
+        collector = nxscollect.Collector(
+            "testcollect.nxs",
+            readoptions=nxscollect.ReadOptions(
+                workers=0, chunkcopy=False, filecache=4, maxmemory=1000,
+                prefetch=3),
+            writeoptions=nxscollect.WriteOptions(
+                batchsize=4, flushframes=8, flushtime=2., presize=True,
+                directchunk=True, virtual=True, chunksize=2048,
+                concurrentfields=3),
+            followoptions=nxscollect.FollowOptions(
+                follow=True, timeout=5., pollinterval=.5),
+            recoveryoptions=nxscollect.RecoveryOptions(
+                inplace=True, resume=True, fillvalue=-1))
+        self.assertEqual(collector._Collector__workers, 1)
+        self.assertEqual(collector._Collector__chunkcopy, False)
+        self.assertEqual(collector._Collector__maxmemory, 1000)
+        self.assertEqual(collector._Collector__batchsize, 4)
+        self.assertEqual(collector._Collector__flushframes, 8)
+        self.assertEqual(collector._Collector__flushtime, 2.)
+        self.assertEqual(collector._Collector__presize, True)
+        # raw chunks are written from mapped files
+        self.assertEqual(collector._Collector__mmap, True)
+        self.assertEqual(collector._Collector__directchunk, True)
+        self.assertEqual(collector._Collector__virtual, True)
+        self.assertEqual(collector._Collector__chunksize, 2048)
+        self.assertEqual(collector._Collector__concurrentfields, 3)
+        self.assertEqual(collector._Collector__follow, True)
+        self.assertEqual(collector._Collector__timeout, 5.)
+        self.assertEqual(collector._Collector__pollinterval, .5)
+        # files growing in the follow mode are not cached or prefetched
+        self.assertEqual(collector._Collector__filecache, 0)
+        self.assertEqual(collector._Collector__prefetch, 0)
+        self.assertEqual(collector._Collector__inplace, True)
+        self.assertEqual(collector._Collector__resume, True)
+        self.assertEqual(collector._Collector__fillvalue, -1)
+        self.assertEqual(collector._Collector__missingframes, True)
+
+        # the follow mode appends input files as the resume mode
+        collector = nxscollect.Collector(
+            "testcollect.nxs",
+            followoptions=nxscollect.FollowOptions(follow=True))
+        self.assertEqual(collector._Collector__resume, True)
+
+    def test_collectframe_state(self):
+        """ test appending frames and missing frames to a field state
+        """
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        filename = 'testcollect.nxs'
+        wrmodule = WRITERS[self.writer]
+        filewriter.writer = wrmodule
+        images = np.array(
+            [[[self.__rnd.randint(0, 3000) for c in range(5)]
+              for i in range(4)]
+             for _ in range(3)],
+            dtype="uint16")
+        old_stdout = sys.stdout
+        try:
+            nxsfile = filewriter.create_file(filename, overwrite=True)
+            entry = nxsfile.root().create_group("entry12345", "NXentry")
+            collector = nxscollect.Collector(
+                filename, writer=self.writer,
+                writeoptions=nxscollect.WriteOptions(batchsize=2),
+                recoveryoptions=nxscollect.RecoveryOptions(fillvalue=7))
+            collector._Collector__nxsfile = nxsfile
+            state = nxscollect.FieldState(entry, "data")
+            sys.stdout = mystdout = StringIO()
+
+            # missing frames before the field exists are filled later
+            state.nitems += 1
+            collector._collectmissing(
+                state, nxscollect.MissingFile("img_0.dat"), None)
+            self.assertEqual(state.leading, 1)
+            self.assertEqual(state.ind, 1)
+            self.assertEqual(state.missing, [0])
+            self.assertEqual(state.progress, (1, ("img_0.dat", None)))
+
+            for i, image in enumerate(images):
+                state.nitems += 1
+                collector._collectframe(
+                    state, "img_%s.dat" % (i + 1), None, image,
+                    "uint16", list(image.shape))
+                if i == 0:
+                    # the buffer keeps the first frame for the batch
+                    self.assertEqual(len(state.pending), 1)
+                    self.assertEqual(state.progress, (1, ("img_0.dat", None)))
+            self.assertEqual(state.ind, 4)
+            self.assertEqual(len(state.pending), 1)
+            self.assertEqual(state.progress, (3, ("img_2.dat", None)))
+            collector._finishfield(state)
+            self.assertEqual(len(state.pending), 0)
+            self.assertEqual(state.progress, (4, ("img_3.dat", None)))
+            sys.stdout = old_stdout
+            self.assertEqual(
+                mystdout.getvalue().split("\n"),
+                [" * append img_%s.dat " % i for i in range(1, 4)] +
+                ["Missing 1 of 4 files, e.g. img_0.dat", ""])
+
+            buffer = entry.open("data").read()
+            self.assertEqual(buffer.shape, (4, 4, 5))
+            self.assertTrue((buffer[0] == 7).all())
+            self.assertTrue((buffer[1:] == images).all())
+            self.assertEqual(
+                [int(ind) for ind in
+                 np.ravel(entry.open("data_missing_frames").read())], [0])
+            nxsfile.close()
+        finally:
+            sys.stdout = old_stdout
+            if os.path.isfile(filename):
+                os.remove(filename)
+
+    def test_getcompression_presets(self):
+        """ test getcompression with presets of filter plugins
+        """
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        self.assertEqual(nxscollect.getcompression("3"), 3)
+        self.assertEqual(nxscollect.getcompression("bslz4"), [32008, 0, 2])
+        self.assertEqual(nxscollect.getcompression("lz4"), [32004, 0])
+        self.assertEqual(
+            nxscollect.getcompression("blosc"),
+            [32001, 0, 0, 0, 0, 5, 1, 1])
+        self.assertRaises(
+            Exception, nxscollect.getcompression, "zstd")
+        self.assertEqual(nxscollect.chunkshape([10], 4, 100), [2, 10])
+        self.assertEqual(
+            nxscollect.chunkshape([4096, 4362], 4, 4 * 1024 * 1024),
+            [1, 1024, 546])
+
+    def test_append_file_parameters_raw_mmap(self):
+        """ test nxsconfig append file with memory mapped raw data
+        """
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        filename = 'testcollect.nxs'
+        attrs = {
+            "int": [-123, "NX_INT", "int64", (1,)],
+            "int8": [12, "NX_INT8", "int8", (1,)],
+            "int16": [-123, "NX_INT16", "int16", (1,)],
+            "int32": [12345, "NX_INT32", "int32", (1,)],
+            "int64": [-12345, "NX_INT64", "int64", (1,)],
+            "uint": [123, "NX_UINT", "uint64", (1,)],
+            "uint8": [12, "NX_UINT8", "uint8", (1,)],
+            "uint16": [123, "NX_UINT16", "uint16", (1,)],
+            "uint32": [12345, "NX_UINT32", "uint32", (1,)],
+            "uint64": [12345, "NX_UINT64", "uint64", (1,)],
+            "float": [-12.345, "NX_FLOAT", "float64", (1,), 1.e-14],
+            "number": [-12.345e+2, "NX_NUMBER", "float64", (1,), 1.e-14],
+            "float32": [-12.345e-1, "NX_FLOAT32", "float32", (1,), 1.e-5],
+            "float64": [-12.345, "NX_FLOAT64", "float64", (1,), 1.e-14],
+        }
+
+        commands = [
+            ('nxscollect append  %s %s --mmap' %
+             (filename, self.flags)).split(),
+            ('nxscollect -x %s -r %s --mmap -c0' %
+             (filename, self.flags)).split(),
+            ('nxscollect append  %s -s %s --direct_chunk' %
+             (filename, self.flags)).split(),
+            ('nxscollect -x %s -r %s --direct_chunk -c0' %
+             (filename, self.flags)).split(),
+            ('nxscollect -x %s -r %s --direct_chunk -c0 --presize' %
+             (filename, self.flags)).split(),
+            ('nxscollect append  %s -r -s %s --direct_chunk -c 0'
+             ' --batch_size 4 -w 2' %
+             (filename, self.flags)).split(),
+        ]
+        wrmodule = WRITERS[self.writer]
+        filewriter.writer = wrmodule
+        for k in attrs.keys():
+            mlen = [self.__rnd.randint(10, 200),
+                    self.__rnd.randint(10, 200)]
+
+            attrs[k][0] = np.array(
+                [[[attrs[k][0] * self.__rnd.randint(0, 3)
+                   for c in range(mlen[1])]
+                  for i in range(mlen[0])]
+                 for _ in range(6)],
+                dtype=attrs[k][2]
+                )
+            try:
+                for i in range(6):
+                    with open("rawtest1_%05d.dat" % i, "w") as fl:
+                        attrs[k][0][i].tofile(fl)
+                for cmd in commands:
+                    nxsfile = filewriter.create_file(
+                        filename, overwrite=True)
+                    rt = nxsfile.root()
+                    entry = rt.create_group("entry12345", "NXentry")
+                    # to be created
+                    # ins = entry.create_group("instrument", "NXinstrument")
+                    # det = ins.create_group("pilatus300k", "NXdetector")
+                    entry.create_group("data", "NXdata")
+                    nxsfile.close()
+                    pcmd = cmd
+                    pcmd.extend(["-i", "rawtest1_%05d.dat:0:5"])
+                    pcmd.extend(
+                        ["-p", '/entry12345/instrument/pilatus300k/data'])
+                    pcmd.extend(
+                        ["--shape", json.dumps(attrs[k][0].shape[1:])])
+                    pcmd.extend(
+                        ["--dtype", attrs[k][2]])
+
+                    old_stdout = sys.stdout
+                    old_stderr = sys.stderr
+                    sys.stdout = mystdout = StringIO()
+                    sys.stderr = mystderr = StringIO()
+                    old_argv = sys.argv
+                    sys.argv = pcmd
+                    nxscollect.main()
+
+                    sys.argv = old_argv
+                    sys.stdout = old_stdout
+                    sys.stderr = old_stderr
+                    vl = mystdout.getvalue()
+                    er = mystderr.getvalue()
+
+                    self.assertEqual('', er)
+                    self.assertTrue(vl)
+                    svl = vl.split("\n")
+                    self.assertEqual(len(svl), 8)
+                    self.assertTrue(
+                        svl[0],
+                        "populate: /entry12345:NXentry/"
+                        "instrument:NXinstrument/pilatus300k:NXdetector"
+                        "/data with ['test1_%05d.cbf:0:5']")
+                    for i in range(1, 6):
+                        self.assertTrue(svl[i].startswith(' * append '))
+                        self.assertTrue(
+                            svl[i].endswith('test1_%05d.dat ' % (i - 1)))
+
+                    if '-r' not in cmd:
+                        os.remove("%s.__nxscollect_old__" % filename)
+                    nxsfile = filewriter.open_file(filename, readonly=True)
+                    rt = nxsfile.root()
+                    entry = rt.open("entry12345")
+                    ins = entry.open("instrument")
+                    det = ins.open("pilatus300k")
+                    dt = det.open("data")
+                    buffer = dt.read()
+                    self.assertEqual(buffer.shape, attrs[k][0].shape)
+                    for i in range(6):
+                        fimage = attrs[k][0][i]
+                        image = buffer[i, :, :]
+                        self.assertTrue((image == fimage).all())
+                    nxsfile.close()
+                    os.remove(filename)
+
+            finally:
+                for i in range(6):
+                    os.remove("rawtest1_%05d.dat" % i)
+
+    def test_append_file_parameters_raw_in_place(self):
+        """ test nxsconfig append file in place with raw data
+        """
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        filename = 'testcollect.nxs'
+        attrs = {
+            "int8": [12, "NX_INT8", "int8", (1,)],
+            "uint16": [123, "NX_UINT16", "uint16", (1,)],
+            "int64": [-12345, "NX_INT64", "int64", (1,)],
+            "float32": [-12.345e-1, "NX_FLOAT32", "float32", (1,), 1.e-5],
+        }
+
+        commands = [
+            ('nxscollect append  %s -r --in_place %s' %
+             (filename, self.flags)).split(),
+            ('nxscollect -x %s -r --in_place --batch_size 3 %s' %
+             (filename, self.flags)).split(),
+            ('nxscollect append  %s --in_place %s' %
+             (filename, self.flags)).split(),
+        ]
+        wrmodule = WRITERS[self.writer]
+        filewriter.writer = wrmodule
+        for k in attrs.keys():
+            mlen = [self.__rnd.randint(10, 200),
+                    self.__rnd.randint(10, 200)]
+
+            attrs[k][0] = np.array(
+                [[[attrs[k][0] * self.__rnd.randint(0, 3)
+                   for c in range(mlen[1])]
+                  for i in range(mlen[0])]
+                 for _ in range(6)],
+                dtype=attrs[k][2]
+                )
+            try:
+                for i in range(6):
+                    with open("rawtest1_%05d.dat" % i, "w") as fl:
+                        attrs[k][0][i].tofile(fl)
+                for cmd in commands:
+                    nxsfile = filewriter.create_file(
+                        filename, overwrite=True)
+                    rt = nxsfile.root()
+                    entry = rt.create_group("entry12345", "NXentry")
+                    entry.create_group("data", "NXdata")
+                    nxsfile.close()
+                    # the last file is missing
+                    for files in ["rawtest1_%05d.dat:0:6",
+                                  "rawtest1_%05d.dat:0:5"]:
+                        pcmd = list(cmd)
+                        pcmd.extend(["-i", files])
+                        pcmd.extend(
+                            ["-p", '/entry12345/instrument/pilatus300k/data'])
+                        pcmd.extend(
+                            ["--shape", json.dumps(attrs[k][0].shape[1:])])
+                        pcmd.extend(
+                            ["--dtype", attrs[k][2]])
+
+                        old_stdout = sys.stdout
+                        old_stderr = sys.stderr
+                        sys.stdout = mystdout = StringIO()
+                        sys.stderr = mystderr = StringIO()
+                        old_argv = sys.argv
+                        sys.argv = pcmd
+                        nxscollect.main()
+
+                        sys.argv = old_argv
+                        sys.stdout = old_stdout
+                        sys.stderr = old_stderr
+                        vl = mystdout.getvalue()
+                        er = mystderr.getvalue()
+
+                        self.assertEqual('', er)
+                        self.assertTrue(vl)
+                        self.assertEqual(
+                            sorted(fl for fl in os.listdir(".")
+                                   if fl.startswith(filename + ".")),
+                            ["%s.__nxscollect_old__" % filename]
+                            if '-r' not in cmd and files.endswith("5")
+                            else [])
+                        nxsfile = filewriter.open_file(
+                            filename, readonly=True)
+                        rt = nxsfile.root()
+                        entry = rt.open("entry12345")
+                        if files.endswith("6"):
+                            self.assertEqual(
+                                sorted(entry.names()), ["data"])
+                            nxsfile.close()
+                            continue
+                        svl = vl.split("\n")
+                        self.assertEqual(len(svl), 8)
+                        for i in range(1, 6):
+                            self.assertTrue(
+                                svl[i].startswith(' * append '))
+                            self.assertTrue(
+                                svl[i].endswith(
+                                    'test1_%05d.dat ' % (i - 1)))
+                        ins = entry.open("instrument")
+                        det = ins.open("pilatus300k")
+                        dt = det.open("data")
+                        buffer = dt.read()
+                        self.assertEqual(buffer.shape, attrs[k][0].shape)
+                        for i in range(6):
+                            fimage = attrs[k][0][i]
+                            image = buffer[i, :, :]
+                            self.assertTrue((image == fimage).all())
+                        nxsfile.close()
+                    if '-r' not in cmd:
+                        os.remove("%s.__nxscollect_old__" % filename)
+                    os.remove(filename)
+
+            finally:
+                for i in range(6):
+                    os.remove("rawtest1_%05d.dat" % i)
+
+    def test_append_file_parameters_raw_resume(self):
+        """ test nxsconfig append file incrementally with raw data
+        """
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        filename = 'testcollect.nxs'
+        attrs = {
+            "int8": [12, "NX_INT8", "int8", (1,)],
+            "uint16": [123, "NX_UINT16", "uint16", (1,)],
+            "int64": [-12345, "NX_INT64", "int64", (1,)],
+            "float32": [-12.345e-1, "NX_FLOAT32", "float32", (1,), 1.e-5],
+        }
+
+        commands = [
+            ('nxscollect append  %s -r --resume %s' %
+             (filename, self.flags)).split(),
+            ('nxscollect -x %s -r --resume --batch_size 2 -w 2 %s' %
+             (filename, self.flags)).split(),
+            ('nxscollect append  %s -r --resume --flush_frames 0 %s' %
+             (filename, self.flags)).split(),
+        ]
+        wrmodule = WRITERS[self.writer]
+        filewriter.writer = wrmodule
+        for k in attrs.keys():
+            mlen = [self.__rnd.randint(10, 200),
+                    self.__rnd.randint(10, 200)]
+
+            attrs[k][0] = np.array(
+                [[[attrs[k][0] * self.__rnd.randint(0, 3)
+                   for c in range(mlen[1])]
+                  for i in range(mlen[0])]
+                 for _ in range(6)],
+                dtype=attrs[k][2]
+                )
+            try:
+                for cmd in commands:
+                    for i in range(6):
+                        with open("rawtest1_%05d.dat" % i, "w") as fl:
+                            attrs[k][0][i].tofile(fl)
+                    nxsfile = filewriter.create_file(
+                        filename, overwrite=True)
+                    rt = nxsfile.root()
+                    entry = rt.create_group("entry12345", "NXentry")
+                    entry.create_group("data", "NXdata")
+                    nxsfile.close()
+                    for first, last in [(0, 2), (3, 5), (6, 5)]:
+                        pcmd = list(cmd)
+                        pcmd.extend(["-i", "rawtest1_%05d.dat:0:" + str(last)])
+                        pcmd.extend(
+                            ["-p", '/entry12345/instrument/pilatus300k/data'])
+                        pcmd.extend(
+                            ["--shape", json.dumps(attrs[k][0].shape[1:])])
+                        pcmd.extend(
+                            ["--dtype", attrs[k][2]])
+
+                        old_stdout = sys.stdout
+                        old_stderr = sys.stderr
+                        sys.stdout = mystdout = StringIO()
+                        sys.stderr = mystderr = StringIO()
+                        old_argv = sys.argv
+                        sys.argv = pcmd
+                        nxscollect.main()
+
+                        sys.argv = old_argv
+                        sys.stdout = old_stdout
+                        sys.stderr = old_stderr
+                        vl = mystdout.getvalue()
+                        er = mystderr.getvalue()
+
+                        self.assertEqual('', er)
+                        self.assertTrue(vl)
+                        svl = vl.split("\n")
+                        self.assertEqual(len(svl), last - first + 3)
+                        for i in range(first, last + 1):
+                            line = svl[i - first + 1]
+                            self.assertTrue(line.startswith(' * append '))
+                            self.assertTrue(
+                                line.endswith('test1_%05d.dat ' % i))
+                        # collected files are not read again
+                        for i in range(first, last + 1):
+                            with open("rawtest1_%05d.dat" % i, "w") as fl:
+                                pass
+
+                    nxsfile = filewriter.open_file(filename, readonly=True)
+                    rt = nxsfile.root()
+                    entry = rt.open("entry12345")
+                    ins = entry.open("instrument")
+                    det = ins.open("pilatus300k")
+                    dt = det.open("data")
+                    buffer = dt.read()
+                    self.assertEqual(buffer.shape, attrs[k][0].shape)
+                    for i in range(6):
+                        fimage = attrs[k][0][i]
+                        image = buffer[i, :, :]
+                        self.assertTrue((image == fimage).all())
+                    nxsfile.close()
+                    os.remove(filename)
+
+            finally:
+                for i in range(6):
+                    os.remove("rawtest1_%05d.dat" % i)
+
+    def test_append_file_parameters_raw_resume_rollback(self):
+        """ test nxsconfig append file incrementally in place
+        after a failed run which is rolled back
+        """
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        filename = 'testcollect.nxs'
+        cmd = ('nxscollect append  %s -r --in_place --resume --missing_frames'
+               ' %s' % (filename, self.flags)).split()
+        wrmodule = WRITERS[self.writer]
+        filewriter.writer = wrmodule
+        shape = [self.__rnd.randint(10, 50), self.__rnd.randint(10, 50)]
+        images = np.array(
+            [[[self.__rnd.randint(0, 3000)
+               for c in range(shape[1])]
+              for i in range(shape[0])]
+             for _ in range(6)],
+            dtype="uint16")
+        try:
+            for i in range(6):
+                if i != 1:
+                    with open("rawtest1_%05d.dat" % i, "w") as fl:
+                        images[i].tofile(fl)
+            # the input file 4 is broken during the second run
+            with open("rawtest1_00004.dat", "w") as fl:
+                images[4][:2].tofile(fl)
+            nxsfile = filewriter.create_file(filename, overwrite=True)
+            rt = nxsfile.root()
+            rt.create_group("entry12345", "NXentry")
+            nxsfile.close()
+            appended = []
+            for last in [2, 5, 5]:
+                if appended == [[0, 2], []]:
+                    with open("rawtest1_00004.dat", "w") as fl:
+                        images[4].tofile(fl)
+                pcmd = list(cmd)
+                pcmd.extend(["-i", "rawtest1_%05d.dat:0:" + str(last)])
+                pcmd.extend(
+                    ["-p", '/entry12345/instrument/pilatus300k/data'])
+                pcmd.extend(["--shape", json.dumps(shape)])
+                pcmd.extend(["--dtype", "uint16"])
+
+                old_stdout = sys.stdout
+                old_stderr = sys.stderr
+                sys.stdout = mystdout = StringIO()
+                sys.stderr = mystderr = StringIO()
+                old_argv = sys.argv
+                sys.argv = pcmd
+                nxscollect.main()
+
+                sys.argv = old_argv
+                sys.stdout = old_stdout
+                sys.stderr = old_stderr
+                vl = mystdout.getvalue()
+                er = mystderr.getvalue()
+
+                self.assertEqual('', er)
+                self.assertEqual(
+                    [fl for fl in os.listdir(".")
+                     if fl.startswith(filename + ".")], [])
+                nxsfile = filewriter.open_file(filename, readonly=True)
+                det = nxsfile.root().open("entry12345").open(
+                    "instrument").open("pilatus300k")
+                dt = det.open("data")
+                buffer = dt.read()
+                missing = [int(ind) for ind in np.ravel(
+                    det.open("data_missing_frames").read())]
+                progress = dt.attributes["nxscollect_progress"][...]
+                if isinstance(progress, bytes):
+                    progress = progress.decode()
+                progress = json.loads(progress)
+                nxsfile.close()
+                appended.append(
+                    [int(line.split("rawtest1_")[1].split(".")[0])
+                     for line in vl.split("\n")
+                     if line.startswith(" * append ")
+                     and "Cannot" not in vl])
+                # the failed run is rolled back with its progress
+                if len(appended) < 3:
+                    self.assertEqual(buffer.shape[0], 2)
+                    self.assertEqual(progress["files"], 3)
+                    self.assertEqual(progress["frames"], 2)
+                    for i, ind in enumerate([0, 2]):
+                        self.assertTrue((buffer[i] == images[ind]).all())
+                self.assertEqual(missing, [1])
+            self.assertEqual(appended, [[0, 2], [], [3, 4, 5]])
+            self.assertEqual(buffer.shape[0], 5)
+            for i, ind in enumerate([0, 2, 3, 4, 5]):
+                self.assertTrue((buffer[i] == images[ind]).all())
+            self.assertEqual(progress["files"], 6)
+            self.assertEqual(progress["frames"], 5)
+        finally:
+            for i in range(6):
+                if os.path.exists("rawtest1_%05d.dat" % i):
+                    os.remove("rawtest1_%05d.dat" % i)
+            if os.path.exists(filename):
+                os.remove(filename)
+
+    def test_journal_rollback(self):
+        """ test rollback of attributes and replaced fields of the journal
+        """
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        filename = 'testcollect.nxs'
+        jname = filename + ".__nxscollect_journal__"
+        wrmodule = WRITERS[self.writer]
+        filewriter.writer = wrmodule
+        try:
+            nxsfile = filewriter.create_file(filename, overwrite=True)
+            entry = nxsfile.root().create_group("entry12345", "NXentry")
+            data = entry.create_field("data", "uint16", [3, 2], [1, 2])
+            data.attributes.create("progress", "string").write("old")
+            data.attributes.create("count", "int32").write(5)
+            data.attributes.create("offset", "float64", [3]).write(
+                np.array([1.5, 2.5, -3.], dtype="float64"))
+            entry.create_field(
+                "data_missing", "int64", [2], [2]).write(
+                    np.array([4, 7], dtype="int64"))
+
+            journal = nxscollect.Journal(jname)
+            journal.setattribute(data, "progress")
+            journal.setattribute(data, "other")
+            journal.setattribute(data, "count")
+            journal.setattribute(data, "offset")
+            journal.replace(entry, "data_missing")
+            journal.extend(data)
+            # initial values are recorded only once
+            data.attributes.create(
+                "progress", "string", overwrite=True).write("new")
+            journal.setattribute(data, "progress")
+            entry.remove("data_missing")
+            journal.create(entry, "data_missing")
+            entry.create_field("data_missing", "int64", [1], [1]).write(
+                np.array([9], dtype="int64"))
+            journal.create(entry, "data_new")
+            entry.create_field("data_new", "int64", [1], [1])
+            data.attributes.create("other", "string").write("new")
+            data.attributes.create(
+                "count", "string", overwrite=True).write("new")
+            data.attributes.create(
+                "offset", "int64", [2], overwrite=True).write(
+                    np.array([3, 4], dtype="int64"))
+            data.grow(0, 2)
+            self.assertEqual(journal.changed, True)
+
+            # the journal of an interrupted run is read by the next one
+            journal = nxscollect.Journal(jname)
+            self.assertEqual(journal.created, ["/entry12345/data_new"])
+            journal.rollback(nxsfile.root())
+            self.assertEqual(journal.changed, False)
+            journal.remove()
+            self.assertTrue(not os.path.exists(jname))
+
+            self.assertEqual(list(data.shape), [3, 2])
+            self.assertEqual(
+                sorted(entry.names()), ["data", "data_missing"])
+            self.assertEqual(
+                [int(ind) for ind in
+                 np.ravel(entry.open("data_missing").read())], [4, 7])
+            # attributes created by the run are removed
+            self.assertEqual(
+                sorted(data.attributes.names()),
+                ["count", "offset", "progress"])
+            progress = data.attributes["progress"][...]
+            if isinstance(progress, bytes):
+                progress = progress.decode()
+            self.assertEqual(progress, "old")
+            # other attributes are restored with their data types
+            self.assertEqual(data.attributes["count"].dtype, "int32")
+            self.assertEqual(
+                int(np.ravel(data.attributes["count"][...])[0]), 5)
+            self.assertEqual(data.attributes["offset"].dtype, "float64")
+            self.assertEqual(list(data.attributes["offset"].shape), [3])
+            self.assertEqual(
+                list(np.ravel(data.attributes["offset"][...])),
+                [1.5, 2.5, -3.])
+            nxsfile.close()
+        finally:
+            for fname in [filename, jname]:
+                if os.path.exists(fname):
+                    os.remove(fname)
+
+    def test_append_file_parameters_raw_follow(self):
+        """ test nxsconfig append file with raw data written during collecting
+        """
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        filename = 'testcollect.nxs'
+        attrs = {
+            "int8": [12, "NX_INT8", "int8", (1,)],
+            "uint16": [123, "NX_UINT16", "uint16", (1,)],
+            "float32": [-12.345e-1, "NX_FLOAT32", "float32", (1,), 1.e-5],
+        }
+
+        commands = [
+            ('nxscollect append  %s -r --follow --poll_interval 0.05'
+             ' --timeout 0.5 %s' % (filename, self.flags)).split(),
+            ('nxscollect -x %s -r --follow --poll_interval 0.05'
+             ' --timeout 0.5 -w 2 %s' % (filename, self.flags)).split(),
+        ]
+        wrmodule = WRITERS[self.writer]
+        filewriter.writer = wrmodule
+
+        def _writefiles(images):
+            for i, image in enumerate(images):
+                with open("rawtest1_%05d.dat" % i, "w") as fl:
+                    image.tofile(fl)
+
+        for k in attrs.keys():
+            mlen = [self.__rnd.randint(10, 200),
+                    self.__rnd.randint(10, 200)]
+
+            attrs[k][0] = np.array(
+                [[[attrs[k][0] * self.__rnd.randint(0, 3)
+                   for c in range(mlen[1])]
+                  for i in range(mlen[0])]
+                 for _ in range(6)],
+                dtype=attrs[k][2]
+                )
+            try:
+                for cmd in commands:
+                    nxsfile = filewriter.create_file(
+                        filename, overwrite=True)
+                    rt = nxsfile.root()
+                    entry = rt.create_group("entry12345", "NXentry")
+                    entry.create_group("data", "NXdata")
+                    nxsfile.close()
+                    # the last file does not appear
+                    pcmd = list(cmd)
+                    pcmd.extend(["-i", "rawtest1_%05d.dat:0:6"])
+                    pcmd.extend(
+                        ["-p", '/entry12345/instrument/pilatus300k/data'])
+                    pcmd.extend(
+                        ["--shape", json.dumps(attrs[k][0].shape[1:])])
+                    pcmd.extend(
+                        ["--dtype", attrs[k][2]])
+
+                    writer = threading.Timer(
+                        0.2, _writefiles, [attrs[k][0]])
+                    writer.start()
+                    old_stdout = sys.stdout
+                    old_stderr = sys.stderr
+                    sys.stdout = mystdout = StringIO()
+                    sys.stderr = mystderr = StringIO()
+                    old_argv = sys.argv
+                    sys.argv = pcmd
+                    nxscollect.main()
+
+                    sys.argv = old_argv
+                    sys.stdout = old_stdout
+                    sys.stderr = old_stderr
+                    writer.join()
+                    vl = mystdout.getvalue()
+                    er = mystderr.getvalue()
+
+                    self.assertEqual('', er)
+                    self.assertTrue(vl)
+                    svl = vl.split("\n")
+                    self.assertEqual(len(svl), 9)
+                    # the last frame can be written after the timeout
+                    avl = [ln for ln in svl if ln.startswith(' * append ')]
+                    self.assertEqual(len(avl), 6)
+                    for i in range(6):
+                        self.assertTrue(
+                            avl[i].endswith('test1_%05d.dat ' % i))
+                    self.assertEqual(
+                        len([ln for ln in svl if ln.startswith('Timeout: ')]),
+                        1)
+
+                    nxsfile = filewriter.open_file(filename, readonly=True)
+                    rt = nxsfile.root()
+                    entry = rt.open("entry12345")
+                    ins = entry.open("instrument")
+                    det = ins.open("pilatus300k")
+                    dt = det.open("data")
+                    buffer = dt.read()
+                    self.assertEqual(buffer.shape, attrs[k][0].shape)
+                    for i in range(6):
+                        fimage = attrs[k][0][i]
+                        image = buffer[i, :, :]
+                        self.assertTrue((image == fimage).all())
+                    nxsfile.close()
+                    os.remove(filename)
+                    for i in range(6):
+                        os.remove("rawtest1_%05d.dat" % i)
+
+            finally:
+                for i in range(6):
+                    if os.path.exists("rawtest1_%05d.dat" % i):
+                        os.remove("rawtest1_%05d.dat" % i)
+
+    def test_append_file_withpostrun_raw_follow_master(self):
+        """ test nxsconfig append file with a postrun range growing
+        in the master file during collecting
+        """
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        filename = 'testcollect.nxs'
+        cmd = ('nxscollect append  %s -r --follow --poll_interval 0.05'
+               ' --timeout 0.5 %s' % (filename, self.flags)).split()
+        wrmodule = WRITERS[self.writer]
+        filewriter.writer = wrmodule
+        shape = [self.__rnd.randint(10, 50), self.__rnd.randint(10, 50)]
+        images = np.array(
+            [[[self.__rnd.randint(0, 3000)
+               for c in range(shape[1])]
+              for i in range(shape[0])]
+             for _ in range(4)],
+            dtype="uint16")
+
+        def _writefiles(frames):
+            for i in frames:
+                with open("pilatus_%05d.dat" % i, "w") as fl:
+                    images[i].tofile(fl)
+
+        def _writemaster():
+            _writefiles([2, 3])
+            nxsfile = filewriter.open_file(filename)
+            entry = nxsfile.root().open("entry12345")
+            entry.open("instrument").open("pilatus").open(
+                "collection").open("postrun").write("pilatus_%05d.dat:0:3")
+            entry.create_group("sample", "NXsample")
+            nxsfile.close()
+
+        try:
+            _writefiles([0, 1])
+            self._concurrentmaster(
+                filename, ["pilatus"], {"pilatus": images[:2]})
+
+            writer = threading.Timer(0.3, _writemaster)
+            writer.start()
+            vl, er = self._runcollect(cmd)
+            writer.join()
+
+            self.assertEqual('', er)
+            self.assertTrue("Error" not in vl)
+            # frames of the grown range are appended to the collected ones
+            avl = [ln for ln in vl.split("\n")
+                   if ln.startswith(' * append ')]
+            self.assertEqual(len(avl), 4)
+            for i in range(4):
+                self.assertTrue(avl[i].endswith('pilatus_%05d.dat ' % i))
+            self.assertEqual(
+                [fl for fl in os.listdir(".")
+                 if fl.startswith(filename + ".")], [])
+
+            # changes of the master file writer are kept
+            nxsfile = filewriter.open_file(filename, readonly=True)
+            entry = nxsfile.root().open("entry12345")
+            self.assertEqual(
+                sorted(entry.names()), ["instrument", "sample"])
+            buffer = entry.open("instrument").open("pilatus").open(
+                "data").read()
+            self.assertEqual(buffer.shape, images.shape)
+            self.assertTrue((buffer == images).all())
+            nxsfile.close()
+        finally:
+            for i in range(4):
+                if os.path.exists("pilatus_%05d.dat" % i):
+                    os.remove("pilatus_%05d.dat" % i)
+            if os.path.exists(filename):
+                os.remove(filename)
 
-    def test_append_file_parameters_raw(self):
+    def test_append_file_parameters_nxs(self):
         """ test nxsconfig append file with a cbf postrun field
         """
         fun = sys._getframe().f_code.co_name
@@ -2574,26 +4982,49 @@ For more help:
                 )
             try:
                 for i in range(6):
-                    with open("rawtest1_%05d.dat" % i, "w") as fl:
-                        attrs[k][0][i].tofile(fl)
+                    fl = filewriter.create_file("h5test1_%05d.nxs" % i)
+                    rt = fl.root()
+
+                    at = rt.attributes.create("default", "string")
+                    at.write("entry12345")
+                    at.close()
+
+                    entry = rt.create_group("entry12345", "NXentry")
+                    at = entry.attributes.create("default", "string")
+                    at.write("data")
+                    at.close()
+
+                    dt = entry.create_group("data", "NXdata")
+                    at = dt.attributes.create("signal", "string")
+                    at.write("data")
+                    at.close()
+
+                    shp = attrs[k][0][i].shape
+                    data = dt.create_field("data", attrs[k][2], shp, shp)
+                    data.write(attrs[k][0][i])
+                    data.close()
+
+                    dt.close()
+                    entry.close()
+                    fl.close()
+
                 for cmd in commands:
                     nxsfile = filewriter.create_file(
                         filename, overwrite=True)
                     rt = nxsfile.root()
                     entry = rt.create_group("entry12345", "NXentry")
-                    # to be created
-                    # ins = entry.create_group("instrument", "NXinstrument")
+                    ins = entry.create_group("instrument", "NXinstrument")
                     # det = ins.create_group("pilatus300k", "NXdetector")
                     entry.create_group("data", "NXdata")
+                    # col = det.create_group("collection", "NXcollection")
+                    # postrun = col.create_field("postrun", "string")
+                    # postrun.write("h5test1_%05d.h5:0:5")
                     nxsfile.close()
+
                     pcmd = cmd
-                    pcmd.extend(["-i", "rawtest1_%05d.dat:0:5"])
+                    pcmd.extend(["-i", "h5test1_%05d.nxs:0:5"])
                     pcmd.extend(
                         ["-p", '/entry12345/instrument/pilatus300k/data'])
-                    pcmd.extend(
-                        ["--shape", json.dumps(attrs[k][0].shape[1:])])
-                    pcmd.extend(
-                        ["--dtype", attrs[k][2]])
 
                     old_stdout = sys.stdout
                     old_stderr = sys.stderr
@@ -2612,6 +5043,8 @@ For more help:
                     self.assertEqual('', er)
                     self.assertTrue(vl)
                     svl = vl.split("\n")
+                    if len(svl) != 8:
+                        print(svl)
                     self.assertEqual(len(svl), 8)
                     self.assertTrue(
                         svl[0],
@@ -2621,7 +5054,7 @@ For more help:
                     for i in range(1, 6):
                         self.assertTrue(svl[i].startswith(' * append '))
                         self.assertTrue(
-                            svl[i].endswith('test1_%05d.dat ' % (i - 1)))
+                            svl[i].endswith('test1_%05d.nxs ' % (i - 1)))
 
                     if '-r' not in cmd:
                         os.remove("%s.__nxscollect_old__" % filename)
@@ -2641,10 +5074,11 @@ For more help:
                     os.remove(filename)
 
             finally:
+                pass
                 for i in range(6):
-                    os.remove("rawtest1_%05d.dat" % i)
+                    os.remove("h5test1_%05d.nxs" % i)
 
-    def test_append_file_parameters_nxs(self):
+    def test_append_file_parameters_nxs_3d_many(self):
         """ test nxsconfig append file with a cbf postrun field
         """
         fun = sys._getframe().f_code.co_name
@@ -2682,11 +5116,13 @@ For more help:
         wrmodule = WRITERS[self.writer]
         filewriter.writer = wrmodule
         for k in attrs.keys():
-            mlen = [self.__rnd.randint(10, 200),
-                    self.__rnd.randint(10, 200)]
+            mlen = [self.__rnd.randint(10, 20),
+                    self.__rnd.randint(10, 20),
+                    self.__rnd.randint(10, 20)]
 
             attrs[k][0] = np.array(
-                [[[attrs[k][0] * self.__rnd.randint(0, 3)
+                [[[[attrs[k][0] * self.__rnd.randint(0, 3)
+                    for d in range(mlen[2])]
                    for c in range(mlen[1])]
                   for i in range(mlen[0])]
                  for _ in range(6)],
@@ -2767,9 +5203,9 @@ For more help:
                         self.assertTrue(svl[i].startswith(' * append '))
                         self.assertTrue(
                             svl[i].endswith('test1_%05d.nxs ' % (i - 1)))
-
                     if '-r' not in cmd:
                         os.remove("%s.__nxscollect_old__" % filename)
+
                     nxsfile = filewriter.open_file(filename, readonly=True)
                     rt = nxsfile.root()
                     entry = rt.open("entry12345")
@@ -2777,10 +5213,16 @@ For more help:
                     det = ins.open("pilatus300k")
                     dt = det.open("data")
                     buffer = dt.read()
-                    self.assertEqual(buffer.shape, attrs[k][0].shape)
+                    self.assertEqual(
+                        buffer.shape[0],
+                        attrs[k][0].shape[0] * attrs[k][0].shape[1])
+                    self.assertEqual(buffer.shape[1:],
+                                     attrs[k][0].shape[2:])
                     for i in range(6):
                         fimage = attrs[k][0][i]
-                        image = buffer[i, :, :]
+                        image = buffer[
+                            i * attrs[k][0].shape[1]:
+                            (i + 1) * attrs[k][0].shape[1], :, :]
                         self.assertTrue((image == fimage).all())
                     nxsfile.close()
                     os.remove(filename)
@@ -2790,40 +5232,30 @@ For more help:
                 for i in range(6):
                     os.remove("h5test1_%05d.nxs" % i)
 
-    def test_append_file_parameters_nxs_3d_many(self):
-        """ test nxsconfig append file with a cbf postrun field
+    def test_append_file_parameters_nxs_3d_chunks(self):
+        """ test nxsconfig append file with compressed nxs input files
         """
         fun = sys._getframe().f_code.co_name
         print("Run: %s.%s() " % (self.__class__.__name__, fun))
 
         filename = 'testcollect.nxs'
         attrs = {
-            "int": [-123, "NX_INT", "int64", (1,)],
             "int8": [12, "NX_INT8", "int8", (1,)],
-            "int16": [-123, "NX_INT16", "int16", (1,)],
-            "int32": [12345, "NX_INT32", "int32", (1,)],
-            "int64": [-12345, "NX_INT64", "int64", (1,)],
-            "uint": [123, "NX_UINT", "uint64", (1,)],
-            "uint8": [12, "NX_UINT8", "uint8", (1,)],
             "uint16": [123, "NX_UINT16", "uint16", (1,)],
-            "uint32": [12345, "NX_UINT32", "uint32", (1,)],
-            "uint64": [12345, "NX_UINT64", "uint64", (1,)],
-            "float": [-12.345, "NX_FLOAT", "float64", (1,), 1.e-14],
-            "number": [-12.345e+2, "NX_NUMBER", "float64", (1,), 1.e-14],
+            "int32": [12345, "NX_INT32", "int32", (1,)],
             "float32": [-12.345e-1, "NX_FLOAT32", "float32", (1,), 1.e-5],
             "float64": [-12.345, "NX_FLOAT64", "float64", (1,), 1.e-14],
         }
 
         commands = [
             ('nxscollect append  %s %s' % (filename, self.flags)).split(),
-            ('nxscollect -x %s %s' % (filename, self.flags)).split(),
-            ('nxscollect append  %s -r %s' % (filename, self.flags)).split(),
-            ('nxscollect -x %s -r %s' % (filename, self.flags)).split(),
-            ('nxscollect append  %s -s %s' % (filename, self.flags)).split(),
-            ('nxscollect -x %s -s %s' % (filename, self.flags)).split(),
-            ('nxscollect append  %s -r -s %s' %
+            ('nxscollect append  %s -c 1 %s' % (filename, self.flags)).split(),
+            ('nxscollect append  %s -r --no_chunk_copy %s' %
+             (filename, self.flags)).split(),
+            ('nxscollect append  %s -r -w 3 %s' %
+             (filename, self.flags)).split(),
+            ('nxscollect append  %s -r -s --batch_size 4 %s' %
              (filename, self.flags)).split(),
-            ('nxscollect -x %s -r -s %s' % (filename, self.flags)).split(),
         ]
         wrmodule = WRITERS[self.writer]
         filewriter.writer = wrmodule
@@ -2860,7 +5292,148 @@ For more help:
                     at.close()
 
                     shp = attrs[k][0][i].shape
-                    data = dt.create_field("data", attrs[k][2], shp, shp)
+                    deflate = filewriter.data_filter(dt)
+                    deflate.rate = 2
+                    data = dt.create_field(
+                        "data", attrs[k][2], shp, [1, shp[1], shp[2]],
+                        deflate)
+                    data.write(attrs[k][0][i])
+                    data.close()
+
+                    dt.close()
+                    entry.close()
+                    fl.close()
+
+                for cmd in commands:
+                    nxsfile = filewriter.create_file(
+                        filename, overwrite=True)
+                    rt = nxsfile.root()
+                    entry = rt.create_group("entry12345", "NXentry")
+                    ins = entry.create_group("instrument", "NXinstrument")
+                    entry.create_group("data", "NXdata")
+                    nxsfile.close()
+
+                    pcmd = cmd
+                    pcmd.extend(["-i", "h5test1_%05d.nxs:0:5"])
+                    pcmd.extend(
+                        ["-p", '/entry12345/instrument/pilatus300k/data'])
+
+                    old_stdout = sys.stdout
+                    old_stderr = sys.stderr
+                    sys.stdout = mystdout = StringIO()
+                    sys.stderr = mystderr = StringIO()
+                    old_argv = sys.argv
+                    sys.argv = pcmd
+                    nxscollect.main()
+
+                    sys.argv = old_argv
+                    sys.stdout = old_stdout
+                    sys.stderr = old_stderr
+                    vl = mystdout.getvalue()
+                    er = mystderr.getvalue()
+
+                    self.assertEqual('', er)
+                    self.assertTrue(vl)
+                    svl = vl.split("\n")
+                    if len(svl) != 8:
+                        print(svl)
+                    self.assertEqual(len(svl), 8)
+                    for i in range(1, 6):
+                        self.assertTrue(svl[i].startswith(' * append '))
+                        self.assertTrue(
+                            svl[i].endswith('test1_%05d.nxs ' % (i - 1)))
+                    if '-r' not in cmd:
+                        os.remove("%s.__nxscollect_old__" % filename)
+
+                    nxsfile = filewriter.open_file(filename, readonly=True)
+                    rt = nxsfile.root()
+                    entry = rt.open("entry12345")
+                    ins = entry.open("instrument")
+                    det = ins.open("pilatus300k")
+                    dt = det.open("data")
+                    buffer = dt.read()
+                    self.assertEqual(
+                        buffer.shape[0],
+                        attrs[k][0].shape[0] * attrs[k][0].shape[1])
+                    self.assertEqual(buffer.shape[1:],
+                                     attrs[k][0].shape[2:])
+                    for i in range(6):
+                        fimage = attrs[k][0][i]
+                        image = buffer[
+                            i * attrs[k][0].shape[1]:
+                            (i + 1) * attrs[k][0].shape[1], :, :]
+                        self.assertTrue((image == fimage).all())
+                    nxsfile.close()
+                    os.remove(filename)
+
+            finally:
+                pass
+                for i in range(6):
+                    os.remove("h5test1_%05d.nxs" % i)
+
+    def test_append_file_parameters_nxs_3d_virtual(self):
+        """ test nxsconfig append file with virtual fields of nxs input files
+        """
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        filename = 'testcollect.nxs'
+        attrs = {
+            "int8": [12, "NX_INT8", "int8", (1,)],
+            "uint16": [123, "NX_UINT16", "uint16", (1,)],
+            "int32": [12345, "NX_INT32", "int32", (1,)],
+            "float32": [-12.345e-1, "NX_FLOAT32", "float32", (1,), 1.e-5],
+            "float64": [-12.345, "NX_FLOAT64", "float64", (1,), 1.e-14],
+        }
+
+        commands = [
+            ('nxscollect append  %s --virtual %s' %
+             (filename, self.flags)).split(),
+            ('nxscollect -x %s -r --virtual %s' %
+             (filename, self.flags)).split(),
+            ('nxscollect append  %s -r -s --virtual %s' %
+             (filename, self.flags)).split(),
+        ]
+        wrmodule = WRITERS[self.writer]
+        filewriter.writer = wrmodule
+        for k in attrs.keys():
+            mlen = [self.__rnd.randint(10, 20),
+                    self.__rnd.randint(10, 20),
+                    self.__rnd.randint(10, 20)]
+
+            attrs[k][0] = np.array(
+                [[[[attrs[k][0] * self.__rnd.randint(0, 3)
+                    for d in range(mlen[2])]
+                   for c in range(mlen[1])]
+                  for i in range(mlen[0])]
+                 for _ in range(6)],
+                dtype=attrs[k][2]
+                )
+            try:
+                for i in range(6):
+                    fl = filewriter.create_file("h5test1_%05d.nxs" % i)
+                    rt = fl.root()
+
+                    at = rt.attributes.create("default", "string")
+                    at.write("entry12345")
+                    at.close()
+
+                    entry = rt.create_group("entry12345", "NXentry")
+                    at = entry.attributes.create("default", "string")
+                    at.write("data")
+                    at.close()
+
+                    dt = entry.create_group("data", "NXdata")
+                    at = dt.attributes.create("signal", "string")
+                    at.write("data")
+                    at.close()
+
+                    shp = attrs[k][0][i].shape
+                    deflate = filewriter.data_filter(dt)
+                    deflate.rate = 2
+                    data = dt.create_field(
+                        "data", attrs[k][2], shp, [1, shp[1], shp[2]],
+                        deflate)
                     data.write(attrs[k][0][i])
                     data.close()
 
@@ -2874,11 +5447,7 @@ For more help:
                     rt = nxsfile.root()
                     entry = rt.create_group("entry12345", "NXentry")
                     ins = entry.create_group("instrument", "NXinstrument")
-                    # det = ins.create_group("pilatus300k", "NXdetector")
                     entry.create_group("data", "NXdata")
-                    # col = det.create_group("collection", "NXcollection")
-                    # postrun = col.create_field("postrun", "string")
-                    # postrun.write("h5test1_%05d.h5:0:5")
                     nxsfile.close()
 
                     pcmd = cmd
@@ -2906,11 +5475,6 @@ For more help:
                     if len(svl) != 8:
                         print(svl)
                     self.assertEqual(len(svl), 8)
-                    self.assertTrue(
-                        svl[0],
-                        "populate: /entry12345:NXentry/"
-                        "instrument:NXinstrument/pilatus300k:NXdetector"
-                        "/data with ['test1_%05d.cbf:0:5']")
                     for i in range(1, 6):
                         self.assertTrue(svl[i].startswith(' * append '))
                         self.assertTrue(
@@ -2924,6 +5488,9 @@ For more help:
                     ins = entry.open("instrument")
                     det = ins.open("pilatus300k")
                     dt = det.open("data")
+                    if wrmodule.is_vds_supported() and \
+                       hasattr(dt.h5object, "is_virtual"):
+                        self.assertTrue(dt.h5object.is_virtual)
                     buffer = dt.read()
                     self.assertEqual(
                         buffer.shape[0],